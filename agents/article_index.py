@@ -0,0 +1,95 @@
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# 영문/숫자 단어와 한글 어절 추출
+_TOKEN_RE = re.compile(r"[0-9a-z]+|[가-힣]+")
+
+
+def tokenize(text: str, ngrams: bool = True) -> List[str]:
+    """
+    검색용 토큰 분리 함수
+    한글 어절은 조사가 붙어 있어 그대로는 잘 맞지 않으므로 어절과 함께 2글자 n-gram도 사용합니다.
+    (ngrams=False면 어절/단어만 반환)
+    """
+    tokens = []
+    for word in _TOKEN_RE.findall((text or "").lower()):
+        tokens.append(word)
+        if ngrams and "가" <= word[0] <= "힣" and len(word) > 2:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class ArticleIndex:
+    """
+    기사 제목+설명에 대한 BM25 검색 인덱스
+    실행마다 한 번 만들어 두고, 하위 주제별로 관련 기사 상위 k개를 고르는 데 사용합니다.
+
+    Parameters:
+    - articles: 뉴스 기사 목록
+    - title_weight: 제목 토큰 가중치 (제목 토큰을 반복해서 넣는 횟수)
+    - k1, b: BM25 파라미터
+    """
+
+    def __init__(self, articles: Sequence[Dict[str, Any]], title_weight: int = 2,
+                 k1: float = 1.5, b: float = 0.75):
+        self.articles = list(articles)
+        self.k1 = k1
+        self.b = b
+
+        self._doc_freqs: List[Counter] = []
+        self._doc_lens: List[int] = []
+        df = Counter()
+        for article in self.articles:
+            tokens = tokenize(article.get("title", "")) * title_weight
+            tokens += tokenize(article.get("description", ""))
+            freqs = Counter(tokens)
+            self._doc_freqs.append(freqs)
+            self._doc_lens.append(len(tokens))
+            df.update(freqs.keys())
+
+        n_docs = len(self.articles)
+        self._avg_len = (sum(self._doc_lens) / n_docs) if n_docs else 0.0
+        self._idf = {
+            term: math.log(1 + (n_docs - freq + 0.5) / (freq + 0.5))
+            for term, freq in df.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def search(self, query: str, k: int) -> List[Tuple[float, int]]:
+        """질의와 관련도가 높은 기사 (점수, 인덱스) 상위 k개를 반환"""
+        terms = set(tokenize(query))
+        scores = []
+        for i, freqs in enumerate(self._doc_freqs):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * self._doc_lens[i] / (self._avg_len or 1.0))
+            for term in terms:
+                tf = freqs.get(term)
+                if tf:
+                    score += self._idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            if score > 0:
+                scores.append((score, i))
+        scores.sort(key=lambda item: (-item[0], item[1]))
+        return scores[:k]
+
+    def top_k(self, query: str, k: int, preferred: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """
+        질의와 관련된 기사 상위 k개를 반환하는 함수
+        preferred(예: 주제 클러스터에 속한 기사 인덱스)가 있으면 그 기사들을 먼저 넣고,
+        남는 자리는 검색 결과, 그래도 모자라면 원래 순서의 기사로 채웁니다.
+        """
+        n_docs = len(self.articles)
+        if k <= 0 or (k >= n_docs and not preferred):
+            return list(self.articles)
+        k = min(k, n_docs)
+        selected = [i for i in dict.fromkeys(preferred or ()) if 0 <= i < n_docs][:k]
+        chosen = set(selected)
+        if len(selected) < k:
+            selected += [i for _, i in self.search(query, k) if i not in chosen][:k - len(selected)]
+            chosen = set(selected)
+        if len(selected) < k:
+            selected += [i for i in range(n_docs) if i not in chosen][:k - len(selected)]
+        return [self.articles[i] for i in selected]
@@ -1,10 +1,35 @@
 from langgraph.graph import StateGraph, END, START
 from langgraph.prebuilt import ToolNode
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
 from typing import TypedDict, List, Dict, Any, Optional
-import json
+from collections import OrderedDict
+import logging
 import os
+import threading
+
+from agents.article_index import ArticleIndex
+from agents.output_schema import (
+    ContentResult, NewsletterResult, TopicsResult,
+    invoke_structured, parse_structured, validate_response
+)
+from agents.partial_json import PartialJSONFieldReader
+from agents.prompt_builder import build_messages
+from agents.topic_clustering import TopicCluster
+from utils.llm_cache import cached_stream
+
+logger = logging.getLogger(__name__)
+
+# 기본 LLM 설정
+DEFAULT_MODEL = "gpt-4o-mini"
+DEFAULT_TEMPERATURE = 0.7
+# 풀에 보관할 최대 LLM 클라이언트 수 (모델/temperature/API 키 조합별)
+MAX_POOLED_CLIENTS = 32
+
+# 프로세스 전역 레지스트리: 컴파일된 그래프와 LLM 클라이언트를 재사용
+# (Streamlit은 rerun 시 app.py만 다시 실행하고 import된 모듈은 유지하므로 rerun 사이에도 살아 있음)
+_registry_lock = threading.Lock()
+_compiled_graph = None
+_llm_clients: "OrderedDict[tuple, ChatOpenAI]" = OrderedDict()
 
 # 상태 정의
 class AgentState(TypedDict):
@@ -13,27 +38,81 @@ class AgentState(TypedDict):
     topic: Optional[str]
     result: Optional[Dict[str, Any]]
     openai_api_key: str
+    top_k: Optional[int]
+    article_index: Optional[ArticleIndex]
+    topic_members: Optional[List[int]]
+    clusters: Optional[List[TopicCluster]]
+    model: Optional[str]
+    temperature: Optional[float]
+    base_url: Optional[str]
+    bypass_cache: bool
+
+
+def get_llm(model: str = DEFAULT_MODEL, temperature: float = DEFAULT_TEMPERATURE,
+            api_key: str = "", base_url: Optional[str] = None) -> ChatOpenAI:
+    """
+    (모델, temperature, API 키, base_url) 조합별로 풀링된 LLM 클라이언트를 반환하는 함수
+    같은 조합이면 HTTP 클라이언트와 커넥션을 재사용하므로 매 호출마다 TLS 연결을 새로 맺지 않습니다.
+    """
+    key = (model, float(temperature), api_key, base_url)
+    with _registry_lock:
+        llm = _llm_clients.get(key)
+        if llm is not None:
+            _llm_clients.move_to_end(key)
+            return llm
+        kwargs = {"model": model, "temperature": temperature, "api_key": api_key}
+        if base_url:
+            kwargs["base_url"] = base_url
+        llm = ChatOpenAI(**kwargs)
+        _llm_clients[key] = llm
+        while len(_llm_clients) > MAX_POOLED_CLIENTS:
+            _llm_clients.popitem(last=False)
+        return llm
+
+
+def get_state_llm(state: AgentState) -> ChatOpenAI:
+    """상태에 지정된 모델 설정으로 풀링된 LLM 클라이언트를 가져오는 함수"""
+    temperature = state.get("temperature")
+    return get_llm(
+        model=state.get("model") or DEFAULT_MODEL,
+        temperature=DEFAULT_TEMPERATURE if temperature is None else temperature,
+        api_key=state["openai_api_key"],
+        base_url=state.get("base_url"),
+    )
+
+
+def select_articles_for_topic(state: AgentState) -> List[Dict[str, str]]:
+    """
+    주제와 관련된 기사만 골라 프롬프트 크기를 줄이는 함수
+    top_k가 없으면 전체 기사를 그대로 사용하고, 인덱스가 없으면 여기서 만듭니다.
+    주제 클러스터의 소속 기사(topic_members)가 있으면 그 기사들을 우선합니다.
+    """
+    top_k = state.get("top_k")
+    members = state.get("topic_members")
+    if not state.get("topic") or (not top_k and not members):
+        return state["news_articles"]
+    index = state.get("article_index") or ArticleIndex(state["news_articles"])
+    return index.top_k(state["topic"], top_k or len(index), preferred=members)
+
+
+def build_state_messages(state: AgentState, system_prompt: str, user_template: str, articles,
+                         field_limits: Dict[str, int]):
+    """상태의 모델 설정에 맞춰 토큰 예산 안에서 프롬프트를 만들고 토큰 수를 기록하는 함수"""
+    messages, _, report = build_messages(
+        system_prompt, user_template, articles,
+        model=state.get("model") or DEFAULT_MODEL,
+        field_limits=field_limits
+    )
+    logger.info(f"[{state['task']}] 프롬프트 {report}")
+    return messages, report
 
 # 뉴스레터 주제 생성 노드
 def generate_topics_node(state: AgentState) -> AgentState:
     """뉴스 기사를 기반으로 뉴스레터 주제와 하위 주제를 생성하는 노드"""
     
     # OpenAI 모델 초기화
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.7,
-        api_key=state["openai_api_key"],
-        # base_url="https://clovastudio.stream.ntruss.com/v1/openai"
-    )
+    llm = get_state_llm(state)
 
-    # 뉴스 기사 정보 추출
-    articles_info = []
-    for article in state["news_articles"]:
-        articles_info.append({
-            "title": article["title"],
-            "description": article["description"]
-        })
-    
     # 시스템 프롬프트 작성
     system_prompt = """
     당신은 뉴스레터 주제 선정 전문가입니다. 제공된 뉴스 기사 목록을 분석하여 
@@ -52,86 +131,93 @@ def generate_topics_node(state: AgentState) -> AgentState:
     }
     """
     
-    # 사용자 프롬프트 작성
-    user_prompt = f"""
+    # 사용자 프롬프트 작성 ({articles} 자리에 기사 목록이 한 줄에 하나씩 들어감)
+    user_template = """
     다음 뉴스 기사 목록을 분석하여 뉴스레터의 전체 제목과 3-5개의 하위 주제를 선정해주세요:
     
-    {json.dumps(articles_info, ensure_ascii=False, indent=2)}
+    {articles}
     
     JSON 형식으로만 응답해주세요.
     """
     
-    # LLM 호출
-    messages = [
-        SystemMessage(content=system_prompt),
-        HumanMessage(content=user_prompt)
-    ]
+    # 토큰 예산 안에서 프롬프트 작성 (제목/설명만 사용)
+    messages, _ = build_state_messages(
+        state, system_prompt, user_template, state["news_articles"],
+        field_limits={"title": 150, "description": 200}
+    )
 
     # try:
     #     del os.environ["HTTP_PROXY"]
     #     del os.environ["HTTPS_PROXY"]
     # except :
     #     pass
-    response = llm.invoke(messages)
+    # 스키마 검증 (실패 시 로컬 수리 -> 잘못된 출력만 LLM에 재요청)
+    result = invoke_structured(llm, messages, TopicsResult, bypass_cache=state.get("bypass_cache", False))
     # os.environ["HTTP_PROXY"] = "http://70.10.15.10:8080"
     # os.environ["HTTPS_PROXY"] = "http://70.10.15.10:8080"
-
-    # JSON 응답 파싱
-    try:
-        result = json.loads(response.content)
-    except:
-        # JSON 파싱 실패 시 텍스트에서 JSON 부분만 추출 시도
-        content = response.content
-        json_start = content.find('{')
-        json_end = content.rfind('}') + 1
-        if json_start >= 0 and json_end > json_start:
-            json_str = content[json_start:json_end]
-            try:
-                result = json.loads(json_str)
-            except:
-                result = {
-                    "title": "주간 뉴스 하이라이트",
-                    "subtopics": ["주요 이슈", "산업 동향", "기술 혁신", "경제 전망", "사회 이슈"]
-                }
-        else:
-            result = {
-                "title": "주간 뉴스 하이라이트",
-                "subtopics": ["주요 이슈", "산업 동향", "기술 혁신", "경제 전망", "사회 이슈"]
-            }
     
     # 결과 업데이트
     state["result"] = result
     return state
 
-# 뉴스레터 내용 생성 노드
-def generate_content_node(state: AgentState) -> AgentState:
-    """특정 주제에 대한 뉴스레터 내용을 생성하는 노드"""
-    
-    # OpenAI 모델 초기화
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.7,
-        api_key=state["openai_api_key"],
-        # base_url="https://clovastudio.stream.ntruss.com/v1/openai"
+# 클러스터 주제 이름 짓기 노드
+def refine_topics_node(state: AgentState) -> AgentState:
+    """
+    로컬 클러스터링으로 묶은 기사 그룹에 주제 이름과 뉴스레터 제목만 붙이는 노드
+    (기사 전체를 다시 분류하지 않으므로 클러스터 키워드와 대표 기사 제목만 프롬프트에 넣음)
+    """
+    llm = get_state_llm(state)
+    articles = state["news_articles"]
+    clusters = state.get("clusters") or []
+
+    system_prompt = """
+    당신은 뉴스레터 주제 선정 전문가입니다. 뉴스 기사들은 이미 주제별 그룹으로 묶여 있습니다.
+    각 그룹의 키워드와 대표 기사 제목을 보고 그룹마다 하위 주제 이름을 하나씩 짓고,
+    뉴스레터 전체 제목을 정해주세요.
+
+    조건:
+    1. 하위 주제는 그룹 순서와 같은 순서로, 그룹 수와 같은 개수만큼 작성
+    2. 각 주제 이름은 그룹의 기사 내용을 포괄하는 짧고 흥미로운 한국어 표현 (30자 이내)
+    3. 주제 이름끼리 중복되지 않아야 함
+
+    결과는 다음 JSON 형식으로 반환해주세요:
+    {
+        "title": "뉴스레터 전체 제목",
+        "subtopics": ["그룹 1 주제", "그룹 2 주제"]
+    }
+    """
+    # 사용자 프롬프트 작성 ({articles} 자리에 그룹 목록이 한 줄에 하나씩 들어감)
+    user_template = """
+    다음 기사 그룹들의 주제 이름과 뉴스레터 제목을 정해주세요:
+
+    {articles}
+
+    JSON 형식으로만 응답해주세요.
+    """
+    groups = [
+        {
+            "group": str(i),
+            "articles": str(len(cluster.members)),
+            "keywords": ", ".join(cluster.keywords),
+            "titles": " | ".join(articles[j].get("title", "") for j in cluster.members[:5]),
+        }
+        for i, cluster in enumerate(clusters, start=1)
+    ]
+    messages, _ = build_state_messages(
+        state, system_prompt, user_template, groups,
+        field_limits={"group": 3, "articles": 4, "keywords": 100, "titles": 400}
     )
-    # llm = ChatOpenAI(
-    #     model="/mnt/models",
-    #     openai_api_key="EMPTY",
-    #     openai_api_base="http://meta-llama-3-1-70b-instruct-vllm.serving.70-220-152-1.sslip.io/v1",
-    #     max_tokens=200,
-    #     temperature=0.5
-    # )
+    state["result"] = invoke_structured(llm, messages, TopicsResult, bypass_cache=state.get("bypass_cache", False))
+    return state
 
+# 뉴스레터 내용 생성 프롬프트 작성
+def build_content_messages(state: AgentState):
+    """
+    특정 주제의 내용 생성에 사용할 메시지 목록을 만드는 함수
 
-    # 뉴스 기사 정보 추출
-    articles_info = []
-    for article in state["news_articles"]:
-        articles_info.append({
-            "title": article["title"],
-            "link": article["link"],
-            "description": article["description"]
-        })
-    
+    Returns:
+    - (메시지 목록, PromptReport)
+    """
     # 시스템 프롬프트 작성
     system_prompt = """
     당신은 뉴스레터 작성 전문가입니다. 제공된 뉴스 기사 목록과 주제를 바탕으로
@@ -153,59 +239,112 @@ def generate_content_node(state: AgentState) -> AgentState:
     }
     """
     
-    # 사용자 프롬프트 작성
-    user_prompt = f"""
+    # 사용자 프롬프트 작성 ({articles} 자리에 기사 목록이 한 줄에 하나씩 들어감)
+    user_template = f"""
     다음 주제에 맞는 뉴스레터 내용을 작성해주세요:
     
     주제: {state["topic"]}
     
     참고할 뉴스 기사 목록:
-    {json.dumps(articles_info, ensure_ascii=False, indent=2)}
+    {{articles}}
     
     JSON 형식으로만 응답해주세요.
     """
     
-    # LLM 호출
-    messages = [
-        SystemMessage(content=system_prompt),
-        HumanMessage(content=user_prompt)
-    ]
+    # 주제 관련도 순으로 고른 기사를 토큰 예산 안에서 프롬프트에 넣음
+    return build_state_messages(
+        state, system_prompt, user_template, select_articles_for_topic(state),
+        field_limits={"title": 150, "link": 300, "description": 300, "body": 1500}
+    )
+
+# 뉴스레터 내용 생성 노드
+def generate_content_node(state: AgentState) -> AgentState:
+    """특정 주제에 대한 뉴스레터 내용을 생성하는 노드"""
+    
+    # OpenAI 모델 초기화
+    llm = get_state_llm(state)
+    # llm = ChatOpenAI(
+    #     model="/mnt/models",
+    #     openai_api_key="EMPTY",
+    #     openai_api_base="http://meta-llama-3-1-70b-instruct-vllm.serving.70-220-152-1.sslip.io/v1",
+    #     max_tokens=200,
+    #     temperature=0.5
+    # )
 
+    # 프롬프트 작성
+    messages, _ = build_content_messages(state)
+
+    # LLM 호출
     # try:
     #     del os.environ["HTTP_PROXY"]
     #     del os.environ["HTTPS_PROXY"]
     # except :
     #     pass
-    response = llm.invoke(messages)
-    
-    # JSON 응답 파싱
-    try:
-        result = json.loads(response.content)
-    except:
-        # JSON 파싱 실패 시 텍스트에서 JSON 부분만 추출 시도
-        content = response.content
-        json_start = content.find('{')
-        json_end = content.rfind('}') + 1
-        if json_start >= 0 and json_end > json_start:
-            json_str = content[json_start:json_end]
-            try:
-                result = json.loads(json_str)
-            except:
-                # 기본 응답 생성
-                result = {
-                    "text": f"{state['topic']}에 관한 최신 동향과 분석입니다. 이 주제와 관련된 중요한 뉴스와 인사이트를 제공합니다.",
-                    "references": [
-                        {"title": articles_info[0]["title"], "link": articles_info[0]["link"]}
-                    ]
-                }
-        else:
-            # 기본 응답 생성
-            result = {
-                "text": f"{state['topic']}에 관한 최신 동향과 분석입니다. 이 주제와 관련된 중요한 뉴스와 인사이트를 제공합니다.",
+    # 스키마 검증 (실패 시 로컬 수리 -> 잘못된 출력만 LLM에 재요청)
+    state["result"] = invoke_structured(llm, messages, ContentResult, bypass_cache=state.get("bypass_cache", False))
+    return state
+
+# 단일 패스 뉴스레터 생성 노드
+def generate_newsletter_node(state: AgentState) -> AgentState:
+    """제목, 하위 주제, 주제별 본문과 참고 기사를 한 번의 LLM 호출로 생성하는 노드"""
+    
+    # OpenAI 모델 초기화
+    llm = get_state_llm(state)
+
+    # 시스템 프롬프트 작성
+    system_prompt = """
+    당신은 뉴스레터 편집장입니다. 제공된 뉴스 기사 목록을 분석하여 뉴스레터 전체를 한 번에 작성해주세요.
+    
+    다음 순서로 작업해주세요:
+    1. 뉴스레터의 전체 제목을 정함
+    2. 기사들을 포괄하면서 서로 중복되지 않는 3-5개의 하위 주제를 선정함
+    3. 각 하위 주제마다 관련 기사의 핵심 내용을 요약/분석한 본문을 작성함
+    4. 각 하위 주제의 본문에 참고한 기사의 제목과 링크를 명시함
+    
+    결과는 다음 JSON 형식으로 반환해주세요:
+    {
+        "title": "뉴스레터 전체 제목",
+        "sections": [
+            {
+                "topic": "하위 주제 1",
+                "text": "하위 주제 1의 뉴스레터 본문 내용",
                 "references": [
-                    {"title": articles_info[0]["title"], "link": articles_info[0]["link"]}
+                    {"title": "참고 기사 제목", "link": "참고 기사 링크"}
                 ]
             }
+        ]
+    }
+    """
+    
+    # 사용자 프롬프트 작성 ({articles} 자리에 기사 목록이 한 줄에 하나씩 들어감)
+    user_template = """
+    다음 뉴스 기사 목록으로 뉴스레터를 작성해주세요:
+    
+    {articles}
+    
+    JSON 형식으로만 응답해주세요.
+    """
+    
+    # 토큰 예산 안에서 프롬프트 작성
+    messages, _ = build_state_messages(
+        state, system_prompt, user_template, state["news_articles"],
+        field_limits={"title": 150, "link": 300, "description": 300, "body": 600}
+    )
+    # 스키마 검증 (실패 시 로컬 수리 -> 잘못된 출력만 LLM에 재요청)
+    parsed = invoke_structured(llm, messages, NewsletterResult, bypass_cache=state.get("bypass_cache", False))
+
+    # 주제별 생성 결과와 같은 형태로 변환 ({"title", "subtopics", "contents": {주제: {"text", "references"}}})
+    result = None
+    if parsed:
+        contents = {
+            section["topic"]: {"text": section["text"], "references": section["references"]}
+            for section in parsed["sections"]
+        }
+        result = {
+            "title": parsed["title"],
+            "subtopics": list(contents),
+            "contents": contents
+        }
     
     # 결과 업데이트
     state["result"] = result
@@ -225,7 +364,9 @@ def create_newsletter_agent_graph():
     
     # 노드 추가
     workflow.add_node("generate_topics", generate_topics_node)
+    workflow.add_node("refine_topics", refine_topics_node)
     workflow.add_node("generate_content", generate_content_node)
+    workflow.add_node("generate_newsletter", generate_newsletter_node)
     
     # 엣지 추가 (라우터 사용)
     workflow.add_conditional_edges(
@@ -233,45 +374,121 @@ def create_newsletter_agent_graph():
         router,
         {
             "generate_topics": "generate_topics",
-            "generate_content": "generate_content"
+            "refine_topics": "refine_topics",
+            "generate_content": "generate_content",
+            "generate_newsletter": "generate_newsletter"
         }
     )
     
     # 종료 엣지 추가
     workflow.add_edge("generate_topics", END)
+    workflow.add_edge("refine_topics", END)
     workflow.add_edge("generate_content", END)
+    workflow.add_edge("generate_newsletter", END)
     
     # 그래프 컴파일
     return workflow.compile()
 
+def get_newsletter_agent_graph():
+    """컴파일된 에이전트 그래프를 한 번만 만들어 재사용하는 함수"""
+    global _compiled_graph
+    with _registry_lock:
+        if _compiled_graph is None:
+            _compiled_graph = create_newsletter_agent_graph()
+        return _compiled_graph
+
+# 초기 상태 생성
+def _build_initial_state(news_articles, task, openai_api_key, topic=None, top_k=None, article_index=None,
+                         model=None, temperature=None, base_url=None, bypass_cache=False,
+                         topic_members=None, clusters=None) -> AgentState:
+    return {
+        "news_articles": news_articles,
+        "task": task,
+        "topic": topic,
+        "result": None,
+        "openai_api_key": openai_api_key,
+        "top_k": top_k,
+        "article_index": article_index,
+        "topic_members": topic_members,
+        "clusters": clusters,
+        "model": model,
+        "temperature": temperature,
+        "base_url": base_url,
+        "bypass_cache": bypass_cache
+    }
+
 # 뉴스레터 에이전트 실행 함수
-def run_newsletter_agent(news_articles, task, openai_api_key, topic=None):
+def run_newsletter_agent(news_articles, task, openai_api_key, topic=None, top_k=None, article_index=None,
+                         model=None, temperature=None, base_url=None, bypass_cache=False,
+                         topic_members=None, clusters=None):
     """
     뉴스레터 에이전트를 실행하는 함수
     
     Parameters:
     - news_articles: 뉴스 기사 목록
-    - task: 수행할 작업 ("generate_topics" 또는 "generate_content")
+    - task: 수행할 작업 ("generate_topics", 클러스터 이름 짓기 "refine_topics", "generate_content"
+      또는 단일 패스 "generate_newsletter")
     - openai_api_key: OpenAI API 키
     - topic: 주제 (task가 "generate_content"인 경우에만 필요)
+    - top_k: 주제별로 프롬프트에 넣을 관련 기사 수 (None이면 전체 기사 사용)
+    - article_index: 미리 만들어 둔 ArticleIndex (여러 주제에서 재사용)
+    - topic_members: 주제 클러스터에 속한 기사 인덱스 (generate_content에서 우선 참고)
+    - clusters: TopicCluster 목록 (task가 "refine_topics"인 경우에만 필요)
+    - model: 사용할 OpenAI 모델 (None이면 기본 모델)
+    - temperature: 생성 temperature (None이면 기본값)
+    - base_url: OpenAI 호환 API 주소 (None이면 OpenAI 기본 주소)
+    - bypass_cache: True면 LLM 응답 캐시를 사용하지 않음
     
     Returns:
     - 작업 결과
     """
-    # 에이전트 그래프 생성
-    agent = create_newsletter_agent_graph()
+    # 컴파일된 에이전트 그래프 재사용
+    agent = get_newsletter_agent_graph()
     
     # 초기 상태 설정
-    initial_state = {
-        "news_articles": news_articles,
-        "task": task,
-        "topic": topic,
-        "result": None,
-        "openai_api_key": openai_api_key
-    }
+    initial_state = _build_initial_state(
+        news_articles, task, openai_api_key, topic=topic, top_k=top_k, article_index=article_index,
+        model=model, temperature=temperature, base_url=base_url, bypass_cache=bypass_cache,
+        topic_members=topic_members, clusters=clusters
+    )
     
     # 에이전트 실행
     result = agent.invoke(initial_state)
     
     # 결과 반환
     return result["result"]
+
+
+# 뉴스레터 내용 스트리밍 생성 함수
+def stream_newsletter_content(news_articles, topic, openai_api_key, top_k=None, article_index=None,
+                              model=None, temperature=None, base_url=None, bypass_cache=False,
+                              topic_members=None):
+    """
+    특정 주제의 뉴스레터 내용을 토큰 단위로 스트리밍 생성하는 함수
+    JSON 응답이 다 오기 전에도 "text" 필드를 점진적으로 읽어 본문을 먼저 보여줄 수 있습니다.
+
+    Parameters:
+    - run_newsletter_agent의 generate_content 작업과 동일
+
+    Yields:
+    - {"type": "delta", "text": 새로 받은 본문 조각, "partial_text": 지금까지의 본문}
+    - 마지막에 {"type": "result", "result": 파싱된 전체 결과}
+    """
+    state = _build_initial_state(
+        news_articles, "generate_content", openai_api_key, topic=topic, top_k=top_k,
+        article_index=article_index, model=model, temperature=temperature,
+        base_url=base_url, bypass_cache=bypass_cache, topic_members=topic_members
+    )
+    llm = get_state_llm(state)
+    messages, _ = build_content_messages(state)
+
+    reader = PartialJSONFieldReader("text")
+    chunks = []
+    for chunk in cached_stream(llm, messages, bypass=bypass_cache, validate=lambda text: parse_structured(text, ContentResult)[0] is not None):
+        chunks.append(chunk)
+        new_text = reader.feed(chunk)
+        if new_text:
+            yield {"type": "delta", "text": new_text, "partial_text": reader.value}
+
+    # 스트림이 끝난 뒤 스키마 검증 (실패 시 로컬 수리 -> 잘못된 출력만 LLM에 재요청)
+    yield {"type": "result", "result": validate_response(llm, "".join(chunks), ContentResult)}
@@ -0,0 +1,393 @@
+import logging
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import zip_longest
+from typing import Any, Dict, Iterable, List, Optional
+
+from agents.article_index import ArticleIndex
+from agents.newsletter_agent import run_newsletter_agent
+from agents.topic_clustering import cluster_articles, clusters_to_topics
+from utils.article import Article
+from utils.dedupe import ArticleDeduper
+from utils.llm_cache import get_token_usage
+from utils.news_search import search_news_google_rss, search_news_naver_api
+
+logger = logging.getLogger(__name__)
+
+# 동시에 생성할 하위 주제 수 기본값
+DEFAULT_CONTENT_CONCURRENCY = 4
+# 하위 주제별 프롬프트에 넣을 관련 기사 수 기본값
+DEFAULT_ARTICLES_PER_TOPIC = 8
+# 배치 모드에서 동시에 만들 뉴스레터 수 기본값
+DEFAULT_BATCH_WORKERS = 4
+
+SEARCH_GOOGLE = "구글 RSS"
+SEARCH_NAVER = "네이버 API"
+
+# 주제 선정 방식
+TOPICS_LLM = "llm"          # LLM이 기사 전체를 보고 주제 선정
+TOPICS_CLUSTER = "cluster"  # 로컬 클러스터링 후 LLM은 주제 이름만 지음
+TOPICS_FAST = "fast"        # 로컬 클러스터링만 사용 (LLM 호출 없음)
+TOPIC_METHODS = (TOPICS_LLM, TOPICS_CLUSTER, TOPICS_FAST)
+
+
+@dataclass
+class NewsletterRequest:
+    """뉴스레터 한 건의 생성 요청"""
+    keywords: str
+    name: Optional[str] = None
+    search_method: str = SEARCH_GOOGLE
+    max_articles: int = 15
+    mode: str = "per_topic"         # "per_topic" 또는 "single_pass"
+    topic_method: str = TOPICS_LLM  # 주제별 생성 시 주제 선정 방식
+    # False(기본): 화면과 같이 키워드 전체를 한 검색어로 검색 (모든 키워드를 포함한 기사, AND)
+    # True: 키워드마다 따로 검색한 결과를 번갈아 합침 (어느 키워드든 포함한 기사, OR에 가까움)
+    split_keywords: bool = False
+
+    @property
+    def keyword_list(self) -> List[str]:
+        return [keyword.strip() for keyword in self.keywords.split(",") if keyword.strip()]
+
+    @property
+    def search_queries(self) -> List[str]:
+        """실제로 검색할 검색어 목록 (키워드를 나누지 않으면 쉼표로 이은 검색어 하나)"""
+        keywords = self.keyword_list
+        return keywords if self.split_keywords else [", ".join(keywords)]
+
+    @property
+    def label(self) -> str:
+        return self.name or self.keywords
+
+
+@dataclass
+class NewsletterResult:
+    """뉴스레터 한 건의 생성 결과와 단계별 소요 시간"""
+    request: NewsletterRequest
+    title: Optional[str] = None
+    subtopics: List[str] = field(default_factory=list)
+    contents: Dict[str, Any] = field(default_factory=dict)
+    articles: List[Article] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and bool(self.contents)
+
+    @property
+    def markdown(self) -> str:
+        return format_newsletter_markdown(self.title or self.request.label, self.contents)
+
+
+@dataclass
+class BatchReport:
+    """배치 생성 결과와 처리량"""
+    results: List[NewsletterResult]
+    elapsed: float
+    fetch_elapsed: float
+    keyword_requests: int       # 요청들에 포함된 전체 검색어 수
+    keyword_fetches: int        # 실제로 검색한 고유 검색어 수
+    token_usage: Dict[str, int]
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for result in self.results if result.ok)
+
+    @property
+    def newsletters_per_minute(self) -> float:
+        return self.succeeded / self.elapsed * 60 if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        lines = [f"{'뉴스레터':<30}{'기사':>6}{'섹션':>6}{'생성(s)':>10}  상태"]
+        for result in self.results:
+            status = "성공" if result.ok else f"실패: {result.error or '내용 없음'}"
+            lines.append(f"{result.request.label[:28]:<30}{len(result.articles):>6}{len(result.contents):>6}"
+                         f"{result.timings.get('generate', 0.0):>10.1f}  {status}")
+        lines.append("")
+        lines.append(f"전체 {len(self.results)}건 중 {self.succeeded}건 성공, {self.elapsed:.1f}초 "
+                     f"({self.newsletters_per_minute:.1f}건/분)")
+        lines.append(f"검색: 검색어 {self.keyword_requests}개 요청 -> 고유 검색어 {self.keyword_fetches}개만 검색 "
+                     f"({self.fetch_elapsed:.1f}초)")
+        lines.append(f"LLM: 호출 {self.token_usage.get('calls', 0)}회, 입력 {self.token_usage.get('input_tokens', 0)} / "
+                     f"출력 {self.token_usage.get('output_tokens', 0)} 토큰")
+        return "\n".join(lines)
+
+
+# --- 마크다운 조립 ---
+
+def format_section_markdown(topic: str, content: dict) -> str:
+    """주제 하나의 생성 결과를 마크다운 섹션으로 변환"""
+    section = f"## {topic}\n\n{content['text']}\n\n"
+    section += "**참고 기사:**\n"
+    for ref in content['references']:
+        section += f"- [{ref['title']}]({ref['link']})\n"
+    return section
+
+
+def format_newsletter_markdown(title: str, contents: Dict[str, Any]) -> str:
+    """제목과 주제별 생성 결과로 전체 뉴스레터 마크다운을 만드는 함수"""
+    newsletter = f"# {title}\n\n"
+    for topic, content in contents.items():
+        newsletter += format_section_markdown(topic, content)
+        newsletter += "\n---\n\n"
+    return newsletter
+
+
+# --- 검색 ---
+
+def search_articles(keywords: str, search_method: str = SEARCH_GOOGLE, max_articles: int = 15,
+                    naver_client_id: Optional[str] = None, naver_client_secret: Optional[str] = None,
+                    progress_callback=None) -> List[Article]:
+    """
+    화면과 무관하게 키워드로 뉴스를 검색하는 함수
+    네이버 API 인증 정보가 없거나 API 오류가 나면 데모용 샘플 기사 대신 예외를 전달합니다 (샘플 대체는 화면 전용).
+    """
+    if search_method == SEARCH_NAVER:
+        return search_news_naver_api(keywords, client_id=naver_client_id, client_secret=naver_client_secret,
+                                     max_articles=max_articles, progress_callback=progress_callback,
+                                     sample_fallback=False)
+    return search_news_google_rss(keywords, max_articles=max_articles, progress_callback=progress_callback)
+
+
+def _query_key(query: str) -> str:
+    """검색어 공유 키 (대소문자, 공백, 키워드 순서 차이 무시)"""
+    return ",".join(sorted(" ".join(keyword.split()).lower() for keyword in query.split(",") if keyword.strip()))
+
+
+def fetch_shared_articles(requests: Iterable[NewsletterRequest], executor: Executor,
+                          naver_client_id: Optional[str] = None,
+                          naver_client_secret: Optional[str] = None) -> Dict[tuple, Any]:
+    """
+    여러 요청의 검색어(search_queries)를 (검색 방법, 검색어) 단위로 한 번씩만 동시에 검색하는 함수
+    키워드 세트가 같은 요청끼리, split_keywords 요청은 겹치는 키워드끼리 검색 결과를 공유합니다.
+
+    Returns:
+    - {(검색 방법, 정규화된 검색어): 기사 목록, 검색에 실패한 검색어는 발생한 예외}
+    """
+    wanted: Dict[tuple, tuple] = {}
+    for request in requests:
+        for query in request.search_queries:
+            key = (request.search_method, _query_key(query))
+            previous = wanted.get(key)
+            # 같은 검색어를 더 많이 원하는 요청이 있으면 그 수만큼 검색
+            if previous is None or previous[1] < request.max_articles:
+                wanted[key] = (query, request.max_articles)
+
+    futures = {
+        key: executor.submit(search_articles, query, key[0], max_articles,
+                             naver_client_id, naver_client_secret)
+        for key, (query, max_articles) in wanted.items()
+    }
+    fetched = {}
+    for key, future in futures.items():
+        try:
+            fetched[key] = future.result()
+        except Exception as e:
+            logger.error(f"'{key[1]}' 검색 실패: {e}")
+            fetched[key] = e
+    return fetched
+
+
+def merge_keyword_articles(request: NewsletterRequest, fetched: Dict[tuple, Any]) -> List[Article]:
+    """
+    요청의 검색어별 검색 결과를 번갈아 합치고 중복을 제거하여 최대 기사 수만큼 반환하는 함수
+    검색어 중 하나라도 검색에 실패했으면 RuntimeError
+    """
+    queries = request.search_queries
+    groups = [fetched.get((request.search_method, _query_key(query)), []) for query in queries]
+    for query, group in zip(queries, groups):
+        if isinstance(group, Exception):
+            raise RuntimeError(f"'{query}' 검색 실패: {group}")
+    articles = []
+    deduper = ArticleDeduper()
+    for group in zip_longest(*groups):
+        for article in group:
+            # 네이버 기사는 원문 링크 기준으로 중복 판단
+            if article is not None and deduper.add(article, article.dedupe_link):
+                articles.append(article)
+                if len(articles) >= request.max_articles:
+                    return articles
+    return articles
+
+
+# --- 생성 ---
+
+def select_topics(news_articles: List[Article], openai_api_key: str, method: str = TOPICS_LLM,
+                  num_topics: Optional[int] = None, model: Optional[str] = None,
+                  temperature: Optional[float] = None, bypass_cache: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    뉴스레터 제목과 하위 주제를 선정하는 함수
+
+    Parameters:
+    - method: TOPICS_LLM(LLM이 전체 기사로 선정), TOPICS_CLUSTER(로컬 클러스터링 + LLM 이름 짓기),
+      TOPICS_FAST(로컬 클러스터링만, LLM 호출 없음)
+    - num_topics: 클러스터 수 (None이면 기사 수에 맞춰 결정)
+
+    Returns:
+    - {"title", "subtopics", "members": {주제: 기사 인덱스 목록}} (LLM 방식은 members가 비어 있음), 실패 시 None
+    """
+    agent_kwargs = {"openai_api_key": openai_api_key, "model": model, "temperature": temperature,
+                    "bypass_cache": bypass_cache}
+    if method not in (TOPICS_CLUSTER, TOPICS_FAST):
+        topics = run_newsletter_agent(news_articles, "generate_topics", **agent_kwargs)
+        return {**topics, "members": {}} if topics else None
+
+    started = time.perf_counter()
+    clusters = cluster_articles(news_articles, num_topics)
+    logger.info(f"기사 {len(news_articles)}개를 {len(clusters)}개 주제로 클러스터링 "
+                f"({(time.perf_counter() - started) * 1000:.0f}ms)")
+    if method == TOPICS_FAST:
+        return clusters_to_topics(clusters)
+
+    named = run_newsletter_agent(news_articles, "refine_topics", clusters=clusters, **agent_kwargs)
+    if not named:
+        # 이름 짓기에 실패해도 클러스터 키워드 라벨로 계속 진행
+        logger.warning("클러스터 주제 이름 짓기 실패, 키워드 라벨을 주제로 사용")
+        return clusters_to_topics(clusters)
+    return clusters_to_topics(clusters, names=named["subtopics"], title=named["title"])
+
+
+def generate_newsletter(news_articles: List[Article], openai_api_key: str, mode: str = "per_topic",
+                        topic_method: str = TOPICS_LLM,
+                        model: Optional[str] = None, temperature: Optional[float] = None,
+                        top_k: int = DEFAULT_ARTICLES_PER_TOPIC, bypass_cache: bool = False,
+                        content_executor: Optional[Executor] = None,
+                        content_concurrency: int = DEFAULT_CONTENT_CONCURRENCY) -> Dict[str, Any]:
+    """
+    기사 목록으로 뉴스레터를 생성하는 함수 (화면 출력 없음)
+
+    Parameters:
+    - news_articles: 뉴스 기사 목록
+    - openai_api_key: OpenAI API 키
+    - mode: "per_topic"(주제 선정 후 주제별 생성) 또는 "single_pass"(한 번의 호출로 전체 생성)
+    - topic_method: 주제별 생성 시 주제 선정 방식 (select_topics 참고)
+    - model / temperature: LLM 설정
+    - top_k: 주제별로 프롬프트에 넣을 관련 기사 수
+    - bypass_cache: True면 LLM 응답 캐시를 사용하지 않음
+    - content_executor: 주제별 내용 생성에 쓸 공유 스레드 풀 (없으면 content_concurrency 크기로 생성)
+
+    Returns:
+    - {"title", "subtopics", "contents"} (contents는 원래 주제 순서, 실패한 주제 제외)
+    """
+    agent_kwargs = {"openai_api_key": openai_api_key, "model": model, "temperature": temperature,
+                    "bypass_cache": bypass_cache}
+    if mode == "single_pass":
+        result = run_newsletter_agent(news_articles, "generate_newsletter", **agent_kwargs)
+        if not result:
+            raise RuntimeError("단일 패스 뉴스레터 생성 실패")
+        return result
+
+    topics = select_topics(news_articles, openai_api_key, method=topic_method, model=model,
+                           temperature=temperature, bypass_cache=bypass_cache)
+    if not topics:
+        raise RuntimeError("뉴스레터 주제 선정 실패")
+    subtopics = topics["subtopics"]
+    members = topics["members"]
+
+    # 관련 기사 검색 인덱스는 한 번만 만들어 모든 주제에서 공유
+    article_index = ArticleIndex(news_articles)
+    own_executor = content_executor is None
+    executor = content_executor or ThreadPoolExecutor(max_workers=max(1, min(content_concurrency, len(subtopics))))
+    try:
+        futures = [
+            executor.submit(run_newsletter_agent, news_articles, "generate_content", topic=topic, top_k=top_k,
+                            article_index=article_index, topic_members=members.get(topic), **agent_kwargs)
+            for topic in subtopics
+        ]
+        contents = {}
+        for topic, future in zip(subtopics, futures):
+            try:
+                content = future.result()
+            except Exception as e:
+                logger.error(f"'{topic}' 주제 내용 생성 실패: {e}")
+                content = None
+            if content:
+                contents[topic] = content
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True)
+    return {"title": topics["title"], "subtopics": subtopics, "contents": contents}
+
+
+def run_newsletter(request: NewsletterRequest, openai_api_key: str,
+                   articles: Optional[List[Article]] = None, **generate_kwargs) -> NewsletterResult:
+    """
+    요청 한 건을 검색부터 생성까지 실행하는 함수 (articles가 주어지면 검색 생략)
+    오류는 예외 대신 결과의 error에 기록합니다.
+    """
+    result = NewsletterResult(request=request)
+    started = time.perf_counter()
+    try:
+        if articles is None:
+            articles = search_articles(request.keywords, request.search_method, request.max_articles)
+            result.timings["search"] = time.perf_counter() - started
+        result.articles = articles
+        if not articles:
+            raise RuntimeError("검색된 기사가 없습니다")
+
+        generate_started = time.perf_counter()
+        generated = generate_newsletter(articles, openai_api_key, mode=request.mode,
+                                        topic_method=request.topic_method, **generate_kwargs)
+        result.timings["generate"] = time.perf_counter() - generate_started
+        result.title = generated["title"]
+        result.subtopics = generated["subtopics"]
+        result.contents = generated["contents"]
+    except Exception as e:
+        result.error = str(e)
+        logger.error(f"'{request.label}' 뉴스레터 생성 실패: {e}")
+    result.timings["total"] = time.perf_counter() - started
+    return result
+
+
+def _run_with_shared_articles(request: NewsletterRequest, openai_api_key: str,
+                              fetched: Dict[tuple, Any], **generate_kwargs) -> NewsletterResult:
+    """공유 검색 결과로 요청 한 건을 생성 (검색 실패는 결과의 error로 기록)"""
+    try:
+        articles = merge_keyword_articles(request, fetched)
+    except RuntimeError as e:
+        logger.error(f"'{request.label}' 뉴스레터 생성 실패: {e}")
+        return NewsletterResult(request=request, error=str(e))
+    return run_newsletter(request, openai_api_key, articles=articles, **generate_kwargs)
+
+
+def run_batch(requests: List[NewsletterRequest], openai_api_key: str,
+              max_workers: int = DEFAULT_BATCH_WORKERS,
+              content_concurrency: int = DEFAULT_CONTENT_CONCURRENCY,
+              naver_client_id: Optional[str] = None, naver_client_secret: Optional[str] = None,
+              **generate_kwargs) -> BatchReport:
+    """
+    여러 뉴스레터를 한 번에 생성하는 함수
+
+    1. 모든 요청의 검색어를 고유 검색어 단위로 한 번씩만 검색 (겹치는 검색어는 공유)
+    2. 요청별로 검색어 결과를 합치고 중복 제거
+    3. 뉴스레터 생성은 max_workers 크기의 풀에서, 주제별 LLM 호출은 모든 뉴스레터가 공유하는
+       content_concurrency 크기의 풀에서 실행 (전체 동시 LLM 호출 수 상한)
+
+    Returns:
+    - BatchReport (요청 순서대로 결과, 처리량)
+    """
+    usage_before = get_token_usage()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="newsletter") as newsletter_pool, \
+            ThreadPoolExecutor(max_workers=max(1, content_concurrency), thread_name_prefix="llm") as llm_pool:
+        fetched = fetch_shared_articles(requests, newsletter_pool, naver_client_id, naver_client_secret)
+        fetch_elapsed = time.perf_counter() - started
+        logger.info(f"고유 키워드 {len(fetched)}개 검색 완료 ({fetch_elapsed:.1f}초)")
+
+        futures = [
+            newsletter_pool.submit(_run_with_shared_articles, request, openai_api_key, fetched,
+                                   content_executor=llm_pool, **generate_kwargs)
+            for request in requests
+        ]
+        results = [future.result() for future in futures]
+
+    usage_after = get_token_usage()
+    return BatchReport(
+        results=results,
+        elapsed=time.perf_counter() - started,
+        fetch_elapsed=fetch_elapsed,
+        keyword_requests=sum(len(request.search_queries) for request in requests),
+        keyword_fetches=len(fetched),
+        token_usage={key: usage_after[key] - usage_before.get(key, 0) for key in usage_after},
+    )
@@ -0,0 +1,204 @@
+import json
+import logging
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import BaseModel, Field, ValidationError
+
+from utils.llm_cache import cached_invoke
+
+logger = logging.getLogger(__name__)
+
+# LLM 재요청(수리) 최대 횟수 기본값
+DEFAULT_MAX_REPAIR_RETRIES = 1
+
+
+# --- 출력 스키마 ---
+
+class Reference(BaseModel):
+    title: str
+    link: str
+
+
+class TopicsResult(BaseModel):
+    title: str = Field(min_length=1)
+    subtopics: List[str] = Field(min_length=1)
+
+
+class ContentResult(BaseModel):
+    text: str = Field(min_length=1)
+    references: List[Reference] = Field(default_factory=list)
+
+
+class NewsletterSection(BaseModel):
+    topic: str = Field(min_length=1)
+    text: str = Field(min_length=1)
+    references: List[Reference] = Field(default_factory=list)
+
+
+class NewsletterResult(BaseModel):
+    title: str = Field(min_length=1)
+    sections: List[NewsletterSection] = Field(min_length=1)
+
+
+# --- 파싱/수리 통계 ---
+
+_stats_lock = threading.Lock()
+_parse_stats = {"ok": 0, "local_repair": 0, "llm_repair": 0, "failed": 0}
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _parse_stats[name] += 1
+
+
+def get_parse_stats() -> Dict[str, int]:
+    """
+    구조화 출력 파싱 통계를 반환하는 함수
+    - ok: 그대로 파싱 성공
+    - local_repair: 로컬 수리 후 성공
+    - llm_repair: LLM 재요청으로 수리 후 성공
+    - failed: 재요청 한도까지 실패
+    """
+    with _stats_lock:
+        return dict(_parse_stats)
+
+
+# --- 로컬 JSON 수리 ---
+
+_FENCE_RE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+
+
+def _missing_closers(text: str) -> str:
+    """JSON 텍스트에서 닫히지 않은 문자열/괄호를 닫는 데 필요한 문자열을 반환"""
+    stack = []
+    in_string = False
+    escape = False
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+    return ('"' if in_string else "") + "".join(reversed(stack))
+
+
+def repair_json_text(text: str) -> str:
+    """
+    LLM이 자주 내는 JSON 형식 오류를 로컬에서 고치는 함수
+    (코드 블록 표시, 앞뒤 설명 문장, 끝의 쉼표, 잘린 괄호/문자열)
+    """
+    text = _FENCE_RE.sub("", (text or "").strip())
+    start = text.find("{")
+    if start < 0:
+        return text
+    end = text.rfind("}")
+    # 마지막 '}'까지가 완결된 객체면 뒤의 설명 문장을 버리고, 아니면 잘린 출력으로 보고 끝까지 사용
+    if end > start and not _missing_closers(text[start:end + 1]):
+        text = text[start:end + 1]
+    else:
+        text = text[start:]
+    text = _TRAILING_COMMA_RE.sub(r"\1", text)
+    text += _missing_closers(text)
+    return _TRAILING_COMMA_RE.sub(r"\1", text)
+
+
+def _load_and_validate(text: str, schema: Type[BaseModel]) -> BaseModel:
+    # strict=False: 문자열 안의 줄바꿈 등 제어 문자 허용
+    return schema.model_validate(json.loads(text, strict=False))
+
+
+def parse_structured(text: str, schema: Type[BaseModel]) -> Tuple[Optional[BaseModel], Optional[str], bool]:
+    """
+    LLM 응답을 스키마로 검증하는 함수 (실패 시 로컬 수리 후 재시도)
+
+    Returns:
+    - (검증된 객체 또는 None, 오류 메시지, 로컬 수리 사용 여부)
+    """
+    try:
+        return _load_and_validate(text, schema), None, False
+    except (ValueError, ValidationError) as e:
+        error = str(e)
+    try:
+        return _load_and_validate(repair_json_text(text), schema), None, True
+    except (ValueError, ValidationError) as e:
+        return None, f"{error}\n(로컬 수리 후: {e})", True
+
+
+def _is_valid(schema: Type[BaseModel]):
+    return lambda text: parse_structured(text, schema)[0] is not None
+
+
+def request_repair(llm, bad_output: str, error: str, schema: Type[BaseModel],
+                   max_retries: int = DEFAULT_MAX_REPAIR_RETRIES) -> Optional[BaseModel]:
+    """
+    잘못된 출력만 LLM에 다시 보내 스키마에 맞게 고치도록 요청하는 함수
+    원래 프롬프트(기사 목록)는 다시 보내지 않으므로 재생성보다 훨씬 저렴합니다.
+    """
+    schema_json = json.dumps(schema.model_json_schema(), ensure_ascii=False, separators=(",", ":"))
+    for attempt in range(max_retries):
+        messages = [
+            SystemMessage(content="당신은 JSON 교정기입니다. 주어진 출력을 내용은 유지한 채 스키마에 맞는 올바른 JSON으로만 고쳐서 반환하세요."),
+            HumanMessage(content=f"스키마:\n{schema_json}\n\n오류:\n{error[:1000]}\n\n고칠 출력:\n{bad_output}")
+        ]
+        repaired_text = cached_invoke(llm, messages, validate=_is_valid(schema))
+        parsed, error, _ = parse_structured(repaired_text, schema)
+        if parsed is not None:
+            _count("llm_repair")
+            logger.info(f"{schema.__name__} 출력 LLM 수리 성공 ({attempt + 1}회차)")
+            return parsed
+        bad_output = repaired_text
+    return None
+
+
+def validate_response(llm, response_text: str, schema: Type[BaseModel],
+                      max_retries: int = DEFAULT_MAX_REPAIR_RETRIES) -> Optional[Dict[str, Any]]:
+    """
+    이미 받은 LLM 응답을 스키마로 검증하고, 필요하면 로컬 수리 -> LLM 수리 순으로 고치는 함수
+
+    Returns:
+    - 검증된 결과 dict (재요청 한도까지 실패하면 None)
+    """
+    parsed, error, repaired = parse_structured(response_text, schema)
+    if parsed is not None:
+        _count("local_repair" if repaired else "ok")
+        return parsed.model_dump()
+
+    logger.warning(f"{schema.__name__} 출력 파싱 실패: {error}")
+    parsed = request_repair(llm, response_text, error, schema, max_retries) if max_retries > 0 else None
+    if parsed is None:
+        _count("failed")
+        logger.error(f"{schema.__name__} 출력 수리 실패")
+        return None
+    return parsed.model_dump()
+
+
+def invoke_structured(llm, messages, schema: Type[BaseModel], bypass_cache: bool = False,
+                      max_retries: int = DEFAULT_MAX_REPAIR_RETRIES) -> Optional[Dict[str, Any]]:
+    """
+    LLM을 호출하고 결과를 스키마로 검증하는 함수
+    검증에 실패한 응답은 캐시에 저장하지 않습니다.
+
+    Parameters:
+    - llm: LangChain 채팅 모델
+    - messages: 전달할 메시지 목록
+    - schema: 결과 pydantic 스키마
+    - bypass_cache: True면 응답 캐시 사용 안 함
+    - max_retries: 잘못된 출력 수리를 위한 LLM 재요청 최대 횟수
+
+    Returns:
+    - 검증된 결과 dict (실패 시 None)
+    """
+    response_text = cached_invoke(llm, messages, bypass=bypass_cache, validate=_is_valid(schema))
+    return validate_response(llm, response_text, schema, max_retries)
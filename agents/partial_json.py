@@ -0,0 +1,110 @@
+import json
+from typing import Optional
+
+
+class PartialJSONFieldReader:
+    """
+    스트리밍으로 들어오는 JSON 객체에서 최상위 문자열 필드 하나를 점진적으로 읽어내는 리더
+
+    예) '{"text": "안녕' 까지 받은 상태에서도 '안녕'을 돌려줍니다.
+    응답 앞의 ```json 같은 코드 블록 표시나 다른 필드(references 등)는 무시합니다.
+
+    사용법:
+        reader = PartialJSONFieldReader("text")
+        for chunk in chunks:
+            new_text = reader.feed(chunk)
+    """
+
+    def __init__(self, field: str = "text"):
+        self.field = field
+        self.done = False           # 필드 문자열이 끝까지 읽혔는지 여부
+        self._parts = []
+        self._depth = 0
+        self._in_string = False
+        self._is_key = False
+        self._expect_key = False
+        self._capturing = False
+        self._escape: Optional[str] = None
+        self._pending_high: Optional[str] = None
+        self._key_buf = []
+        self._last_key: Optional[str] = None
+
+    @property
+    def value(self) -> str:
+        """지금까지 읽은 필드 값"""
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> str:
+        """
+        새로 받은 조각을 처리하고, 이번에 새로 디코딩된 필드 텍스트를 반환하는 함수
+        """
+        out = []
+        for ch in chunk:
+            if self._in_string:
+                self._consume_string_char(ch, out)
+            else:
+                self._consume_structure_char(ch)
+        new_text = "".join(out)
+        if new_text:
+            self._parts.append(new_text)
+        return new_text
+
+    def _emit(self, text: str, out: list) -> None:
+        if self._capturing:
+            out.append(text)
+        elif self._is_key:
+            self._key_buf.append(text)
+
+    def _consume_string_char(self, ch: str, out: list) -> None:
+        if self._escape is not None:
+            self._escape += ch
+            if self._escape[0] == "u" and len(self._escape) < 5:
+                return
+            self._emit(self._decode_escape(self._escape), out)
+            self._escape = None
+        elif ch == "\\":
+            self._escape = ""
+        elif ch == '"':
+            self._in_string = False
+            if self._is_key:
+                self._last_key = "".join(self._key_buf)
+                self._is_key = False
+            if self._capturing:
+                self._capturing = False
+                self.done = True
+        else:
+            self._emit(ch, out)
+
+    def _decode_escape(self, escape: str) -> str:
+        """JSON 이스케이프 시퀀스 하나를 디코딩 (서로게이트 쌍은 합쳐서 반환)"""
+        try:
+            decoded = json.loads(f'"\\{escape}"')
+        except ValueError:
+            return escape
+        if len(decoded) == 1 and "\ud800" <= decoded <= "\udbff":
+            self._pending_high = decoded
+            return ""
+        if self._pending_high is not None:
+            high, self._pending_high = self._pending_high, None
+            if "\udc00" <= decoded <= "\udfff":
+                return (high + decoded).encode("utf-16", "surrogatepass").decode("utf-16")
+        return decoded
+
+    def _consume_structure_char(self, ch: str) -> None:
+        if ch in "{[":
+            self._depth += 1
+            if self._depth == 1 and ch == "{":
+                self._expect_key = True
+        elif ch in "}]":
+            self._depth -= 1
+        elif ch == "," and self._depth == 1:
+            self._expect_key = True
+        elif ch == ":" and self._depth == 1:
+            self._expect_key = False
+        elif ch == '"':
+            self._in_string = True
+            self._is_key = self._depth == 1 and self._expect_key
+            self._key_buf = []
+            if (self._depth == 1 and not self._expect_key
+                    and self._last_key == self.field and not self.done):
+                self._capturing = True
@@ -0,0 +1,155 @@
+import json
+import logging
+import os
+import textwrap
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+logger = logging.getLogger(__name__)
+
+# 모델별 프롬프트 입력 토큰 예산 (컨텍스트 한도가 아니라 비용 관리를 위한 상한)
+MODEL_INPUT_BUDGETS = {
+    "gpt-4o-mini": 16000,
+    "gpt-4o": 16000,
+    "gpt-4-turbo": 16000,
+    "gpt-3.5-turbo": 12000,
+}
+DEFAULT_INPUT_BUDGET = 8000
+# 메시지 하나당 역할/구분자 등으로 붙는 토큰 수 (근사값)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# 기사 필드별 최대 글자 수 기본값
+DEFAULT_FIELD_LIMITS = {"title": 150, "link": 300, "description": 300}
+
+
+@dataclass
+class PromptReport:
+    """프롬프트 토큰 사용 보고"""
+    tokens: int
+    budget: int
+    articles_total: int
+    articles_included: int
+
+    @property
+    def articles_dropped(self) -> int:
+        return self.articles_total - self.articles_included
+
+    def __str__(self) -> str:
+        return (f"{self.tokens}/{self.budget} tokens, "
+                f"기사 {self.articles_included}/{self.articles_total}개")
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    """
+    모델의 tiktoken 인코딩 (모델별로 한 번만 준비)
+    tiktoken은 처음 쓸 때 인코딩 파일을 내려받으므로 오프라인/프록시 환경에서는 실패할 수 있으며,
+    이때는 경고를 한 번 남기고 None을 반환합니다 (실패 결과도 캐시되어 다시 시도하지 않음).
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken 인코딩을 불러오지 못해 추정치로 토큰 수를 계산합니다 ({model}): {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """
+    텍스트의 토큰 수를 세는 함수
+    tiktoken을 쓸 수 없으면(미설치, 인코딩 파일 다운로드 실패 등) 글자 수 기반 추정치
+    (한글 1글자≈1토큰, 그 외 4글자≈1토큰)를 사용합니다.
+    """
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    hangul = sum(1 for ch in text if "가" <= ch <= "힣")
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+def get_input_budget(model: str) -> int:
+    """모델의 입력 토큰 예산 (PROMPT_INPUT_BUDGET 환경 변수로 덮어쓸 수 있음)"""
+    override = os.getenv("PROMPT_INPUT_BUDGET")
+    if override:
+        return int(override)
+    return MODEL_INPUT_BUDGETS.get(model, DEFAULT_INPUT_BUDGET)
+
+
+def truncate(text: str, max_chars: int) -> str:
+    """공백 정리 후 최대 글자 수로 자르는 함수"""
+    text = " ".join((text or "").split())
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars - 1].rstrip() + "…"
+
+
+def compact_article(article: Dict[str, Any], field_limits: Dict[str, int]) -> Dict[str, str]:
+    """프롬프트에 필요한 필드만 남기고 필드별 길이를 제한한 기사 정보 (값이 없는 필드는 생략)"""
+    return {field: truncate(str(article.get(field, "")), limit)
+            for field, limit in field_limits.items() if article.get(field)}
+
+
+def serialize_article(article_info: Dict[str, str]) -> str:
+    """기사 하나를 들여쓰기 없는 한 줄 JSON으로 직렬화"""
+    return json.dumps(article_info, ensure_ascii=False, separators=(",", ":"))
+
+
+def build_messages(system_prompt: str, user_template: str, articles: Sequence[Dict[str, Any]],
+                   model: str, field_limits: Optional[Dict[str, int]] = None,
+                   budget: Optional[int] = None) -> Tuple[List[Any], List[Dict[str, str]], PromptReport]:
+    """
+    토큰 예산 안에서 기사 목록을 넣은 프롬프트 메시지를 만드는 함수
+
+    기사 목록은 우선순위 순서(앞쪽이 중요)로 전달해야 하며,
+    예산을 넘으면 뒤쪽(우선순위가 낮은) 기사부터 제외합니다.
+
+    Parameters:
+    - system_prompt: 시스템 프롬프트
+    - user_template: 사용자 프롬프트 ('{articles}' 자리에 기사 목록이 들어감)
+    - articles: 뉴스 기사 목록 (우선순위 순)
+    - model: 토큰 계산과 예산 결정에 사용할 모델 이름
+    - field_limits: {필드: 최대 글자 수} (프롬프트에 넣을 필드와 길이)
+    - budget: 입력 토큰 예산 (None이면 모델 기본값)
+
+    Returns:
+    - (메시지 목록, 프롬프트에 넣은 기사 정보 목록, PromptReport)
+    """
+    field_limits = field_limits or DEFAULT_FIELD_LIMITS
+    budget = budget or get_input_budget(model)
+    system_prompt = textwrap.dedent(system_prompt).strip()
+    user_template = textwrap.dedent(user_template).strip()
+
+    fixed_tokens = (count_tokens(system_prompt, model)
+                    + count_tokens(user_template.replace("{articles}", ""), model)
+                    + 2 * MESSAGE_OVERHEAD_TOKENS)
+
+    included = []
+    lines = []
+    used = fixed_tokens
+    for article in articles:
+        info = compact_article(article, field_limits)
+        line = serialize_article(info)
+        # 줄바꿈 1토큰 포함
+        cost = count_tokens(line, model) + 1
+        if used + cost > budget and included:
+            break
+        included.append(info)
+        lines.append(line)
+        used += cost
+
+    user_prompt = user_template.replace("{articles}", "\n".join(lines))
+    messages = [SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)]
+    report = PromptReport(tokens=used, budget=budget, articles_total=len(articles),
+                          articles_included=len(included))
+    if report.articles_dropped:
+        logger.info(f"입력 토큰 예산 초과로 우선순위가 낮은 기사 {report.articles_dropped}개 제외")
+    return messages, included, report
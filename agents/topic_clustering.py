@@ -0,0 +1,277 @@
+import math
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from agents.article_index import tokenize
+
+# 기본 클러스터링 설정
+DEFAULT_NUM_TOPICS = 5
+MIN_CLUSTER_SIZE = 2        # 주제 수를 정할 때 주제당 최소 기사 수
+MAX_DF = 0.6                # 이 비율보다 많은 기사에 나오는 단어(검색 키워드 등)는 주제 구분에 쓰지 않음
+DEFAULT_ITERATIONS = 20
+DEFAULT_RESTARTS = 5
+DEFAULT_LABEL_KEYWORDS = 3
+
+# 주제 구분과 라벨에서 뺄 불용어 (영어 기능어, 기사에 흔한 한국어 서술/일반 표현)
+_STOPWORDS = {
+    "the", "a", "an", "and", "or", "of", "to", "in", "for", "on", "with", "at", "by", "from", "is", "are",
+    "was", "be", "as", "it", "its", "this", "that", "new", "how", "what", "why", "you", "your", "we",
+    "있다", "했다", "한다", "된다", "밝혔다", "전했다", "위해", "위한", "대한", "통해", "따라", "관련", "이번",
+    "지난", "올해", "내년", "최근", "가운데", "이후", "나섰다", "확대", "강화", "도입", "공개", "발표", "추진",
+    "예정", "계획", "본격", "가속", "착수", "진행", "기대", "전망", "업계", "시장", "주요", "기술", "서비스",
+}
+# 서술어 어미 (이 어미로 끝나는 어절은 주제어가 아니므로 제외)
+_VERB_ENDINGS = ("했다", "한다", "된다", "됐다", "있다", "없다", "졌다", "냈다", "섰다")
+# 라벨용으로 어절 끝에서 떼어낼 조사 (긴 것부터)
+_JOSA = ("에서는", "에서", "으로", "에게", "까지", "부터", "은", "는", "이", "가", "을", "를", "의", "에",
+         "로", "와", "과", "도", "만")
+
+
+@dataclass
+class TopicCluster:
+    """
+    기사 클러스터 하나 (하위 주제 후보)
+
+    - label: 대표 키워드로 만든 임시 주제 이름
+    - keywords: 클러스터 중심에서 가중치가 높은 단어 (중요도 순)
+    - members: 소속 기사 인덱스 (중심과 가까운 순)
+    - cohesion: 소속 기사와 중심의 평균 코사인 유사도
+    """
+    label: str
+    keywords: List[str]
+    members: List[int] = field(default_factory=list)
+    cohesion: float = 0.0
+
+    def articles(self, news_articles: Sequence[Any]) -> List[Any]:
+        return [news_articles[i] for i in self.members]
+
+
+def _is_stopword(word: str) -> bool:
+    return word in _STOPWORDS or word.endswith(_VERB_ENDINGS)
+
+
+def _strip_josa(word: str) -> str:
+    if "가" <= word[0] <= "힣" and len(word) > 2:
+        for josa in _JOSA:
+            if word.endswith(josa) and len(word) - len(josa) >= 2:
+                return word[:-len(josa)]
+    return word
+
+
+def _normalize(vector: Dict[str, float]) -> Dict[str, float]:
+    norm = math.sqrt(sum(w * w for w in vector.values()))
+    return {t: w / norm for t, w in vector.items()} if norm else {}
+
+
+def _dot(doc: Dict[str, float], centroid: Dict[str, float]) -> float:
+    return sum(w * centroid.get(t, 0.0) for t, w in doc.items())
+
+
+def vectorize(articles: Sequence[Any], title_weight: int = 2, max_df: float = MAX_DF) -> List[Dict[str, float]]:
+    """
+    기사별 TF-IDF 희소 벡터(L2 정규화)를 만드는 함수
+    토큰은 검색 인덱스와 같은 방식(어절 + 한글 2글자 n-gram)을 쓰고,
+    한 기사에만 나오거나 max_df 비율보다 많은 기사에 나오는 토큰은 제외합니다.
+    """
+    counts = []
+    df = Counter()
+    for article in articles:
+        tokens = tokenize(article.get("title", "")) * title_weight + tokenize(article.get("description", ""))
+        tf = Counter(t for t in tokens if len(t) > 1 and not _is_stopword(t))
+        counts.append(tf)
+        df.update(tf.keys())
+
+    n_docs = len(articles)
+    max_count = max(2, int(max_df * n_docs))
+    idf = {t: math.log((1 + n_docs) / (1 + freq)) + 1.0 for t, freq in df.items() if 2 <= freq <= max_count}
+    return [_normalize({t: (1 + math.log(c)) * idf[t] for t, c in tf.items() if t in idf}) for tf in counts]
+
+
+def _init_centroids(vectors: List[Dict[str, float]], k: int, rng: random.Random) -> List[Dict[str, float]]:
+    """k-means++ 초기화 (이미 고른 중심과 유사도가 낮은 기사를 높은 확률로 선택)"""
+    candidates = [i for i, v in enumerate(vectors) if v]
+    centroids = [vectors[rng.choice(candidates)]]
+    best = [_dot(vectors[i], centroids[0]) for i in range(len(vectors))]
+    while len(centroids) < k:
+        weights = [(1.0 - best[i]) ** 2 if vectors[i] else 0.0 for i in range(len(vectors))]
+        total = sum(weights)
+        if total <= 0:
+            break
+        pick = rng.random() * total
+        for i, weight in enumerate(weights):
+            pick -= weight
+            if pick <= 0:
+                break
+        centroids.append(vectors[i])
+        best = [max(b, _dot(vectors[j], vectors[i])) for j, b in enumerate(best)]
+    return centroids
+
+
+def kmeans(vectors: List[Dict[str, float]], k: int, iterations: int = DEFAULT_ITERATIONS,
+           seed: int = 0) -> List[int]:
+    """
+    코사인 유사도 기반(spherical) k-means
+    빈 벡터(주제 단어가 없는 기사)는 -1로 할당합니다.
+
+    Returns:
+    - 기사별 클러스터 번호 목록
+    """
+    rng = random.Random(seed)
+    centroids = _init_centroids(vectors, k, rng)
+    assignment = [-1] * len(vectors)
+    for _ in range(iterations):
+        changed = False
+        for i, vector in enumerate(vectors):
+            if not vector:
+                continue
+            cluster = max(range(len(centroids)), key=lambda c: _dot(vector, centroids[c]))
+            if cluster != assignment[i]:
+                assignment[i] = cluster
+                changed = True
+        if not changed:
+            break
+        sums: List[Dict[str, float]] = [{} for _ in centroids]
+        for i, cluster in enumerate(assignment):
+            if cluster >= 0:
+                acc = sums[cluster]
+                for t, w in vectors[i].items():
+                    acc[t] = acc.get(t, 0.0) + w
+        centroids = [_normalize(acc) if acc else centroids[c] for c, acc in enumerate(sums)]
+    return assignment
+
+
+def _cohesion(vectors: List[Dict[str, float]], assignment: List[int], k: int) -> float:
+    """전체 기사와 소속 클러스터 중심의 유사도 합 (재시작 중 가장 좋은 결과 선택용)"""
+    centroids = _centroids(vectors, assignment, k)
+    return sum(_dot(v, centroids[c]) for v, c in zip(vectors, assignment) if c >= 0)
+
+
+def _centroids(vectors: List[Dict[str, float]], assignment: List[int], k: int) -> List[Dict[str, float]]:
+    sums: List[Dict[str, float]] = [{} for _ in range(k)]
+    for vector, cluster in zip(vectors, assignment):
+        if cluster >= 0:
+            acc = sums[cluster]
+            for t, w in vector.items():
+                acc[t] = acc.get(t, 0.0) + w
+    return [_normalize(acc) for acc in sums]
+
+
+def _label_keywords(centroid: Dict[str, float], members: List[int], articles: Sequence[Any],
+                    limit: int) -> List[str]:
+    """
+    클러스터 대표 키워드 선택
+    소속 기사의 단어(조사 제거) 중 중심 가중치와 출현 빈도가 높은 순으로 고르며,
+    서로 포함 관계인 단어는 하나만 남깁니다.
+    """
+    # 제목 단어를 우선하고(2배), 요약 단어로 보충
+    words = Counter()
+    for i in members:
+        article = articles[i]
+        title_words = {_strip_josa(w) for w in tokenize(article.get("title", ""), ngrams=False)}
+        words.update({w: 2 for w in title_words})
+        words.update({_strip_josa(w) for w in tokenize(article.get("description", ""), ngrams=False)} - title_words)
+
+    def weight(word: str) -> float:
+        # 단어 자체의 가중치, 없으면(n-gram만 특징으로 남은 경우) n-gram 가중치 평균
+        if word in centroid:
+            return centroid[word]
+        grams = [word[i:i + 2] for i in range(len(word) - 1)]
+        return sum(centroid.get(g, 0.0) for g in grams) / len(grams) if grams else 0.0
+
+    candidates = sorted(
+        (w for w in words if len(w) > 1 and not _is_stopword(w) and not w.isdigit()),
+        key=lambda w: (-weight(w) * math.sqrt(words[w]), w)
+    )
+    chosen: List[str] = []
+    for word in candidates:
+        if weight(word) <= 0:
+            break
+        if any(word in other or other in word for other in chosen):
+            continue
+        chosen.append(word)
+        if len(chosen) >= limit:
+            break
+    return chosen
+
+
+def cluster_articles(articles: Sequence[Any], num_topics: Optional[int] = None, seed: int = 0,
+                     restarts: int = DEFAULT_RESTARTS, label_keywords: int = DEFAULT_LABEL_KEYWORDS) -> List[TopicCluster]:
+    """
+    기사 목록을 TF-IDF + k-means로 묶어 하위 주제 후보를 만드는 함수 (LLM 호출 없음)
+
+    Parameters:
+    - articles: 뉴스 기사 목록 (Article 또는 dict)
+    - num_topics: 주제 수 (None이면 기사 수에 맞춰 최대 DEFAULT_NUM_TOPICS개)
+    - seed / restarts: 초기화 난수 시드와 재시작 횟수 (가장 응집도가 높은 결과 사용)
+    - label_keywords: 클러스터당 대표 키워드 수
+
+    Returns:
+    - TopicCluster 목록 (기사 수가 많은 클러스터부터, 빈 클러스터 제외)
+      주제 단어가 없는 기사는 가장 큰 클러스터에 포함
+    """
+    if not articles:
+        return []
+    vectors = vectorize(articles)
+    usable = sum(1 for v in vectors if v)
+    k = num_topics or max(1, min(DEFAULT_NUM_TOPICS, len(articles) // MIN_CLUSTER_SIZE))
+    k = max(1, min(k, usable))
+    if usable == 0:
+        return [TopicCluster(label="주요 뉴스", keywords=[], members=list(range(len(articles))))]
+
+    best_assignment, best_score = None, -1.0
+    for restart in range(max(1, restarts)):
+        assignment = kmeans(vectors, k, seed=seed + restart)
+        score = _cohesion(vectors, assignment, k)
+        if score > best_score:
+            best_assignment, best_score = assignment, score
+
+    centroids = _centroids(vectors, best_assignment, k)
+    clusters = []
+    for c, centroid in enumerate(centroids):
+        members = [i for i, cluster in enumerate(best_assignment) if cluster == c]
+        if not members:
+            continue
+        similarity = {i: _dot(vectors[i], centroid) for i in members}
+        members.sort(key=lambda i: -similarity[i])
+        keywords = _label_keywords(centroid, members, articles, label_keywords)
+        clusters.append(TopicCluster(
+            label=" · ".join(keywords) or articles[members[0]].get("title", "주요 뉴스"),
+            keywords=keywords,
+            members=members,
+            cohesion=sum(similarity.values()) / len(members),
+        ))
+    clusters.sort(key=lambda cluster: (-len(cluster.members), -cluster.cohesion))
+
+    unassigned = [i for i, cluster in enumerate(best_assignment) if cluster < 0]
+    if unassigned and clusters:
+        clusters[0].members.extend(unassigned)
+    return clusters
+
+
+def clusters_to_topics(clusters: List[TopicCluster], names: Optional[List[str]] = None,
+                       title: Optional[str] = None) -> Dict[str, Any]:
+    """
+    클러스터 목록을 주제 선정 결과 형식으로 변환하는 함수
+
+    Parameters:
+    - clusters: TopicCluster 목록
+    - names: 클러스터 순서대로의 주제 이름 (LLM이 다듬은 이름, 없거나 모자라면 키워드 라벨 사용)
+    - title: 뉴스레터 제목 (없으면 상위 클러스터 라벨로 생성)
+
+    Returns:
+    - {"title", "subtopics", "members": {주제: 기사 인덱스 목록}}
+    """
+    names = names or []
+    members: Dict[str, List[int]] = {}
+    for i, cluster in enumerate(clusters):
+        name = (names[i].strip() if i < len(names) and names[i] else "") or cluster.label
+        # 주제 이름이 겹치면 키워드 라벨을 덧붙여 구분
+        if name in members:
+            name = f"{name} ({cluster.label})"
+        members[name] = list(cluster.members)
+    if not title:
+        title = "이번 호 주요 뉴스: " + ", ".join(cluster.keywords[0] if cluster.keywords else cluster.label
+                                          for cluster in clusters[:3])
+    return {"title": title, "subtopics": list(members), "members": members}
@@ -1,20 +1,24 @@
 # -*- coding: utf-8 -*-
-# pip install feedparser schedule python-dotenv openai langchain langchain-openai requests
+# pip install feedparser python-dotenv openai langchain langchain-openai requests
 import os
-import smtplib
-import feedparser
-import schedule
-import time
 from datetime import datetime
-from email.mime.text import MIMEText
-from email.header import Header
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
-from langchain.schema.output_parser import StrOutputParser
-from langchain.schema.runnable import RunnablePassthrough
 import logging
 
+from utils.article import Article, select_recent
+from utils.article_body import BodyFetcher
+from utils.dedupe import ArticleDeduper
+from utils.email_delivery import SMTPConfig
+from utils.feed_cache import get_feed_cache
+from utils.feed_fetcher import fetch_feeds
+from utils.llm_cache import cached_invoke, get_llm_cache
+from utils.newsletter_render import make_issue_id, render_issue
+from utils.outbox import OutboxWorker, get_outbox
+from utils.scheduler import Scheduler
+from utils.seen_store import SeenArticleStore
+
 # --- 설정 ---
 # .env 파일에서 환경 변수 로드
 load_dotenv()
@@ -35,6 +39,26 @@ GMAIL_USER = os.getenv("GMAIL_USER") # 보내는 사람 Gmail 주소
 GMAIL_PASSWORD = os.getenv("GMAIL_APP_PASSWORD") # Gmail 앱 비밀번호
 RECIPIENT_EMAILS = os.getenv("RECIPIENT_EMAILS", "").split(',') # 받는 사람 이메일 주소 (쉼표로 구분)
 
+# SMTP 발송 설정 (기본: Gmail SMTPS, SMTP_HOST/SMTP_PORT/SMTP_SECURITY 등으로 변경 가능)
+SMTP_CONFIG = SMTPConfig.from_env()
+SMTP_MAX_CONNECTIONS = int(os.getenv("SMTP_MAX_CONNECTIONS", "4")) # 동시에 유지할 SMTP 연결 수
+
+# 발송 대기열: 생성 단계는 대기열에 넣기만 하고, 백그라운드 작업자가 재시도/백오프하며 발송
+# (import만으로 DB를 열거나 스레드를 만들지 않도록 처음 쓸 때 생성)
+_outbox_worker = None
+
+
+def get_outbox_worker():
+    """
+    발송 작업자를 반환하는 함수 (처음 호출할 때 생성, 시작하지는 않음)
+    send_email()은 대기열에 넣기만 하므로, 이 모듈을 가져다 쓰는 쪽은 get_outbox_worker().start()로
+    작업자를 시작하거나 drain()으로 직접 대기열을 비워야 실제로 발송됩니다.
+    """
+    global _outbox_worker
+    if _outbox_worker is None:
+        _outbox_worker = OutboxWorker(get_outbox(), SMTP_CONFIG, threads=SMTP_MAX_CONNECTIONS)
+    return _outbox_worker
+
 
 
 if not GMAIL_USER or not GMAIL_PASSWORD or not RECIPIENT_EMAILS:
@@ -54,55 +78,88 @@ RSS_FEEDS = {
     # 다른 주요 기술 뉴스 사이트의 AI 섹션 RSS 추가 가능
 }
 
+# 피드 수집 설정 (동시 요청 수, 연결/읽기/전체 제한 시간(초))
+FEED_MAX_WORKERS = int(os.getenv("FEED_MAX_WORKERS", "8"))
+FEED_CONNECT_TIMEOUT = 5
+FEED_READ_TIMEOUT = 15
+FEED_DEADLINE = 30
+# 피드 캐시 TTL (초) - TTL이 지나면 ETag/Last-Modified 조건부 요청으로 재검증
+FEED_CACHE_TTL = int(os.getenv("FEED_CACHE_TTL", "600"))
+
 # 뉴스 요약에 사용할 LLM 모델
 LLM_MODEL = "gpt-4o-mini" # 또는 "gpt-3.5-turbo" 등
 
-# 뉴스레터 제목
-NEWSLETTER_SUBJECT = f"오늘의 AI 동향 뉴스레터 ({datetime.now().strftime('%Y-%m-%d')})"
+# 뉴스레터 제목 (실행할 때마다 그날 날짜로 채움 - 스케줄러가 여러 날 계속 실행되므로)
+NEWSLETTER_SUBJECT_TEMPLATE = "오늘의 AI 동향 뉴스레터 ({date})"
+
+# 발송 일정 (cron 표현식 "분 시 일 월 요일", 여러 개는 ';'로 구분)
+# 예: "0 8 * * *" = 매일 08:00, "0 8 * * 1-5;0 10 * * 0,6" = 평일 08:00 + 주말 10:00
+NEWSLETTER_SCHEDULES = [cron.strip() for cron in os.getenv("NEWSLETTER_SCHEDULES", "0 8 * * *").split(";") if cron.strip()]
+# 스크립트 시작 시 1회 즉시 실행 여부
+RUN_ON_START = os.getenv("RUN_ON_START", "1").lower() in ("1", "true", "yes")
 
 # 한번에 요약할 최대 기사 수 (API 비용 및 시간 관리)
 MAX_ARTICLES_TO_SUMMARIZE = 20
 
+# 기사 원문 본문 수집 (요약할 기사만, 호스트별 동시 요청/간격 제한, 본문은 디스크 캐시)
+# 본문을 수집할 피드 이름을 쉼표로 구분 ("*"는 전체, 비우면 수집하지 않음)
+_body_sources = [name.strip() for name in os.getenv("ARTICLE_BODY_SOURCES", "").split(",") if name.strip()]
+ARTICLE_BODY_SOURCES = None if "*" in _body_sources else _body_sources
+ARTICLE_BODY_ENABLED = bool(_body_sources)
+# 프롬프트에 넣을 기사당 본문 최대 글자 수
+ARTICLE_BODY_PROMPT_CHARS = 800
+
+# 처리한 기사 기록: 지난 성공 실행 이후 새로 나왔거나 내용이 바뀐 기사만 요약
+# (보관 기간은 SEEN_RETENTION_DAYS 환경 변수, 기본 30일, import만으로 DB를 열지 않도록 처음 쓸 때 생성)
+SEEN_PIPELINE = "daily_newsletter"
+_seen_store = None
+
+
+def get_seen_store():
+    """처리한 기사 기록 저장소를 반환하는 함수 (처음 호출할 때 생성)"""
+    global _seen_store
+    if _seen_store is None:
+        _seen_store = SeenArticleStore()
+    return _seen_store
+
 # --- 기능 함수 ---
 
 def fetch_rss_feeds(feed_urls):
-    """지정된 RSS 피드 목록에서 최신 뉴스 항목을 가져옵니다."""
+    """지정된 RSS 피드 목록에서 뉴스 항목을 동시에 가져옵니다. (수집 순서, 최신순 선택은 select_recent 사용)"""
     all_entries = []
+    deduper = ArticleDeduper()
     logging.info(f"{len(feed_urls)}개의 RSS 피드에서 뉴스 수집 시작...")
-    import ssl
-
-    if hasattr(ssl, '_create_unverified_context'):
-        ssl._create_default_https_context = ssl._create_unverified_context
-
-    for name, url in feed_urls.items():
-        try:
-            feed = feedparser.parse(url)
-            if feed.bozo: # feedparser가 파싱 오류를 감지했을 때
-                 logging.warning(f"'{name}' 피드 파싱 중 문제 발생 (URL: {url}): {feed.bozo_exception}")
-                 continue
-            logging.info(f"'{name}' 피드에서 {len(feed.entries)}개 항목 수집 완료.")
-            for entry in feed.entries:
-                # 간단한 정보만 추출 (제목, 링크, 발행일 - 존재할 경우)
-                published_time = entry.get('published_parsed') or entry.get('updated_parsed')
-                entry_data = {
-                    'title': entry.title,
-                    'link': entry.link,
-                    'published': time.strftime('%Y-%m-%d %H:%M:%S', published_time) if published_time else 'N/A',
-                    'source': name
-                }
-                # 간단한 중복 제거 (제목과 링크 기준) - 더 정교한 방법 필요시 개선
-                if not any(e['title'] == entry_data['title'] and e['link'] == entry_data['link'] for e in all_entries):
-                     all_entries.append(entry_data)
-
-        except Exception as e:
-            logging.error(f"'{name}' 피드 처리 중 오류 발생 (URL: {url}): {e}")
+
+    # 피드는 스레드 풀에서 동시에 요청하고, 완료되는 순서대로 병합
+    # (기존 ssl 우회 설정과 동일하게 인증서 검증은 하지 않음)
+    for result in fetch_feeds(feed_urls, max_workers=FEED_MAX_WORKERS,
+                              connect_timeout=FEED_CONNECT_TIMEOUT,
+                              read_timeout=FEED_READ_TIMEOUT,
+                              deadline=FEED_DEADLINE,
+                              verify=False,
+                              cache=get_feed_cache(),
+                              ttl=FEED_CACHE_TTL):
+        name, url = result.name, result.url
+        if result.bozo: # feedparser가 파싱 오류를 감지했을 때
+            logging.warning(f"'{name}' 피드 파싱 중 문제 발생 (URL: {url}): {result.error}")
+            continue
+        if result.error:
+            logging.error(f"'{name}' 피드 처리 중 오류 발생 (URL: {url}): {result.error}")
+            continue
+        cache_note = ", 캐시" if result.from_cache else ""
+        logging.info(f"'{name}' 피드에서 {len(result.entries)}개 항목 수집 완료. ({result.elapsed:.2f}초{cache_note})")
+        for entry in result.entries:
+            # 발행일은 피드 파싱 시 변환한 epoch 초를 그대로 사용 (요약은 내용 변경 감지용)
+            article = Article.from_feed_entry(entry, source=name)
+            # 정규화된 URL 기준 중복 제거 (해시 인덱스, O(n))
+            if deduper.add(article):
+                all_entries.append(article)
+
     logging.info(f"총 {len(all_entries)}개의 고유 뉴스 항목 수집 완료.")
-    # 최신순으로 정렬 (발행일 기준, 'N/A'는 뒤로)
-    all_entries.sort(key=lambda x: x['published'] if x['published'] != 'N/A' else '0000-00-00 00:00:00', reverse=True)
     return all_entries
 
 def summarize_news_with_langchain(articles):
-    """Langchain과 OpenAI LLM을 사용하여 뉴스 기사 목록을 요약합니다."""
+    """Langchain과 OpenAI LLM을 사용하여 뉴스 기사 목록을 요약합니다. (오류 시 None)"""
     if not articles:
         logging.info("요약할 기사가 없습니다.")
         return "요약할 최신 AI 뉴스가 없습니다."
@@ -148,66 +205,95 @@ def summarize_news_with_langchain(articles):
     # 기사 목록을 문자열로 변환
     news_list_str = ""
     for i, article in enumerate(articles):
-        news_list_str += f"{i+1}. 제목: {article['title']}\n   링크: {article['link']}\n   출처: {article['source']}\n\n"
+        news_list_str += f"{i+1}. 제목: {article.title}\n   링크: {article.link}\n   출처: {article.source}\n"
+        if article.body:
+            news_list_str += f"   본문: {article.body[:ARTICLE_BODY_PROMPT_CHARS]}\n"
+        news_list_str += "\n"
 
 
-    # Langchain 체인 생성 및 실행
-    # RunnablePassthrough를 사용하여 news_list를 딕셔너리 형태로 전달
-    # StrOutputParser()를 사용하여 LLM의 출력을 문자열로 파싱
-    chain = {"news_list": RunnablePassthrough()} | prompt_template | llm | StrOutputParser()
+    # 프롬프트 메시지 생성 후 응답 캐시를 거쳐 LLM 호출
+    # (같은 기사 목록으로 다시 실행하면 API를 호출하지 않고 저장된 응답 사용)
+    messages = prompt_template.format_messages(news_list=news_list_str)
 
     try:
-        # invoke 메소드에 news_list_str 직접 전달
-        summary = chain.invoke(news_list_str)
-        logging.info("뉴스 요약 및 뉴스레터 초안 생성 완료.")
-        summary = summary.replace("\n","<br>")
+        summary = cached_invoke(llm, messages)
+        cache_stats = get_llm_cache().stats
+        logging.info(f"뉴스 요약 및 뉴스레터 초안 생성 완료. (LLM 캐시 적중 {cache_stats['hits']}회, 미적중 {cache_stats['misses']}회)")
         return summary
     except Exception as e:
         logging.error(f"OpenAI API 호출 또는 Langchain 처리 중 오류 발생: {e}")
-        return f"뉴스 요약 중 오류가 발생했습니다: {e}"
+        return None
 
 
-def send_email(subject, body, recipient_emails):
-    """Gmail을 사용하여 이메일을 발송합니다."""
-    if not recipient_emails or not recipient_emails[0]:
+def send_email(issue, recipient_emails):
+    """
+    렌더링된 뉴스레터를 수신자별 메시지로 발송 대기열(outbox)에 넣고 발송 작업자를 깨웁니다.
+    실제 발송은 작업자가 하므로 get_outbox_worker().start()가 먼저 호출되어 있어야 합니다 (__main__에서 시작).
+    """
+    recipient_emails = [email.strip() for email in recipient_emails if email and email.strip()]
+    if not recipient_emails:
          logging.warning("수신자 이메일 주소가 설정되지 않아 이메일을 발송할 수 없습니다.")
          return
 
-    msg = MIMEText(body, 'plain', 'utf-8') # 본문을 UTF-8로 인코딩
-    msg['Subject'] = Header(subject, 'utf-8') # 제목을 UTF-8로 인코딩
-    msg['From'] = GMAIL_USER
-    msg['To'] = ", ".join(recipient_emails) # 여러 수신자 처리
-
-    logging.info(f"'{', '.join(recipient_emails)}' 주소로 이메일 발송 시도...")
-    try:
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as smtp_server:
-            smtp_server.login(GMAIL_USER, GMAIL_PASSWORD)
-            smtp_server.sendmail(GMAIL_USER, recipient_emails, msg.as_string())
-        logging.info("이메일 발송 성공!")
-    except smtplib.SMTPAuthenticationError:
-        # logging.error("Gmail 로그인 실패. 이메일 주소와 앱 비밀번호를 확인하세요.")
-        # logging.error("2단계 인증 사용 시 '앱 비밀번호'를 생성하여 사용해야 합니다.")
-        print("Gmail 로그인 실패. 이메일 주소와 앱 비밀번호를 확인하세요.")
-    except Exception as e:
-        # logging.error(f"이메일 발송 중 오류 발생: {e}")
-        print(f"이메일 발송 중 오류 발생: {e}")
+    # 같은 호는 이미 대기열에 넣은(보낸) 수신자에게 다시 보내지 않음
+    outbox = get_outbox()
+    added = outbox.enqueue_newsletter(issue.issue_id, recipient_emails, issue.subject,
+                                      text=issue.text, html=issue.html)
+    logging.info(f"수신자 {len(recipient_emails)}명 중 {added}건을 발송 대기열에 추가했습니다. ({outbox.stats()})")
+    get_outbox_worker().notify()
 
 
 def create_and_send_newsletter():
     """뉴스 수집, 요약, 이메일 발송 작업을 수행하는 메인 함수"""
     logging.info("AI 뉴스레터 생성 프로세스 시작...")
 
-    # 1. 뉴스 데이터 수집
-    news_items = fetch_rss_feeds(RSS_FEEDS)
-
-    # 2. 요약할 기사 선택 (최신 N개)
-    articles_to_summarize = news_items[:MAX_ARTICLES_TO_SUMMARIZE]
+    seen_store = get_seen_store()
+    run_id = seen_store.begin_run(SEEN_PIPELINE)
 
-    # 3. LLM을 이용한 뉴스 요약 및 뉴스레터 본문 생성
-    newsletter_body = summarize_news_with_langchain(articles_to_summarize)
-
-    # 4. 이메일 발송
-    send_email(NEWSLETTER_SUBJECT, newsletter_body, RECIPIENT_EMAILS)
+    changes = None
+    try:
+        # 1. 뉴스 데이터 수집
+        news_items = fetch_rss_feeds(RSS_FEEDS)
+
+        # 2. 지난 성공 실행 이후 새로 나왔거나 내용이 바뀐 기사만 골라 요약할 기사 선택 (최신 N개)
+        changes = seen_store.classify(news_items)
+        logging.info(f"새 기사 {len(changes.new)}개, 변경된 기사 {len(changes.changed)}개, "
+                     f"이미 다룬 기사 {len(changes.unchanged)}개")
+        if not changes.fresh:
+            logging.info("지난 발송 이후 새 기사가 없어 이번 뉴스레터는 건너뜁니다.")
+            seen_store.finish_run(run_id, success=True, changes=changes)
+            return
+        # (전체 정렬 없이 힙으로 최신 N개만 선택, 발행일 형식이 달라도 epoch 초 기준으로 비교)
+        articles_to_summarize = select_recent(changes.fresh, MAX_ARTICLES_TO_SUMMARIZE)
+
+        # (선택) 요약할 기사만 원문 본문을 수집하여 프롬프트에 함께 넣음
+        if ARTICLE_BODY_ENABLED:
+            articles_to_summarize = BodyFetcher().enrich(articles_to_summarize, sources=ARTICLE_BODY_SOURCES)
+
+        # 3. LLM을 이용한 뉴스 요약 및 뉴스레터 본문 생성
+        newsletter_body = summarize_news_with_langchain(articles_to_summarize)
+        if newsletter_body is None:
+            # 요약한 기사로 기록하지 않으므로 다음 실행에서 다시 처리
+            seen_store.finish_run(run_id, success=False, changes=changes)
+            logging.error("뉴스 요약에 실패하여 이번 뉴스레터는 발송하지 않습니다.")
+            return
+
+        # 4. HTML(인라인 CSS)/텍스트 본문을 한 번 렌더링하여 모든 수신자에게 재사용
+        today = datetime.now().strftime('%Y-%m-%d')
+        subject = NEWSLETTER_SUBJECT_TEMPLATE.format(date=today)
+        issue_id = f"{today}:{make_issue_id(subject, newsletter_body)}"
+        issue = render_issue(issue_id, subject, html_content=newsletter_body)
+
+        # 5. 이메일 발송 대기열에 추가 (실제 발송은 백그라운드 작업자가 담당)
+        send_email(issue, RECIPIENT_EMAILS)
+
+        # 6. 이번 호에서 다룬 기사만 처리 완료로 기록하고 오래된 기록 정리
+        seen_store.finish_run(run_id, articles_to_summarize, success=True, changes=changes)
+    except Exception:
+        # 실패한 실행으로 기록하여 'running' 상태로 남지 않게 함 (다룬 기사로 기록하지 않으므로 다음 실행에서 다시 처리)
+        seen_store.finish_run(run_id, success=False, changes=changes)
+        raise
+    seen_store.compact()
 
     logging.info("AI 뉴스레터 생성 및 발송 프로세스 완료.")
 
@@ -216,20 +302,32 @@ def create_and_send_newsletter():
 
 if __name__ == "__main__":
     logging.info("AI 뉴스레터 자동 생성 스크립트 시작.")
-    logging.info(f"뉴스레터는 매일 지정된 시간에 발송됩니다.")
+    if not NEWSLETTER_SCHEDULES:
+        logging.error("NEWSLETTER_SCHEDULES에 발송 일정(cron 식)이 하나도 없습니다. 예: \"0 8 * * *\"")
+        exit(1)
+    logging.info(f"뉴스레터 발송 일정: {', '.join(NEWSLETTER_SCHEDULES)}")
     logging.info(f"수신자: {', '.join(RECIPIENT_EMAILS)}")
 
+    # 발송 작업자 시작 (이전 실행에서 남은 대기/재시도 메시지도 함께 발송)
+    get_outbox_worker().start()
 
-    # 최초 실행 시 한번 즉시 실행 (테스트 및 즉시 확인용)
-    logging.info("스크립트 시작 시 1회 즉시 실행합니다...")
-    create_and_send_newsletter()
-    logging.info("초기 실행 완료. 스케줄 대기 상태로 전환합니다.")
-
-    # 스케줄 설정 (매일 오전 8시에 실행) - 시간은 필요에 따라 변경
-    schedule.every().day.at("08:00").do(create_and_send_newsletter)
 
+    # 스케줄 설정: 다음 실행 시각까지 잠들었다가 작업 스레드에서 실행
+    # (같은 그룹이라 일정이 겹쳐도 동시에 두 번 생성하지 않고, 꺼져 있던 동안 놓친 실행은 시작 시 한 번 실행)
+    scheduler = Scheduler()
+    for i, cron in enumerate(NEWSLETTER_SCHEDULES):
+        scheduler.add_job(f"newsletter-{i}", cron, create_and_send_newsletter, group="newsletter")
+    for name, when in scheduler.next_runs().items():
+        logging.info(f"'{name}' 다음 실행 예정: {when:%Y-%m-%d %H:%M}")
 
+    # 최초 실행 시 한번 즉시 실행 (테스트 및 즉시 확인용)
+    if RUN_ON_START:
+        logging.info("스크립트 시작 시 1회 즉시 실행합니다...")
+        scheduler.run_now("newsletter-0")
 
-    while True:
-        schedule.run_pending()
-        time.sleep(60) # 1분마다 스케줄 확인
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        logging.info("스케줄러를 종료합니다.")
+        scheduler.stop(wait=False)
+        get_outbox_worker().stop(timeout=10)
@@ -3,10 +3,18 @@ import streamlit_nested_layout
 from utils.sidebar import setup_sidebar
 from utils.news_display import search_news, display_news_articles
 from utils.email_sender import send_newsletter_email
-from agents.newsletter_agent import run_newsletter_agent
+from utils.article_body import enrich_articles
+from utils.newsletter_render import make_issue_id, render_issue
+from agents.newsletter_agent import run_newsletter_agent, stream_newsletter_content
+from agents.article_index import ArticleIndex
+from agents.newsletter_pipeline import (DEFAULT_ARTICLES_PER_TOPIC, DEFAULT_CONTENT_CONCURRENCY,
+                                        format_newsletter_markdown, format_section_markdown, select_topics)
+from agents.output_schema import get_parse_stats
 
 import os, requests
 import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
 
 # 로깅 설정
 logging.basicConfig(level=logging.DEBUG)
@@ -51,25 +59,107 @@ sidebar_config = {
 }
 
 
-def convert_markdown_to_html(markdown_content: str) -> str:
-    """마크다운 형식의 뉴스레터를 HTML 형식으로 변환"""
-    html_content = f"""
-    <html>
-    <head>
-        <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; }}
-            h1 {{ color: #2c3e50; }}
-            h2 {{ color: #34495e; }}
-            a {{ color: #3498db; }}
-            .reference {{ margin-top: 20px; padding-top: 10px; border-top: 1px solid #eee; }}
-        </style>
-    </head>
-    <body>
-        {markdown_content.replace('#', '<h1>').replace('##', '<h2>')}
-    </body>
-    </html>
+def _generate_section_worker(i, events, stream, agent_kwargs):
+    """워커 스레드에서 주제 하나의 내용을 생성하고 진행 상황을 큐로 전달하는 함수"""
+    try:
+        if stream:
+            content = None
+            for event in stream_newsletter_content(**agent_kwargs):
+                if event["type"] == "delta":
+                    events.put(("delta", i, event["partial_text"]))
+                else:
+                    content = event["result"]
+        else:
+            content = run_newsletter_agent(task="generate_content", **agent_kwargs)
+        events.put(("done", i, content))
+    except Exception as e:
+        events.put(("error", i, e))
+
+
+def generate_sections(news_articles, subtopics, openai_api_key, max_workers=DEFAULT_CONTENT_CONCURRENCY,
+                      top_k=DEFAULT_ARTICLES_PER_TOPIC, model=None, temperature=None, bypass_cache=False,
+                      stream=True, topic_members=None):
     """
-    return html_content
+    하위 주제별 뉴스레터 내용을 스레드 풀에서 동시에 생성하는 함수
+    각 섹션은 원래 주제 순서의 자리에 표시되며, 스트리밍 모드에서는 본문이 생성되는 대로 보여줍니다.
+
+    Parameters:
+    - news_articles: 뉴스 기사 목록
+    - subtopics: 하위 주제 목록
+    - openai_api_key: OpenAI API 키
+    - max_workers: 동시에 생성할 최대 주제 수
+    - top_k: 주제별로 프롬프트에 넣을 관련 기사 수
+    - model / temperature: 사이드바에서 선택한 LLM 설정
+    - bypass_cache: True면 LLM 응답 캐시를 사용하지 않음
+    - stream: True면 토큰 단위 스트리밍으로 본문을 점진적으로 표시
+    - topic_members: {주제: 소속 기사 인덱스} (클러스터링으로 주제를 정한 경우 해당 기사를 우선 참고)
+
+    Returns:
+    - {주제: 생성 결과} 딕셔너리 (원래 주제 순서 유지, 실패한 주제 제외)
+    """
+    # 주제 순서대로 자리를 먼저 만들어 두고, 진행되는 대로 채움
+    placeholders = []
+    for topic in subtopics:
+        placeholder = st.empty()
+        placeholder.info(f"'{topic}' 주제 내용 생성 중...")
+        placeholders.append(placeholder)
+
+    # 관련 기사 검색 인덱스는 한 번만 만들어 모든 주제에서 공유
+    article_index = ArticleIndex(news_articles)
+
+    results = {}
+    events = queue.Queue()
+    pending = len(subtopics)
+    # Streamlit 요소는 메인 스레드에서만 갱신하고, 워커 스레드는 LLM 호출만 수행
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(subtopics)))) as executor:
+        for i, topic in enumerate(subtopics):
+            executor.submit(_generate_section_worker, i, events, stream, {
+                "news_articles": news_articles,
+                "topic": topic,
+                "openai_api_key": openai_api_key,
+                "top_k": top_k,
+                "article_index": article_index,
+                "topic_members": (topic_members or {}).get(topic),
+                "model": model,
+                "temperature": temperature,
+                "bypass_cache": bypass_cache
+            })
+
+        while pending:
+            # 쌓인 이벤트를 한꺼번에 꺼내 섹션별 최신 상태만 화면에 반영
+            batch = [events.get()]
+            while True:
+                try:
+                    batch.append(events.get_nowait())
+                except queue.Empty:
+                    break
+
+            partial_texts = {}
+            for kind, i, payload in batch:
+                topic = subtopics[i]
+                if kind == "delta":
+                    partial_texts[i] = payload
+                    continue
+
+                pending -= 1
+                partial_texts.pop(i, None)
+                if kind == "error":
+                    logger.error(f"Content generation failed for '{topic}': {payload}")
+                    payload = None
+
+                if payload:
+                    results[i] = payload
+                    with placeholders[i].container():
+                        st.success(f"'{topic}' 주제 내용이 생성되었습니다.")
+                        with st.expander(f"{i + 1}. {topic}", expanded=False):
+                            st.markdown(format_section_markdown(topic, payload))
+                else:
+                    placeholders[i].warning(f"'{topic}' 주제 내용 생성에 실패했습니다.")
+
+            for i, text in partial_texts.items():
+                placeholders[i].markdown(f"**{i + 1}. {subtopics[i]}**\n\n{text}▌")
+
+    return {subtopics[i]: results[i] for i in sorted(results)}
 
 
 def main():
@@ -89,13 +179,24 @@ def main():
                 search_method=sidebar_config["search_method"],
                 naver_client_id=sidebar_config.get("naver_client_id"),
                 naver_client_secret=sidebar_config.get("naver_client_secret"),
-                max_articles=sidebar_config.get("max_articles", 15)
+                max_articles=sidebar_config.get("max_articles", 15),
+                naver_per_keyword=sidebar_config.get("naver_per_keyword", False),
+                refresh=sidebar_config.get("refresh_search", False)
             )
+            # 새로 검색 요청은 한 번만 적용
+            st.session_state.pop("refresh_search_pending", None)
 
             if news_articles:
                 st.success(f"{len(news_articles)}개의 뉴스 기사를 찾았습니다.")
                 logger.debug(f"Found {len(news_articles)} news articles")
 
+                # (선택) 원문 페이지에서 기사 본문 수집
+                if sidebar_config.get("fetch_article_bodies", False):
+                    with st.spinner("기사 원문 본문 수집 중..."):
+                        news_articles = enrich_articles(news_articles)
+                    bodies = sum(1 for article in news_articles if article.body)
+                    st.caption(f"기사 {len(news_articles)}개 중 {bodies}개의 원문 본문을 수집했습니다.")
+
                 # 뉴스 목록 표시
                 display_news_articles(news_articles)
             else:
@@ -105,13 +206,26 @@ def main():
 
         # LLM을 통한 뉴스레터 생성
         if news_articles:
-            st.subheader("2️⃣ AI가 뉴스레터 주제 선정 중...")
-            with st.spinner("주제 선정 중..."):
-                newsletter_topics = run_newsletter_agent(
-                    news_articles=news_articles,
-                    task="generate_topics",
-                    openai_api_key=sidebar_config["openai_api_key"]
-                )
+            # 단일 패스 모드는 제목/주제/본문을 한 번의 호출로 생성
+            single_pass = sidebar_config.get("generation_mode") == "single_pass"
+            if single_pass:
+                st.subheader("2️⃣ AI가 뉴스레터 작성 중 (단일 패스)...")
+            else:
+                st.subheader("2️⃣ AI가 뉴스레터 주제 선정 중...")
+            with st.spinner("뉴스레터 작성 중..." if single_pass else "주제 선정 중..."):
+                agent_kwargs = {
+                    "openai_api_key": sidebar_config["openai_api_key"],
+                    "model": sidebar_config.get("model"),
+                    "temperature": sidebar_config.get("temperature"),
+                    "bypass_cache": not sidebar_config.get("use_llm_cache", True)
+                }
+                if single_pass:
+                    newsletter_topics = run_newsletter_agent(news_articles=news_articles,
+                                                             task="generate_newsletter", **agent_kwargs)
+                else:
+                    # 주제 선정 방식에 따라 LLM 선정 / 로컬 클러스터링 + 이름 짓기 / 클러스터링만
+                    newsletter_topics = select_topics(news_articles,
+                                                      method=sidebar_config.get("topic_method"), **agent_kwargs)
 
                 if newsletter_topics:
                     st.success("뉴스레터 주제가 선정되었습니다.")
@@ -122,47 +236,48 @@ def main():
                     st.markdown(f"**제목: {newsletter_topics['title']}**")
 
                     st.markdown("### 하위 주제:")
+                    topic_members = newsletter_topics.get('members') or {}
                     for i, topic in enumerate(newsletter_topics['subtopics']):
-                        st.markdown(f"**{i + 1}. {topic}**")
+                        if topic in topic_members:
+                            st.markdown(f"**{i + 1}. {topic}** (관련 기사 {len(topic_members[topic])}개)")
+                        else:
+                            st.markdown(f"**{i + 1}. {topic}**")
                 else:
                     st.error("뉴스레터 주제 선정에 실패했습니다.")
                     return
 
-            # 각 주제별 뉴스레터 내용 생성
-            st.subheader("3️⃣ 각 주제별 뉴스레터 내용 생성 중...")
-            newsletter_content = {}
-
-            for i, topic in enumerate(newsletter_topics['subtopics']):
-                with st.spinner(f"'{topic}' 주제 내용 생성 중..."):
-                    content = run_newsletter_agent(
-                        news_articles=news_articles,
-                        task="generate_content",
-                        topic=topic,
-                        openai_api_key=sidebar_config["openai_api_key"]
-                    )
+            if single_pass:
+                newsletter_content = newsletter_topics['contents']
+            else:
+                # 각 주제별 뉴스레터 내용 생성 (동시 실행, 화면에는 원래 주제 순서대로 표시)
+                st.subheader("3️⃣ 각 주제별 뉴스레터 내용 생성 중...")
+                newsletter_content = generate_sections(
+                    news_articles=news_articles,
+                    subtopics=newsletter_topics['subtopics'],
+                    openai_api_key=sidebar_config["openai_api_key"],
+                    max_workers=sidebar_config.get("content_concurrency", DEFAULT_CONTENT_CONCURRENCY),
+                    top_k=sidebar_config.get("articles_per_topic", DEFAULT_ARTICLES_PER_TOPIC),
+                    model=sidebar_config.get("model"),
+                    temperature=sidebar_config.get("temperature"),
+                    bypass_cache=not sidebar_config.get("use_llm_cache", True),
+                    stream=sidebar_config.get("stream_content", True),
+                    topic_members=newsletter_topics.get('members')
+                )
 
-                    if content:
-                        newsletter_content[topic] = content
-                        st.success(f"'{topic}' 주제 내용이 생성되었습니다.")
-                    else:
-                        st.warning(f"'{topic}' 주제 내용 생성에 실패했습니다.")
+            logger.debug(f"Structured output parse stats: {get_parse_stats()}")
 
             # 최종 뉴스레터 표시
             if newsletter_content:
                 st.subheader("4️⃣ 최종 뉴스레터")
 
                 title = newsletter_topics['title']
-                final_newsletter = f"# {newsletter_topics['title']}\n\n"
-
-                for topic, content in newsletter_content.items():
-                    final_newsletter += f"## {topic}\n\n{content['text']}\n\n"
-                    final_newsletter += "**참고 기사:**\n"
-                    for ref in content['references']:
-                        final_newsletter += f"- [{ref['title']}]({ref['link']})\n"
-                    final_newsletter += "\n---\n\n"
+                final_newsletter = format_newsletter_markdown(title, newsletter_content)
 
                 st.markdown(final_newsletter)
 
+                # 이메일/다운로드에 공통으로 쓸 HTML·텍스트를 한 번만 렌더링 (호 ID로 캐시)
+                rendered = render_issue(make_issue_id(final_newsletter), title, markdown=final_newsletter)
+
                 # # 이메일 발송 섹션
                 # st.subheader("5️⃣ 이메일 발송")
                 # recipient_email = st.text_input("수신자 이메일 주소를 입력하세요:", sidebar_config.get("recipient_email", ""))
@@ -170,14 +285,12 @@ def main():
                 # if st.button("뉴스레터 이메일 발송"):
                 #     if recipient_email:
                 #         with st.spinner("이메일 발송 중..."):
-                #             # 마크다운을 HTML로 변환
-                #             html_content = convert_markdown_to_html(final_newsletter)
-    
-                #             # 이메일 발송
+                #             # 이메일 발송 (렌더링된 HTML + 텍스트 대체 본문)
                 #             if send_newsletter_email(
                 #                     recipient_email=recipient_email,
-                #                     newsletter_content=html_content,
-                #                     subject=title
+                #                     newsletter_content=rendered.html,
+                #                     subject=title,
+                #                     text_content=rendered.text
                 #             ):
                 #                 st.success("뉴스레터가 성공적으로 발송되었습니다!")
                 #                 logger.info(f"Newsletter sent to {recipient_email}")
@@ -188,12 +301,21 @@ def main():
                 #         st.error("수신자 이메일 주소를 입력해주세요.")
 
                 # 다운로드 버튼
-                st.download_button(
-                    label="뉴스레터 다운로드 (Markdown)",
-                    data=final_newsletter,
-                    file_name="newsletter.md",
-                    mime="text/markdown"
-                )
+                md_col, html_col = st.columns(2)
+                with md_col:
+                    st.download_button(
+                        label="뉴스레터 다운로드 (Markdown)",
+                        data=rendered.markdown,
+                        file_name="newsletter.md",
+                        mime="text/markdown"
+                    )
+                with html_col:
+                    st.download_button(
+                        label="뉴스레터 다운로드 (HTML)",
+                        data=rendered.html,
+                        file_name="newsletter.html",
+                        mime="text/html"
+                    )
 
     elif sidebar_config["generate_button"]:
         if not sidebar_config["keywords"]:
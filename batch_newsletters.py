@@ -0,0 +1,122 @@
+"""
+여러 키워드 세트로 뉴스레터를 한 번에 생성하는 배치 실행기 (Streamlit 없이 실행)
+
+키워드 세트는 화면과 같이 한 검색어로 검색하며(같은 세트는 한 번만 검색), --split-keywords를 주면
+키워드마다 따로 검색해 결과를 합칩니다(겹치는 키워드는 한 번만 검색). 주제별 LLM 호출은 모든 뉴스레터가 하나의 풀을 공유합니다.
+뉴스레터마다 마크다운(.md)과 HTML(.html) 파일을 출력 디렉토리에 저장합니다.
+
+키워드 파일 형식 (한 줄에 뉴스레터 하나, '#'으로 시작하는 줄은 무시):
+    AI 동향 | 인공지능, 생성형 AI
+    반도체, 배터리
+
+실행 예:
+    python batch_newsletters.py -k "인공지능, 반도체" -k "금리, 환율" --workers 4
+    python batch_newsletters.py --file keywords.txt --method "네이버 API" --output-dir out/
+"""
+import argparse
+import logging
+import os
+import re
+import sys
+
+from dotenv import load_dotenv
+
+from agents.newsletter_pipeline import (DEFAULT_ARTICLES_PER_TOPIC, DEFAULT_BATCH_WORKERS,
+                                        DEFAULT_CONTENT_CONCURRENCY, SEARCH_GOOGLE, SEARCH_NAVER,
+                                        TOPIC_METHODS, TOPICS_LLM, NewsletterRequest, run_batch)
+from utils.newsletter_render import make_issue_id, render_issue
+
+logger = logging.getLogger(__name__)
+
+
+def load_keyword_file(path):
+    """키워드 파일에서 (이름, 키워드) 목록을 읽는 함수"""
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name, sep, keywords = line.partition("|")
+            entries.append((name.strip(), keywords.strip()) if sep else (None, line))
+    return entries
+
+
+def safe_filename(name):
+    return re.sub(r"[^\w가-힣-]+", "_", name).strip("_")[:60] or "newsletter"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--keywords", action="append", default=[], help="쉼표로 구분한 키워드 세트 (반복 가능)")
+    parser.add_argument("--file", help="키워드 세트 파일 경로")
+    parser.add_argument("--method", choices=[SEARCH_GOOGLE, SEARCH_NAVER], default=SEARCH_GOOGLE, help="검색 방법")
+    parser.add_argument("--max-articles", type=int, default=15, help="뉴스레터당 최대 기사 수")
+    parser.add_argument("--mode", choices=["per_topic", "single_pass"], default="per_topic", help="생성 방식")
+    parser.add_argument("--topics", choices=TOPIC_METHODS, default=TOPICS_LLM,
+                        help="주제 선정 방식 (llm: LLM 선정, cluster: 로컬 클러스터링 + LLM 이름 짓기, fast: 클러스터링만)")
+    parser.add_argument("--split-keywords", action="store_true",
+                        help="키워드마다 따로 검색한 결과를 합침 (기본: 화면과 같이 키워드 전체를 한 검색어로 검색)")
+    parser.add_argument("--model", default=None, help="LLM 모델 이름")
+    parser.add_argument("--temperature", type=float, default=None, help="LLM temperature")
+    parser.add_argument("--articles-per-topic", type=int, default=DEFAULT_ARTICLES_PER_TOPIC,
+                        help="주제별 프롬프트에 넣을 관련 기사 수")
+    parser.add_argument("--workers", type=int, default=DEFAULT_BATCH_WORKERS, help="동시에 생성할 뉴스레터 수")
+    parser.add_argument("--llm-concurrency", type=int, default=DEFAULT_CONTENT_CONCURRENCY,
+                        help="전체 뉴스레터가 공유하는 동시 LLM 호출 수")
+    parser.add_argument("--output-dir", default="newsletters", help="결과 저장 디렉토리")
+    parser.add_argument("--no-cache", action="store_true", help="LLM 응답 캐시를 사용하지 않음")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    load_dotenv()
+
+    entries = [(None, keywords) for keywords in args.keywords]
+    if args.file:
+        entries.extend(load_keyword_file(args.file))
+    if not entries:
+        parser.error("--keywords 또는 --file로 키워드 세트를 하나 이상 지정해야 합니다")
+
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    if not openai_api_key:
+        parser.error("OPENAI_API_KEY 환경 변수가 필요합니다")
+    # 배치에서는 데모용 샘플 기사로 대체하지 않으므로 네이버 인증 정보가 없으면 바로 중단
+    if args.method == SEARCH_NAVER and not (os.getenv("NAVER_CLIENT_ID") and os.getenv("NAVER_CLIENT_SECRET")):
+        parser.error("네이버 API 검색에는 NAVER_CLIENT_ID, NAVER_CLIENT_SECRET 환경 변수가 필요합니다")
+
+    requests = [
+        NewsletterRequest(keywords=keywords, name=name, search_method=args.method,
+                          max_articles=args.max_articles, mode=args.mode, topic_method=args.topics,
+                          split_keywords=args.split_keywords)
+        for name, keywords in entries
+    ]
+    report = run_batch(
+        requests, openai_api_key,
+        max_workers=args.workers,
+        content_concurrency=args.llm_concurrency,
+        naver_client_id=os.getenv("NAVER_CLIENT_ID"),
+        naver_client_secret=os.getenv("NAVER_CLIENT_SECRET"),
+        model=args.model,
+        temperature=args.temperature,
+        top_k=args.articles_per_topic,
+        bypass_cache=args.no_cache,
+    )
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for i, result in enumerate(report.results, start=1):
+        if not result.ok:
+            continue
+        markdown = result.markdown
+        rendered = render_issue(make_issue_id(markdown), result.title, markdown=markdown)
+        base = os.path.join(args.output_dir, f"{i:02d}_{safe_filename(result.request.label)}")
+        with open(base + ".md", "w", encoding="utf-8") as f:
+            f.write(rendered.markdown)
+        with open(base + ".html", "w", encoding="utf-8") as f:
+            f.write(rendered.html)
+
+    print(report.summary())
+    return 0 if report.succeeded == len(report.results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+기사 본문 수집 처리량 측정 (로컬 HTTP 서버 사용)
+
+여러 포트에 로컬 HTTP 서버를 띄워 서로 다른 언론사 호스트처럼 쓰고, 요청마다 지연을 준 기사 페이지를 돌려줍니다.
+- 순차 수집 (작업자 1개)
+- 동시 수집 (호스트별 동시 요청/간격 제한 적용)
+- 디스크 캐시가 채워진 뒤 다시 수집
+을 비교하고, 서버가 관측한 호스트별 최대 동시 요청 수로 예절 제한이 지켜졌는지 확인합니다.
+
+실행 예:
+    python benchmarks/bench_article_body.py --articles 120 --hosts 6 --latency 0.1
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from common import load_fixture_articles
+
+from utils.article import Article
+from utils.article_body import BodyCache, BodyFetcher
+
+PAGE_TEMPLATE = """<!doctype html><html><head><meta charset="utf-8"><title>{title}</title>
+<script>var tracking = 1;</script></head><body>
+<header><nav>홈 | 정치 | 경제 | IT</nav></header>
+<div class="ad">광고 영역</div>
+<article><h1>{title}</h1>{paragraphs}</article>
+<aside>많이 본 뉴스 목록</aside><footer>Copyright</footer>
+</body></html>"""
+
+
+def make_handler(latency, stats, lock):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                stats["active"] += 1
+                stats["max_active"] = max(stats["max_active"], stats["active"])
+                stats["requests"] += 1
+            try:
+                time.sleep(latency)
+                paragraphs = "".join(f"<p>{self.path} 기사 본문 {i}번째 문단입니다. " * 3 + "</p>" for i in range(8))
+                body = PAGE_TEMPLATE.format(title=self.path, paragraphs=paragraphs).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            finally:
+                with lock:
+                    stats["active"] -= 1
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_hosts(count, latency):
+    servers = []
+    for _ in range(count):
+        stats = {"active": 0, "max_active": 0, "requests": 0}
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(latency, stats, threading.Lock()))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append((server, stats))
+    return servers
+
+
+def run(label, fetcher, articles):
+    started = time.perf_counter()
+    enriched = fetcher.enrich(articles)
+    elapsed = time.perf_counter() - started
+    ok = sum(1 for article in enriched if article.body)
+    print(f"{label:<22}{elapsed:>10.2f}{len(articles) / elapsed:>12.1f}{ok:>8}/{len(articles)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=120, help="기사 수")
+    parser.add_argument("--hosts", type=int, default=6, help="호스트(서버) 수")
+    parser.add_argument("--latency", type=float, default=0.1, help="페이지 응답 지연 (초)")
+    parser.add_argument("--workers", type=int, default=16, help="전체 동시 요청 수")
+    parser.add_argument("--max-per-host", type=int, default=2, help="호스트별 동시 요청 수")
+    parser.add_argument("--host-interval", type=float, default=0.02, help="호스트별 요청 시작 간격 (초)")
+    args = parser.parse_args()
+
+    servers = start_hosts(args.hosts, args.latency)
+    fixtures = load_fixture_articles()
+    articles = []
+    for i in range(args.articles):
+        server, _ = servers[i % args.hosts]
+        base = fixtures[i % len(fixtures)]
+        articles.append(Article(title=base.title, link=f"http://127.0.0.1:{server.server_port}/news/{i}",
+                                description=base.description, source="bench"))
+
+    print(f"기사 {args.articles}개, 호스트 {args.hosts}개, 응답 지연 {args.latency * 1000:.0f} ms\n")
+    print(f"{'방식':<22}{'전체(s)':>10}{'기사/초':>12}{'본문':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        run("순차 (작업자 1)", BodyFetcher(max_workers=1, host_interval=0, cache=False), articles)
+        for _, stats in servers:
+            stats["max_active"] = 0
+        cache = BodyCache(path=os.path.join(tmp, "bodies.sqlite3"))
+        run("동시 + 호스트 제한", BodyFetcher(max_workers=args.workers, max_per_host=args.max_per_host,
+                                         host_interval=args.host_interval, cache=cache), articles)
+        observed = max(stats["max_active"] for _, stats in servers)
+        run("디스크 캐시", BodyFetcher(max_workers=args.workers, cache=cache), articles)
+
+    print(f"\n호스트별 최대 동시 요청 수: {observed} (제한 {args.max_per_host})")
+    for server, _ in servers:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+하위 주제별 관련 기사 선택(ArticleIndex)으로 절약되는 입력 토큰과 섹션당 지연 시간 측정
+
+실행 예:
+    python benchmarks/bench_article_index.py --k 8 --scale 5
+"""
+import argparse
+import time
+
+from common import SAMPLE_SUBTOPICS, load_fixture_articles
+
+from agents.article_index import ArticleIndex
+from agents.newsletter_agent import build_content_messages
+
+
+def _prompt_tokens(articles, topic, top_k=None, index=None):
+    """generate_content_node와 같은 방식으로 프롬프트를 만들고 입력 토큰 수를 반환"""
+    state = {"news_articles": articles, "task": "generate_content", "topic": topic,
+             "top_k": top_k, "article_index": index, "model": None}
+    _, report = build_content_messages(state)
+    return report.tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--k", type=int, default=8, help="주제별 선택 기사 수")
+    parser.add_argument("--scale", type=int, default=1, help="fixture 기사 복제 배수")
+    parser.add_argument("--fixture", default=None, help="기사 목록 JSON 경로")
+    args = parser.parse_args()
+
+    articles = load_fixture_articles(args.fixture, scale=args.scale)
+
+    started = time.perf_counter()
+    index = ArticleIndex(articles)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"기사 {len(articles)}개, k={args.k}, 인덱스 생성 {build_ms:.2f} ms\n")
+
+    print(f"{'하위 주제':<24}{'전체 토큰':>10}{'top-k 토큰':>12}{'절감률':>8}{'선택+프롬프트(ms)':>20}")
+    total_full = total_topk = 0
+    for topic in SAMPLE_SUBTOPICS:
+        full_tokens = _prompt_tokens(articles, topic)
+
+        started = time.perf_counter()
+        topk_tokens = _prompt_tokens(articles, topic, top_k=args.k, index=index)
+        section_ms = (time.perf_counter() - started) * 1000
+
+        total_full += full_tokens
+        total_topk += topk_tokens
+        saved = 1 - topk_tokens / full_tokens if full_tokens else 0.0
+        print(f"{topic:<24}{full_tokens:>10}{topk_tokens:>12}{saved:>8.0%}{section_ms:>20.2f}")
+
+    saved = 1 - total_topk / total_full if total_full else 0.0
+    print(f"\n합계: 전체 {total_full} 토큰 -> top-k {total_topk} 토큰 ({saved:.0%} 절감)")
+
+
+if __name__ == "__main__":
+    main()
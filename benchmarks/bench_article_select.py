@@ -0,0 +1,85 @@
+"""
+기사 레코드 메모리와 최신 기사 top-K 선택 비용 측정
+
+fixture 기사를 scale배로 복제하고 발행일 형식(RFC 822 / "%Y-%m-%d %H:%M:%S" / 'N/A')을 섞은 뒤
+- dict 기사 + 발행일 문자열 전체 정렬 후 자르기 (기존 방식)
+- Article(slots, epoch 발행일) + 힙 top-K (select_recent)
+의 메모리, 선택 시간, 실제 최신 k개와 일치하는 기사 수를 비교합니다.
+
+실행 예:
+    python benchmarks/bench_article_select.py --scale 500 --top-k 20
+"""
+import argparse
+import time
+import tracemalloc
+from email.utils import format_datetime, parsedate_to_datetime
+
+from common import load_fixture_articles
+
+from utils.article import Article, select_recent
+
+
+def build_raw_articles(scale, fixture=None):
+    """발행일 형식이 섞인 dict 기사 목록 (출처별 피드에서 수집한 것처럼)"""
+    raw = []
+    for i, article in enumerate(load_fixture_articles(fixture, scale=scale)):
+        dt = parsedate_to_datetime(article.published)
+        dt = dt.replace(minute=(dt.minute + i * 7) % 60, second=i % 60)
+        kind = i % 3
+        if kind == 0:
+            published = format_datetime(dt)
+        elif kind == 1:
+            published = dt.strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            published = "N/A" if i % 30 == 2 else format_datetime(dt)
+        raw.append({"title": article.title, "link": article.link, "description": article.description,
+                    "published": published, "source": f"source-{i % 8}"})
+    return raw
+
+
+def measure_memory(factory):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = factory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return objects, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=500, help="fixture 복제 배수")
+    parser.add_argument("--top-k", type=int, default=20, help="선택할 최신 기사 수")
+    parser.add_argument("--repeat", type=int, default=20, help="선택 반복 횟수")
+    parser.add_argument("--fixture", default=None, help="기사 목록 JSON 경로")
+    args = parser.parse_args()
+
+    raw = build_raw_articles(args.scale, args.fixture)
+    # 문자열 키는 공유되지 않도록 JSON으로 읽은 것처럼 새로 만든 dict 사용
+    dicts, dict_bytes = measure_memory(lambda: [{key: str(value) for key, value in a.items()} for a in raw])
+    articles, article_bytes = measure_memory(lambda: [Article.from_dict(a) for a in raw])
+    print(f"기사 {len(raw):,}개, top-{args.top_k}\n")
+    print(f"{'방식':<28}{'메모리(KB)':>12}{'선택(ms)':>12}{'정확':>8}")
+
+    truth = {a.link for a in sorted(articles, key=lambda a: a.published_ts or float("-inf"), reverse=True)[:args.top_k]}
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        picked = sorted(dicts, key=lambda x: x["published"] if x["published"] != "N/A" else "", reverse=True)
+        picked = picked[:args.top_k]
+    sort_ms = (time.perf_counter() - started) / args.repeat * 1000
+    sort_hits = sum(1 for a in picked if a["link"] in truth)
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        recent = select_recent(articles, args.top_k)
+    heap_ms = (time.perf_counter() - started) / args.repeat * 1000
+    heap_hits = sum(1 for a in recent if a.link in truth)
+
+    print(f"{'dict + 문자열 정렬/자르기':<28}{dict_bytes / 1024:>12.0f}{sort_ms:>12.2f}{sort_hits:>5}/{args.top_k}")
+    print(f"{'Article + 힙 top-K':<28}{article_bytes / 1024:>12.0f}{heap_ms:>12.2f}{heap_hits:>5}/{args.top_k}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+로컬 SMTP 서버(aiosmtpd)를 상대로 이메일 발송 처리량 비교
+
+- 메시지마다 연결: 기존 send_newsletter_email처럼 메시지마다 연결/인사/종료
+- BulkMailer: 재사용 연결 풀로 병렬 발송
+
+aiosmtpd가 필요합니다 (pip install aiosmtpd). 실제 메일은 발송되지 않습니다.
+
+실행 예:
+    python benchmarks/bench_email_delivery.py --messages 500 --connections 4 --latency 0.01
+"""
+import argparse
+import asyncio
+import smtplib
+import time
+
+import common  # noqa: F401  (저장소 루트를 import 경로에 추가)
+
+from utils.email_delivery import BulkMailer, SMTPConfig, build_message
+
+
+class _SinkHandler:
+    """받은 메시지를 세기만 하는 SMTP 핸들러 (latency로 서버 처리 지연 흉내)"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.received += 1
+        return "250 OK"
+
+
+def send_one_connection_per_message(config, messages):
+    """기존 방식: 메시지마다 새 연결"""
+    started = time.perf_counter()
+    for msg in messages:
+        with smtplib.SMTP(config.host, config.port, timeout=config.timeout) as server:
+            server.send_message(msg)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--connections", type=int, default=4, help="BulkMailer 동시 연결 수")
+    parser.add_argument("--per-connection", type=int, default=100, help="연결당 최대 메시지 수")
+    parser.add_argument("--latency", type=float, default=0.0, help="서버의 메시지당 처리 지연 (초)")
+    parser.add_argument("--port", type=int, default=8025)
+    args = parser.parse_args()
+
+    try:
+        from aiosmtpd.controller import Controller
+    except ImportError:
+        raise SystemExit("aiosmtpd가 필요합니다: pip install aiosmtpd")
+
+    handler = _SinkHandler(args.latency)
+    controller = Controller(handler, hostname="127.0.0.1", port=args.port)
+    controller.start()
+    try:
+        config = SMTPConfig(host="127.0.0.1", port=args.port, security="none", sender="bench@example.com")
+        messages = [
+            build_message(config.sender, f"user{i}@example.com", "벤치마크 뉴스레터",
+                          text="본문 " * 200, html="<p>" + "본문 " * 200 + "</p>")
+            for i in range(args.messages)
+        ]
+
+        print(f"메시지 {args.messages}개, 서버 지연 {args.latency * 1000:.0f} ms\n")
+        print(f"{'방식':<24}{'시간(s)':>10}{'건/초':>10}{'연결':>8}")
+
+        elapsed = send_one_connection_per_message(config, messages)
+        print(f"{'메시지마다 연결':<24}{elapsed:>10.2f}{args.messages / elapsed:>10.1f}{args.messages:>8}")
+
+        mailer = BulkMailer(config, max_connections=args.connections,
+                            max_messages_per_connection=args.per_connection)
+        report = mailer.send_all(messages)
+        print(f"{'BulkMailer':<24}{report.elapsed:>10.2f}{report.messages_per_second:>10.1f}{report.connections:>8}")
+        print(f"\n서버 수신 {handler.received}건, 실패 {report.failed}건")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
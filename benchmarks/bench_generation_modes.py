@@ -0,0 +1,81 @@
+"""
+주제별 생성(1 + N회 호출)과 단일 패스 생성(1회 호출)의 소요 시간, 토큰, 비용 비교
+
+같은 fixture 기사로 두 방식을 실행하며, 응답 캐시는 사용하지 않습니다.
+OPENAI_API_KEY 환경 변수가 필요하고 실제 API 비용이 발생합니다.
+
+실행 예:
+    python benchmarks/bench_generation_modes.py --model gpt-4o-mini --concurrency 4
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import load_fixture_articles
+
+from agents.article_index import ArticleIndex
+from agents.newsletter_agent import run_newsletter_agent
+from utils.llm_cache import get_token_usage, reset_token_usage
+
+# 모델별 1M 토큰당 가격 (USD, 입력/출력)
+PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+
+def run_per_topic(articles, api_key, model, concurrency, top_k):
+    """기존 방식: 주제 선정 1회 + 주제별 내용 생성 N회"""
+    topics = run_newsletter_agent(articles, "generate_topics", api_key, model=model, bypass_cache=True)
+    index = ArticleIndex(articles)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        contents = list(executor.map(
+            lambda topic: run_newsletter_agent(
+                articles, "generate_content", api_key, topic=topic, top_k=top_k,
+                article_index=index, model=model, bypass_cache=True
+            ),
+            topics["subtopics"]
+        ))
+    return len([c for c in contents if c])
+
+
+def run_single_pass(articles, api_key, model):
+    """단일 패스 방식: 한 번의 호출로 전체 생성"""
+    result = run_newsletter_agent(articles, "generate_newsletter", api_key, model=model, bypass_cache=True)
+    return len(result["contents"]) if result else 0
+
+
+def measure(label, fn, model):
+    reset_token_usage()
+    started = time.perf_counter()
+    sections = fn()
+    elapsed = time.perf_counter() - started
+    usage = get_token_usage()
+    price_in, price_out = PRICES.get(model, (0.0, 0.0))
+    cost = (usage["input_tokens"] * price_in + usage["output_tokens"] * price_out) / 1_000_000
+    print(f"{label:<12}{elapsed:>10.1f}{usage['calls']:>8}{usage['input_tokens']:>10}"
+          f"{usage['output_tokens']:>10}{cost:>12.5f}{sections:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--concurrency", type=int, default=4, help="주제별 생성 시 동시 호출 수")
+    parser.add_argument("--top-k", type=int, default=8, help="주제별 생성 시 참고 기사 수")
+    parser.add_argument("--fixture", default=None, help="기사 목록 JSON 경로")
+    args = parser.parse_args()
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise SystemExit("OPENAI_API_KEY 환경 변수를 설정하세요.")
+
+    articles = load_fixture_articles(args.fixture)
+    print(f"기사 {len(articles)}개, 모델 {args.model}\n")
+    print(f"{'방식':<12}{'시간(s)':>10}{'호출':>8}{'입력토큰':>10}{'출력토큰':>10}{'비용($)':>12}{'섹션':>8}")
+    measure("주제별", lambda: run_per_topic(articles, api_key, args.model, args.concurrency, args.top_k), args.model)
+    measure("단일 패스", lambda: run_single_pass(articles, api_key, args.model), args.model)
+
+
+if __name__ == "__main__":
+    main()
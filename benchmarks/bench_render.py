@@ -0,0 +1,67 @@
+"""
+큰 뉴스레터 호의 렌더링 비용과 호 ID 캐시 효과 측정
+
+fixture 기사로 하위 주제 섹션을 반복해 큰 마크다운 뉴스레터를 만든 뒤
+- 첫 렌더링(마크다운 -> HTML/인라인 CSS/텍스트)
+- 수신자마다 다시 렌더링하는 경우
+- 호 ID 캐시로 한 번만 렌더링하는 경우
+를 비교합니다.
+
+실행 예:
+    python benchmarks/bench_render.py --sections 60 --recipients 1000
+"""
+import argparse
+import time
+
+from common import SAMPLE_SUBTOPICS, load_fixture_articles
+
+from utils.newsletter_render import clear_render_cache, make_issue_id, render_issue
+
+
+def build_markdown(articles, sections):
+    """app.py의 format_section_markdown과 같은 형식의 큰 뉴스레터"""
+    parts = ["# 벤치마크 뉴스레터\n"]
+    for i in range(sections):
+        topic = SAMPLE_SUBTOPICS[i % len(SAMPLE_SUBTOPICS)]
+        chosen = [articles[(i + k) % len(articles)] for k in range(5)]
+        body = " ".join(f"**{a['title']}** 소식에 따르면 {a['description']}" for a in chosen)
+        refs = "\n".join(f"- [{a['title']}]({a['link']})" for a in chosen)
+        parts.append(f"## {i + 1}. {topic}\n\n{body}\n\n**참고 기사:**\n{refs}\n\n---\n")
+    return "\n".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sections", type=int, default=60, help="섹션 수")
+    parser.add_argument("--recipients", type=int, default=1000, help="수신자 수")
+    parser.add_argument("--fixture", default=None, help="기사 목록 JSON 경로")
+    args = parser.parse_args()
+
+    markdown = build_markdown(load_fixture_articles(args.fixture), args.sections)
+    issue_id = make_issue_id(markdown)
+    print(f"섹션 {args.sections}개, 마크다운 {len(markdown):,}자, 수신자 {args.recipients}명\n")
+
+    clear_render_cache()
+    started = time.perf_counter()
+    issue = render_issue(issue_id, "벤치마크", markdown=markdown)
+    first_ms = (time.perf_counter() - started) * 1000
+    print(f"첫 렌더링: {first_ms:.1f} ms (HTML {len(issue.html):,}자, 텍스트 {len(issue.text):,}자)")
+
+    started = time.perf_counter()
+    for _ in range(args.recipients):
+        clear_render_cache()
+        render_issue(issue_id, "벤치마크", markdown=markdown)
+    per_recipient = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(args.recipients):
+        render_issue(issue_id, "벤치마크", markdown=markdown)
+    cached = time.perf_counter() - started
+
+    print(f"\n{'방식':<24}{'전체(s)':>10}{'수신자당(ms)':>14}")
+    print(f"{'수신자마다 렌더링':<24}{per_recipient:>10.2f}{per_recipient / args.recipients * 1000:>14.3f}")
+    print(f"{'호 ID 캐시':<24}{cached:>10.2f}{cached / args.recipients * 1000:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+HTML 제거 처리량 비교: 필드마다 BeautifulSoup 생성(기존 방식) vs strip_html
+
+네이버 API 형식(<b> 강조, 엔티티)과 구글 RSS 형식(링크 목록) 샘플을 사용합니다.
+
+실행 예:
+    python benchmarks/bench_strip_html.py --items 2000
+"""
+import argparse
+import time
+
+from common import load_fixture_articles
+
+from utils.text_clean import strip_html
+
+
+def _naver_samples(articles):
+    """네이버 API 응답처럼 키워드 강조와 엔티티가 들어간 필드"""
+    samples = []
+    for article in articles:
+        title = article["title"]
+        word = title.split()[0]
+        samples.append(title.replace(word, f"<b>{word}</b>", 1) + " &quot;속보&quot;")
+        samples.append(article["description"].replace(word, f"<b>{word}</b>") + " &amp; 관련 기사")
+    return samples
+
+
+def _google_samples(articles):
+    """구글 뉴스 RSS description처럼 링크 목록으로 된 필드"""
+    samples = []
+    for article in articles:
+        samples.append(
+            f'<ol><li><a href="{article["link"]}" target="_blank">{article["title"]}</a>'
+            f'&nbsp;&nbsp;<font color="#6f6f6f">연합뉴스</font></li></ol>'
+        )
+    return samples
+
+
+def _bs4_strip(text):
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(text, "html.parser").get_text()
+
+
+def measure(label, fn, samples):
+    started = time.perf_counter()
+    for text in samples:
+        fn(text)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28}{elapsed * 1000:>10.1f}{len(samples) / elapsed:>14,.0f}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=2000, help="측정할 필드 수 (형식별)")
+    parser.add_argument("--fixture", default=None, help="기사 목록 JSON 경로")
+    args = parser.parse_args()
+
+    articles = load_fixture_articles(args.fixture)
+    scale = args.items // len(articles) + 1
+    articles = (articles * scale)[:args.items]
+
+    print(f"{'방식':<28}{'시간(ms)':>10}{'필드/초':>14}")
+    for name, samples in (("네이버", _naver_samples(articles)), ("구글 RSS", _google_samples(articles))):
+        baseline = measure(f"{name} BeautifulSoup", _bs4_strip, samples)
+        fast = measure(f"{name} strip_html", strip_html, samples)
+        print(f"{'':<28}{baseline / fast:>10.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
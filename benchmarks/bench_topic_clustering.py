@@ -0,0 +1,44 @@
+"""
+로컬 주제 클러스터링(TF-IDF + k-means) 비용과 결과 측정
+
+fixture 기사를 scale배로 복제하여 규모별로 cluster_articles 실행 시간을 재고,
+기본 규모의 클러스터 라벨과 소속 기사 수를 출력합니다 (LLM 주제 선정 호출 한 번과 비교하기 위한 기준).
+
+실행 예:
+    python benchmarks/bench_topic_clustering.py --scales 1 2 5 --topics 5
+"""
+import argparse
+import time
+
+from common import load_fixture_articles
+
+from agents.topic_clustering import cluster_articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 5], help="fixture 복제 배수 목록")
+    parser.add_argument("--topics", type=int, default=None, help="주제 수 (기본: 자동)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (최소 시간 사용)")
+    args = parser.parse_args()
+
+    print(f"{'기사 수':>8}{'주제 수':>8}{'최소(ms)':>12}")
+    for scale in args.scales:
+        articles = load_fixture_articles(scale=scale)
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            clusters = cluster_articles(articles, num_topics=args.topics)
+            timings.append(time.perf_counter() - started)
+        print(f"{len(articles):>8}{len(clusters):>8}{min(timings) * 1000:>12.1f}")
+
+    print()
+    articles = load_fixture_articles()
+    for cluster in cluster_articles(articles, num_topics=args.topics):
+        print(f"[{len(cluster.members):>2}개, 응집도 {cluster.cohesion:.2f}] {cluster.label}")
+        for i in cluster.members[:3]:
+            print(f"    - {articles[i].title}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import json
+import os
+import sys
+from dataclasses import replace
+
+# 저장소 루트를 import 경로에 추가 (benchmarks/ 안에서 직접 실행하는 경우)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from utils.article import Article  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# 벤치마크에 사용하는 하위 주제 (fixtures/articles.json의 주제 구성과 맞춤)
+SAMPLE_SUBTOPICS = [
+    "AI 반도체 시장 경쟁",
+    "생성형 AI 규제와 저작권",
+    "LLM 신규 모델 출시 동향",
+    "AI 에이전트와 업무 자동화",
+    "자율주행 상용화",
+    "AI 데이터센터와 전력",
+]
+
+
+def load_fixture_articles(path=None, scale=1):
+    """벤치마크용 기사(Article) 목록을 읽는 함수 (scale배로 복제하여 규모를 키울 수 있음)"""
+    path = path or os.path.join(FIXTURE_DIR, "articles.json")
+    with open(path, encoding="utf-8") as f:
+        articles = [Article.from_dict(article) for article in json.load(f)]
+    if scale <= 1:
+        return articles
+    return [replace(article, link=f"{article.link}?copy={n}") for n in range(scale) for article in articles]
+
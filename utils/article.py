@@ -0,0 +1,144 @@
+import heapq
+import math
+import sys
+import time
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+_MISSING_TS = float("-inf")
+
+
+@lru_cache(maxsize=4096)
+def _parse_published_text(text: str) -> Optional[float]:
+    try:
+        # RFC 822 (구글 RSS/네이버 API: "Mon, 01 Jan 2024 09:00:00 +0900")
+        dt = parsedate_to_datetime(text)
+    except (TypeError, ValueError, IndexError):
+        try:
+            # ISO 8601 / "%Y-%m-%d %H:%M:%S"
+            dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def parse_published(value: Any) -> Optional[float]:
+    """
+    발행일 값을 epoch 초로 변환하는 함수
+    RFC 822, ISO 8601, "%Y-%m-%d %H:%M:%S", epoch 숫자(숫자 문자열 포함)를 지원하며 시간대가 없으면 UTC로 봅니다.
+    빈 값, 'N/A', 해석할 수 없는 값은 None을 반환합니다.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    if not text or text.upper() == "N/A":
+        return None
+    try:
+        # epoch 숫자 문자열 ('1700000000', '1700000000.5')
+        ts = float(text)
+    except ValueError:
+        return _parse_published_text(text)
+    return ts if math.isfinite(ts) else None
+
+
+@dataclass(frozen=True, slots=True)
+class Article:
+    """
+    검색/피드에서 수집한 기사 하나
+
+    발행일은 수집 시점에 한 번만 epoch 초(published_ts)로 변환하고, 출처 이름은 intern하여
+    같은 출처의 기사들이 문자열 하나를 공유합니다. 여러 모듈과 캐시가 같은 객체를 공유하므로 변경할 수 없습니다.
+
+    dict 기반 도우미(중복 제거, 검색 인덱스, 프롬프트 작성)에서도 쓸 수 있도록
+    article["title"], article.get("title") 형태의 읽기를 지원합니다.
+    """
+    title: str
+    link: str
+    description: str = ""
+    published: str = ""                     # 원문 발행일 문자열 (표시용)
+    published_ts: Optional[float] = None    # 발행일 epoch 초 (알 수 없으면 None)
+    source: str = ""
+    original_link: str = ""                 # 언론사 원문 링크 (네이버 API)
+    body: str = ""                          # 원문 페이지에서 추출한 본문 (article_body로 수집한 경우)
+
+    def __post_init__(self):
+        if self.source:
+            object.__setattr__(self, "source", sys.intern(self.source))
+        if self.published_ts is None and self.published:
+            object.__setattr__(self, "published_ts", parse_published(self.published))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Article":
+        """dict(JSON 픽스처, 이전 형식 기사)로 Article을 만드는 함수 (모르는 키는 무시)"""
+        return cls(
+            title=data.get("title", ""),
+            link=data.get("link", ""),
+            description=data.get("description") or "",
+            published=str(data.get("published") or ""),
+            published_ts=parse_published(data.get("published_ts")),
+            source=data.get("source") or "",
+            original_link=data.get("original_link") or data.get("originallink") or "",
+            body=data.get("body") or "",
+        )
+
+    @classmethod
+    def from_feed_entry(cls, entry: Dict[str, Any], source: str = "") -> "Article":
+        """feed_fetcher.normalize_entry 결과로 Article을 만드는 함수 (이미 변환된 발행일 사용)"""
+        return cls(
+            title=entry["title"],
+            link=entry["link"],
+            description=entry.get("description") or "",
+            published=entry.get("published") or "",
+            published_ts=entry.get("published_ts"),
+            source=source,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 직렬화/프롬프트용 dict"""
+        return asdict(self)
+
+    @property
+    def dedupe_link(self) -> str:
+        """중복 판별에 쓸 링크 (원문 링크가 있으면 원문 기준)"""
+        return self.original_link or self.link
+
+    @property
+    def published_label(self) -> str:
+        """표시용 발행일 (현지 시각 "YYYY-MM-DD HH:MM", 알 수 없으면 원문 문자열)"""
+        if self.published_ts is None:
+            return self.published or "N/A"
+        return time.strftime("%Y-%m-%d %H:%M", time.localtime(self.published_ts))
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELD_NAMES:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in _FIELD_NAMES else default
+
+
+_FIELD_NAMES = frozenset(f.name for f in fields(Article))
+
+
+def recency_key(article: Article) -> float:
+    """최신순 정렬 키 (발행일을 모르는 기사는 가장 오래된 것으로 취급)"""
+    return article.published_ts if article.published_ts is not None else _MISSING_TS
+
+
+def select_recent(articles: Iterable[Article], k: Optional[int] = None) -> List[Article]:
+    """
+    최신 기사 k개를 최신순으로 반환하는 함수
+    전체를 정렬한 뒤 자르지 않고 크기 k의 힙으로 고릅니다 (O(n log k), 발행일이 같으면 입력 순서 유지).
+    k가 None이면 전체를 최신순으로 정렬합니다.
+    """
+    if k is None:
+        return sorted(articles, key=recency_key, reverse=True)
+    return heapq.nlargest(k, articles, key=recency_key)
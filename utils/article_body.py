@@ -0,0 +1,362 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from itertools import zip_longest
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from utils.article import Article
+from utils.dedupe import canonicalize_url, decode_google_news_url
+from utils.feed_fetcher import get_http_session
+from utils.storage import get_data_path
+
+logger = logging.getLogger(__name__)
+
+# 본문 수집 기본값
+DEFAULT_MAX_WORKERS = int(os.getenv("ARTICLE_BODY_MAX_WORKERS", "8"))     # 전체 동시 요청 수
+DEFAULT_MAX_PER_HOST = int(os.getenv("ARTICLE_BODY_MAX_PER_HOST", "2"))   # 같은 호스트 동시 요청 수
+DEFAULT_HOST_INTERVAL = float(os.getenv("ARTICLE_BODY_HOST_INTERVAL", "0.5"))  # 같은 호스트 요청 시작 간격 (초)
+DEFAULT_TIMEOUT = (5.0, 10.0)   # (연결, 읽기) 제한 시간 (초)
+DEFAULT_MAX_CHARS = 4000        # 저장할 본문 최대 글자 수
+# 기사 원문이 아니라 중간 리다이렉트/안내 페이지를 돌려주는 링크 호스트 (원문 URL로 풀리지 않으면 수집하지 않음)
+WRAPPER_HOSTS = {"news.google.com", "google.com", "www.google.com"}
+MAX_PAGE_BYTES = 3 * 1024 * 1024
+
+# 본문 캐시 설정 (기사 본문은 거의 바뀌지 않으므로 길게, 실패는 짧게 기억)
+DEFAULT_CACHE_TTL = float(os.getenv("ARTICLE_BODY_CACHE_TTL", str(7 * 24 * 60 * 60)))
+DEFAULT_FAILURE_TTL = 60 * 60
+DEFAULT_CACHE_MAX_ENTRIES = int(os.getenv("ARTICLE_BODY_CACHE_MAX_ENTRIES", "5000"))
+
+# 본문과 무관한 영역
+_NOISE_TAGS = ["script", "style", "noscript", "iframe", "form", "nav", "header", "footer", "aside", "figure",
+               "button", "svg"]
+# 주요 언론사/블로그의 본문 영역 선택자 (앞쪽 우선)
+_BODY_SELECTORS = [
+    "[itemprop=articleBody]",
+    "#dic_area",                # 네이버 뉴스
+    "#articleBodyContents",
+    "#newsct_article",
+    "#article-view-content-div",
+    "#articleBody",
+    ".article_body",
+    ".article-body",
+    ".news_body",
+    ".post-content",
+    ".entry-content",
+    "article",
+]
+# 본문 영역으로 인정할 최소 글자 수
+_MIN_BODY_CHARS = 200
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def _clean_lines(text: str) -> str:
+    lines = (" ".join(line.split()) for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def extract_main_text(page: str, max_chars: int = DEFAULT_MAX_CHARS) -> str:
+    """
+    기사 페이지 HTML에서 본문 텍스트를 추출하는 함수 (BeautifulSoup 사용)
+
+    1. 알려진 본문 영역 선택자(articleBody, 네이버 #dic_area, <article> 등)에서 충분한 텍스트가 나오면 사용
+    2. 없으면 <p> 텍스트 합이 가장 큰 부모 요소를 본문으로 간주
+    3. 그래도 없으면 <body> 전체 텍스트
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page, "html.parser")
+    for tag in soup(_NOISE_TAGS):
+        tag.decompose()
+
+    text = ""
+    for selector in _BODY_SELECTORS:
+        node = soup.select_one(selector)
+        if node is not None:
+            candidate = _clean_lines(node.get_text("\n"))
+            if len(candidate) >= _MIN_BODY_CHARS:
+                text = candidate
+                break
+
+    if not text:
+        scores: Dict[int, int] = {}
+        parents = {}
+        for paragraph in soup.find_all("p"):
+            parent = paragraph.parent
+            if parent is None:
+                continue
+            key = id(parent)
+            parents[key] = parent
+            scores[key] = scores.get(key, 0) + len(paragraph.get_text(strip=True))
+        if scores:
+            best = parents[max(scores, key=scores.get)]
+            text = _clean_lines("\n".join(p.get_text(" ") for p in best.find_all("p")))
+
+    if not text and soup.body is not None:
+        text = _clean_lines(soup.body.get_text("\n"))
+    if len(text) > max_chars:
+        text = text[:max_chars - 1].rstrip() + "…"
+    return text
+
+
+class BodyCache:
+    """
+    추출한 기사 본문 디스크 캐시 (정규화된 URL 기준, SQLite)
+
+    실패한 URL도 짧게 기억하여 열리지 않는 페이지를 매 실행마다 다시 요청하지 않습니다.
+    항목 수를 넘으면 가장 오래 사용하지 않은 본문부터 삭제합니다.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = DEFAULT_CACHE_TTL,
+                 failure_ttl: float = DEFAULT_FAILURE_TTL, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES):
+        self.path = path or get_data_path("article_bodies.sqlite3")
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS bodies (
+                url_key TEXT PRIMARY KEY,
+                body TEXT,
+                error TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_bodies_accessed ON bodies (accessed_at)")
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[str]:
+        """
+        캐시된 본문을 반환하는 함수
+        없거나 만료되었으면 None, 최근에 실패한 URL이면 빈 문자열
+        """
+        key = canonicalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, error, fetched_at FROM bodies WHERE url_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            body, error, fetched_at = row
+            if now - fetched_at >= (self.failure_ttl if error else self.ttl):
+                return None
+            self._conn.execute("UPDATE bodies SET accessed_at = ? WHERE url_key = ?", (now, key))
+            self._conn.commit()
+        return body or ""
+
+    def put(self, url: str, body: Optional[str], error: Optional[str] = None) -> None:
+        """추출한 본문(또는 실패 사유) 저장"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO bodies (url_key, body, error, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (canonicalize_url(url), body, error[:500] if error else None, now, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM bodies").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM bodies WHERE url_key IN "
+                    "(SELECT url_key FROM bodies ORDER BY accessed_at ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM bodies")
+            self._conn.commit()
+
+
+def get_body_cache() -> BodyCache:
+    """프로세스 전체에서 공유하는 기본 본문 캐시를 반환하는 함수"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = BodyCache()
+        return _default_cache
+
+
+class HostLimiter:
+    """
+    호스트별 요청 예절(politeness) 제한
+    같은 호스트에는 동시에 max_per_host개까지만 요청하고, 요청 시작 간격을 min_interval초 이상 둡니다.
+    """
+
+    def __init__(self, max_per_host: int = DEFAULT_MAX_PER_HOST, min_interval: float = DEFAULT_HOST_INTERVAL):
+        self.max_per_host = max(1, max_per_host)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def acquire(self, host: str) -> None:
+        with self._lock:
+            slot = self._slots.get(host)
+            if slot is None:
+                slot = self._slots[host] = threading.BoundedSemaphore(self.max_per_host)
+        slot.acquire()
+        # 다음 요청 시작 시각을 예약하고 그때까지 대기
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, host: str) -> None:
+        self._slots[host].release()
+
+
+def body_source_url(article: Article) -> str:
+    """
+    본문을 내려받을 원문 URL (언론사 원문 링크 우선)
+    구글 뉴스 RSS 링크는 원문 URL로 풀어 쓰고, 풀 수 없는 래퍼 링크는 빈 문자열을 반환합니다.
+    (래퍼 페이지를 내려받으면 본문 대신 구글 안내 문구가 프롬프트에 들어가고 한 호스트 제한에 모든 요청이 묶임)
+    """
+    url = article.dedupe_link
+    if urlsplit(url).netloc.lower() not in WRAPPER_HOSTS:
+        return url
+    return decode_google_news_url(url) or ""
+
+
+class BodyFetcher:
+    """
+    기사 원문 페이지를 동시에 내려받아 본문을 추출하는 수집기
+
+    Parameters:
+    - max_workers: 전체 동시 요청 수
+    - max_per_host / host_interval: 호스트별 동시 요청 수와 요청 시작 간격 (초)
+    - timeout: (연결, 읽기) 제한 시간 (초)
+    - max_chars: 저장할 본문 최대 글자 수
+    - cache: 본문 캐시 (None이면 공유 캐시, False면 캐시 사용 안 함)
+    - session: 사용할 HTTP 세션 (없으면 공유 세션)
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, max_per_host: int = DEFAULT_MAX_PER_HOST,
+                 host_interval: float = DEFAULT_HOST_INTERVAL, timeout=DEFAULT_TIMEOUT,
+                 max_chars: int = DEFAULT_MAX_CHARS, cache=None, session: Optional[requests.Session] = None,
+                 verify: bool = True):
+        self.max_workers = max(1, max_workers)
+        self.limiter = HostLimiter(max_per_host, host_interval)
+        self.timeout = timeout
+        self.max_chars = max_chars
+        self.cache = get_body_cache() if cache is None else (cache or None)
+        self.session = session or get_http_session()
+        self.verify = verify
+        self.stats = {"fetched": 0, "cached": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _download(self, url: str) -> str:
+        with self.session.get(url, timeout=self.timeout, verify=self.verify, stream=True) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "")
+            if content_type and "html" not in content_type:
+                raise ValueError(f"HTML이 아닌 응답: {content_type}")
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                size += len(chunk)
+                if size > MAX_PAGE_BYTES:
+                    break
+                chunks.append(chunk)
+            encoding = response.encoding if "charset" in content_type.lower() else response.apparent_encoding
+        return b"".join(chunks).decode(encoding or "utf-8", errors="replace")
+
+    def fetch(self, url: str) -> str:
+        """
+        URL 하나의 본문을 반환하는 함수 (캐시 우선, 실패하면 빈 문자열)
+        """
+        if not url:
+            return ""
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None:
+                self._count("cached")
+                return cached
+
+        host = urlsplit(url).netloc.lower()
+        self.limiter.acquire(host)
+        try:
+            body = extract_main_text(self._download(url), self.max_chars)
+        except Exception as e:
+            logger.debug(f"본문 수집 실패 ({url}): {e}")
+            self._count("failed")
+            if self.cache is not None:
+                self.cache.put(url, None, error=str(e) or type(e).__name__)
+            return ""
+        finally:
+            self.limiter.release(host)
+
+        self._count("fetched")
+        if self.cache is not None:
+            self.cache.put(url, body)
+        return body
+
+    def enrich(self, articles: Iterable[Article], sources: Optional[Iterable[str]] = None) -> List[Article]:
+        """
+        기사 목록에 본문(body)을 채워 넣은 새 목록을 반환하는 함수 (입력 순서 유지)
+
+        Parameters:
+        - articles: 기사 목록
+        - sources: 본문을 수집할 출처 이름 (None이면 전체, 목록에 없는 출처와 이미 본문이 있는 기사는 그대로)
+
+        원문 URL로 풀 수 없는 리다이렉트 래퍼 링크(구글 뉴스 RSS 등)의 기사는 수집하지 않고 그대로 둡니다.
+        """
+        articles = list(articles)
+        allowed = None if sources is None else set(sources)
+        urls = {}
+        skipped = 0
+        for i, article in enumerate(articles):
+            if article.body or (allowed is not None and article.source not in allowed):
+                continue
+            url = body_source_url(article)
+            if url:
+                urls[i] = url
+            else:
+                skipped += 1
+        if skipped:
+            logger.info(f"원문 URL을 알 수 없는 리다이렉트 링크 기사 {skipped}개는 본문 수집 생략")
+        if not urls:
+            return articles
+
+        # 같은 호스트 기사가 몰려 작업자가 한 호스트 제한에 모두 묶이지 않도록 호스트별로 번갈아 배치
+        by_host: Dict[str, List[int]] = {}
+        for i, url in urls.items():
+            by_host.setdefault(urlsplit(url).netloc.lower(), []).append(i)
+        targets = [i for group in zip_longest(*by_host.values()) for i in group if i is not None]
+
+        started = time.monotonic()
+        workers = min(self.max_workers, len(targets))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="article-body") as executor:
+            bodies = list(executor.map(lambda i: self.fetch(urls[i]), targets))
+
+        enriched = list(articles)
+        for i, body in zip(targets, bodies):
+            if body:
+                enriched[i] = replace(articles[i], body=body)
+        logger.info(f"기사 본문 {sum(1 for body in bodies if body)}/{len(targets)}개 확보 "
+                    f"({time.monotonic() - started:.2f}초, {self.stats})")
+        return enriched
+
+
+def enrich_articles(articles: Iterable[Article], sources: Optional[Iterable[str]] = None,
+                    **fetcher_kwargs) -> List[Article]:
+    """BodyFetcher로 기사 본문을 채워 넣는 간편 함수"""
+    return BodyFetcher(**fetcher_kwargs).enrich(articles, sources)
@@ -0,0 +1,192 @@
+import base64
+import binascii
+import re
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 어느 사이트에서든 기사 식별과 무관한 추적용 쿼리 파라미터 (광고/클릭 ID)
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_gl",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+# 특정 호스트(하위 도메인 포함)에서만 추적용인 파라미터
+# 'ref', 'from', 'feature' 등은 다른 사이트에서 내용을 고르는 데 쓰이기도 하므로 전역으로 지우지 않음
+HOST_TRACKING_PARAMS = {
+    "news.google.com": {"oc"},
+    "msn.com": {"ocid", "cvid"},
+    "yahoo.com": {"ncid"},
+    "twitter.com": {"ref_src", "ref_url"},
+    "x.com": {"ref_src", "ref_url"},
+    "youtube.com": {"feature"},
+}
+
+# 리다이렉트 래퍼 (호스트, 경로) -> 실제 URL이 들어 있는 쿼리 파라미터
+REDIRECT_WRAPPERS = {
+    ("google.com", "/url"): ("url", "q"),
+    ("news.google.com", "/url"): ("url", "q"),
+    ("news.google.com", "/news/url"): ("url", "q"),
+}
+
+# 구글 뉴스 RSS 기사 링크 (news.google.com/rss/articles/<기사 ID>)
+_GOOGLE_NEWS_HOST = "news.google.com"
+_GOOGLE_NEWS_ARTICLE_PREFIXES = ("/rss/articles/", "/articles/")
+# 원문 URL을 그대로 담은 기사 ID의 protobuf 머리 (field 1 = 19, field 4 = 문자열)
+_GOOGLE_NEWS_ID_HEADER = b"\x08\x13\x22"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TITLE_PUNCT_RE = re.compile(r"[^\w\s]")
+
+
+def _host_tracking_params(host: str) -> frozenset:
+    """호스트(와 상위 도메인)에 지정된 추적용 파라미터 집합"""
+    params = set()
+    labels = host.split(".")
+    for i in range(len(labels) - 1):
+        params.update(HOST_TRACKING_PARAMS.get(".".join(labels[i:]), ()))
+    return frozenset(params)
+
+
+def _is_tracking_param(name: str, host_params: frozenset = frozenset()) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name in host_params or name.startswith(TRACKING_PREFIXES)
+
+
+def decode_google_news_url(url: str) -> Optional[str]:
+    """
+    구글 뉴스 RSS 기사 링크에서 언론사 원문 URL을 꺼내는 함수 (네트워크 요청 없음)
+
+    기사 ID(CBMi...)가 원문 URL을 base64로 담고 있는 형식만 풀 수 있습니다.
+    최근 형식(ID 안에 또 다른 불투명 토큰이 든 경우)은 구글 서버에 묻지 않고는 알 수 없으므로 None을 반환합니다.
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return None
+    if (parts.hostname or "").lower() != _GOOGLE_NEWS_HOST or not parts.path.startswith(_GOOGLE_NEWS_ARTICLE_PREFIXES):
+        return None
+    article_id = parts.path.rstrip("/").rsplit("/", 1)[-1]
+    try:
+        raw = base64.urlsafe_b64decode(article_id + "=" * (-len(article_id) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    if not raw.startswith(_GOOGLE_NEWS_ID_HEADER):
+        return None
+
+    # 문자열 길이 (varint)
+    length, shift, pos = 0, 0, len(_GOOGLE_NEWS_ID_HEADER)
+    while pos < len(raw) and shift < 35:
+        byte = raw[pos]
+        length |= (byte & 0x7F) << shift
+        pos += 1
+        shift += 7
+        if not byte & 0x80:
+            break
+    else:
+        return None
+    try:
+        target = raw[pos:pos + length].decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    return target if target.startswith(("http://", "https://")) else None
+
+
+def canonicalize_url(url: str, _depth: int = 0) -> str:
+    """
+    중복 판별용 정규화 URL을 만드는 함수
+
+    - 스킴(http/https) 차이와 'www.' 접두어, 프래그먼트 무시
+    - utm_*, fbclid 등 추적용 파라미터(와 호스트별 추적 파라미터) 제거, 나머지 파라미터는 정렬
+    - 구글 리다이렉트 래퍼(google.com/url?q=...)와 원문 URL을 담은 구글 뉴스 RSS 기사 링크는 실제 URL로 풀어냄
+      (원문 URL을 담지 않은 구글 뉴스 기사 ID는 그대로 두고 추적 파라미터만 제거)
+    - 경로 끝의 '/' 제거
+    """
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url.strip())
+        # 잘못된 포트('host:abc')는 여기서 ValueError
+        port = parts.port
+    except ValueError:
+        return url.strip()
+
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    port = port if port not in (None, 80, 443) else None
+    path = parts.path or "/"
+    query = parse_qsl(parts.query, keep_blank_values=True)
+
+    wrapper_keys = REDIRECT_WRAPPERS.get((host, path.rstrip("/")))
+    if wrapper_keys and _depth < 3:
+        params = dict(query)
+        for key in wrapper_keys:
+            target = params.get(key)
+            if target and target.startswith(("http://", "https://")):
+                return canonicalize_url(target, _depth + 1)
+    if host == _GOOGLE_NEWS_HOST and _depth < 3:
+        target = decode_google_news_url(url)
+        if target:
+            return canonicalize_url(target, _depth + 1)
+
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+    host_params = _host_tracking_params(host)
+    query = sorted((k, v) for k, v in query if not _is_tracking_param(k, host_params))
+
+    netloc = f"{host}:{port}" if port else host
+    return urlunsplit(("", netloc, path, urlencode(query), "")).lstrip("/")
+
+
+def normalize_title(title: str) -> str:
+    """제목 비교용 정규화 (대소문자, 구두점, 공백 차이 무시)"""
+    title = _TITLE_PUNCT_RE.sub(" ", (title or "").casefold())
+    return _WHITESPACE_RE.sub(" ", title).strip()
+
+
+class ArticleDeduper:
+    """
+    해시 인덱스(set) 기반 기사 중복 제거기
+    항목마다 기존 목록 전체를 훑지 않으므로 O(n)으로 동작합니다.
+
+    Parameters:
+    - match_titles: True면 정규화된 제목이 같은 기사도 중복으로 처리
+    - link_key: 기사 dict에서 URL을 읽을 키
+    """
+
+    def __init__(self, match_titles: bool = False, link_key: str = "link"):
+        self.match_titles = match_titles
+        self.link_key = link_key
+        self._seen_urls = set()
+        self._seen_titles = set()
+
+    def __len__(self) -> int:
+        return len(self._seen_urls)
+
+    def add(self, article: Dict[str, Any], link: Optional[str] = None) -> bool:
+        """
+        기사를 인덱스에 추가하는 함수
+
+        Returns:
+        - 처음 본 기사면 True, 이미 본 기사(중복)면 False
+        """
+        url_key = canonicalize_url(link if link is not None else article.get(self.link_key, ""))
+        title_key = normalize_title(article.get("title", "")) if self.match_titles else ""
+
+        if url_key and url_key in self._seen_urls:
+            return False
+        if title_key and title_key in self._seen_titles:
+            return False
+
+        if url_key:
+            self._seen_urls.add(url_key)
+        if title_key:
+            self._seen_titles.add(title_key)
+        return True
+
+
+def dedupe_articles(articles: Iterable[Dict[str, Any]], match_titles: bool = False) -> List[Dict[str, Any]]:
+    """기사 목록에서 중복을 제거하고 처음 등장한 순서를 유지하여 반환하는 함수"""
+    deduper = ArticleDeduper(match_titles=match_titles)
+    return [article for article in articles if deduper.add(article)]
@@ -0,0 +1,299 @@
+import logging
+import os
+import queue
+import smtplib
+import ssl
+import threading
+import time
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 기본 발송 설정
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("SMTP_MAX_CONNECTIONS", "4"))
+DEFAULT_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_TIMEOUT = 30.0
+# 연결 보안 방식 ("none"은 로컬 테스트 서버 등 평문 연결)
+SECURITY_MODES = ("ssl", "starttls", "none")
+
+
+@dataclass
+class SMTPConfig:
+    """
+    SMTP 서버 설정
+
+    - security: "ssl"(SMTPS, 465), "starttls"(587) 또는 "none"(로컬 테스트 서버 등)
+      그 밖의 값은 ValueError (오타가 평문 연결로 처리되어 비밀번호가 그대로 전송되지 않도록)
+    - username/password가 없으면 로그인하지 않음
+    """
+    host: str = "smtp.gmail.com"
+    port: int = 465
+    username: Optional[str] = None
+    password: Optional[str] = None
+    security: str = "ssl"
+    sender: Optional[str] = None
+    timeout: float = DEFAULT_TIMEOUT
+
+    def __post_init__(self):
+        self.security = (self.security or "").strip().lower()
+        if self.security not in SECURITY_MODES:
+            raise ValueError(f"지원하지 않는 SMTP 보안 방식: {self.security!r} "
+                             f"({', '.join(SECURITY_MODES)} 중 하나여야 합니다)")
+
+    @classmethod
+    def from_env(cls) -> "SMTPConfig":
+        """
+        환경 변수에서 설정을 읽는 함수
+        SMTP_HOST, SMTP_PORT, SMTP_SECURITY, SMTP_USER, SMTP_PASSWORD, SMTP_SENDER
+        (SMTP_USER/SMTP_PASSWORD가 없으면 GMAIL_USER/GMAIL_APP_PASSWORD 사용)
+        """
+        username = os.getenv("SMTP_USER") or os.getenv("GMAIL_USER")
+        return cls(
+            host=os.getenv("SMTP_HOST", "smtp.gmail.com"),
+            port=int(os.getenv("SMTP_PORT", "465")),
+            username=username,
+            password=os.getenv("SMTP_PASSWORD") or os.getenv("GMAIL_APP_PASSWORD"),
+            security=os.getenv("SMTP_SECURITY", "ssl"),
+            sender=os.getenv("SMTP_SENDER") or username,
+        )
+
+
+def build_message(sender: str, recipient: str, subject: str,
+                  text: Optional[str] = None, html: Optional[str] = None) -> EmailMessage:
+    """수신자 한 명에게 보낼 메시지 생성 (text와 html이 모두 있으면 multipart/alternative)"""
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["From"] = sender
+    msg["To"] = recipient
+    msg.set_content(text if text is not None else "")
+    if html is not None:
+        if text is None:
+            msg.set_content(html, subtype="html")
+        else:
+            msg.add_alternative(html, subtype="html")
+    return msg
+
+
+def is_connection_error(error: Exception) -> bool:
+    """연결이 끊기거나 소켓 오류가 난 경우인지 (SMTP 응답 오류가 아닌 경우)"""
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+def is_auth_error(error: Exception) -> bool:
+    """로그인 실패인지 (설정 문제이므로 다시 연결해도 실패하고, 반복하면 계정이 잠길 수 있음)"""
+    return isinstance(error, smtplib.SMTPAuthenticationError)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """재시도하면 성공할 수 있는 오류인지 (연결 오류 또는 4xx 응답, 로그인 실패는 제외)"""
+    if is_auth_error(error):
+        return False
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return is_connection_error(error)
+
+
+class SMTPConnection:
+    """
+    재사용되는 SMTP 연결 하나
+    처음 보낼 때 연결/로그인하고, max_messages개를 보내면 연결을 새로 맺습니다.
+    """
+
+    def __init__(self, config: SMTPConfig, max_messages: int = DEFAULT_MAX_MESSAGES_PER_CONNECTION):
+        self.config = config
+        self.max_messages = max_messages
+        self.connects = 0
+        self._server: Optional[smtplib.SMTP] = None
+        self._sent_on_connection = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        config = self.config
+        if config.security == "ssl":
+            server = smtplib.SMTP_SSL(config.host, config.port, timeout=config.timeout,
+                                      context=ssl.create_default_context())
+        elif config.security in ("starttls", "none"):
+            server = smtplib.SMTP(config.host, config.port, timeout=config.timeout)
+        else:
+            raise ValueError(f"지원하지 않는 SMTP 보안 방식: {config.security!r}")
+        try:
+            if config.security == "starttls":
+                server.starttls(context=ssl.create_default_context())
+            if config.username and config.password:
+                server.login(config.username, config.password)
+        except BaseException:
+            # 연결 후 단계(STARTTLS, 로그인)가 실패하면 소켓을 닫고 오류 전달
+            server.close()
+            raise
+        self.connects += 1
+        self._sent_on_connection = 0
+        return server
+
+    def send(self, msg: EmailMessage) -> None:
+        """메시지 하나 발송 (연결이 없거나 메시지 수 한도에 도달했으면 새로 연결)"""
+        if self._server is not None and self._sent_on_connection >= self.max_messages:
+            self.close()
+        if self._server is None:
+            self._server = self._connect()
+        try:
+            self._server.send_message(msg)
+        except OSError as e:
+            # 끊긴 연결은 버리고 다음 발송 때 다시 연결 (SMTP 응답 오류는 연결을 계속 사용)
+            if is_connection_error(e):
+                self.close(quit=False)
+            raise
+        self._sent_on_connection += 1
+
+    def close(self, quit: bool = True) -> None:
+        """연결 종료"""
+        server, self._server = self._server, None
+        if server is None:
+            return
+        try:
+            if quit:
+                server.quit()
+            else:
+                server.close()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+
+@dataclass
+class DeliveryResult:
+    """메시지 하나의 발송 결과"""
+    recipient: str
+    ok: bool
+    attempts: int
+    error: Optional[str] = None
+
+
+@dataclass
+class DeliveryReport:
+    """대량 발송 결과와 처리량"""
+    results: List[DeliveryResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    connections: int = 0
+
+    @property
+    def sent(self) -> int:
+        return sum(1 for result in self.results if result.ok)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.sent
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (f"성공 {self.sent}건, 실패 {self.failed}건, {self.elapsed:.2f}초 "
+                f"({self.messages_per_second:.1f}건/초, 연결 {self.connections}회)")
+
+
+class BulkMailer:
+    """
+    재사용 연결 풀로 수신자별 메시지를 병렬 발송하는 엔진
+
+    작업 스레드마다 SMTP 연결을 하나씩 유지하며 큐에서 메시지를 꺼내 보냅니다.
+    연결 오류나 4xx 응답은 연결을 새로 맺어 max_retries번까지 다시 시도하고,
+    5xx 응답(수신 거부 등)은 바로 실패로 기록합니다.
+    로그인 실패는 모든 작업 스레드의 발송을 중단하고 남은 메시지를 다시 연결하지 않고 실패로 기록합니다
+    (잘못된 비밀번호로 메시지마다 로그인을 반복하면 계정이 잠길 수 있음).
+
+    Parameters:
+    - config: SMTP 서버 설정
+    - max_connections: 동시에 유지할 연결(작업 스레드) 수
+    - max_messages_per_connection: 연결 하나로 보낼 최대 메시지 수
+    - max_retries: 일시적 오류 시 메시지당 재시도 횟수
+    """
+
+    def __init__(self, config: SMTPConfig,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 max_messages_per_connection: int = DEFAULT_MAX_MESSAGES_PER_CONNECTION,
+                 max_retries: int = DEFAULT_MAX_RETRIES):
+        self.config = config
+        self.max_connections = max(1, max_connections)
+        self.max_messages_per_connection = max_messages_per_connection
+        self.max_retries = max_retries
+
+    def _worker(self, jobs: "queue.Queue[EmailMessage]", report: DeliveryReport, lock: threading.Lock,
+                aborted: threading.Event) -> None:
+        connection = SMTPConnection(self.config, self.max_messages_per_connection)
+        try:
+            while True:
+                try:
+                    msg = jobs.get_nowait()
+                except queue.Empty:
+                    return
+                if aborted.is_set():
+                    result = DeliveryResult(msg["To"], False, 0, "SMTP 로그인 실패로 발송 중단")
+                else:
+                    result = self._send_with_retry(connection, msg, aborted)
+                with lock:
+                    report.results.append(result)
+        finally:
+            connection.close()
+            with lock:
+                report.connections += connection.connects
+
+    def _send_with_retry(self, connection: SMTPConnection, msg: EmailMessage,
+                         aborted: threading.Event) -> DeliveryResult:
+        recipient = msg["To"]
+        for attempt in range(1, self.max_retries + 2):
+            try:
+                connection.send(msg)
+                return DeliveryResult(recipient, True, attempt)
+            except Exception as e:
+                if is_auth_error(e):
+                    if not aborted.is_set():
+                        aborted.set()
+                        logger.error(f"SMTP 로그인 실패, 남은 메시지 발송을 중단합니다: {e}")
+                    return DeliveryResult(recipient, False, attempt, str(e))
+                if not is_transient_error(e) or attempt > self.max_retries:
+                    logger.error(f"'{recipient}' 발송 실패 ({attempt}회 시도): {e}")
+                    return DeliveryResult(recipient, False, attempt, str(e))
+                logger.warning(f"'{recipient}' 발송 중 일시적 오류, 다시 연결하여 재시도: {e}")
+                connection.close(quit=False)
+                time.sleep(min(0.5 * attempt, 2.0))
+        return DeliveryResult(recipient, False, self.max_retries + 1, "재시도 한도 초과")
+
+    def send_all(self, messages: Iterable[EmailMessage]) -> DeliveryReport:
+        """메시지 목록을 발송하고 결과 보고서를 반환하는 함수"""
+        jobs: "queue.Queue[EmailMessage]" = queue.Queue()
+        for msg in messages:
+            jobs.put(msg)
+        report = DeliveryReport()
+        if jobs.empty():
+            return report
+
+        lock = threading.Lock()
+        aborted = threading.Event()
+        started = time.perf_counter()
+        workers = [
+            threading.Thread(target=self._worker, args=(jobs, report, lock, aborted), daemon=True)
+            for _ in range(min(self.max_connections, jobs.qsize()))
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        report.elapsed = time.perf_counter() - started
+        logger.info(f"이메일 발송 완료: {report}")
+        return report
+
+    def send_newsletter(self, recipients: Iterable[str], subject: str,
+                        text: Optional[str] = None, html: Optional[str] = None) -> DeliveryReport:
+        """같은 뉴스레터를 수신자마다 개별 메시지로 발송하는 함수"""
+        sender = self.config.sender or self.config.username
+        messages = [
+            build_message(sender, recipient.strip(), subject, text=text, html=html)
+            for recipient in recipients if recipient and recipient.strip()
+        ]
+        return self.send_all(messages)
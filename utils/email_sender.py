@@ -1,25 +1,25 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from typing import Optional
+
 import streamlit as st
 
-def send_newsletter_email(recipient_email: str, newsletter_content: str, subject: str) -> bool:
+from utils.email_delivery import BulkMailer, SMTPConfig
+
+def send_newsletter_email(recipient_email: str, newsletter_content: str, subject: str,
+                          text_content: Optional[str] = None) -> bool:
     """
     생성된 뉴스레터를 이메일로 발송하는 함수
+    쉼표로 구분된 여러 수신자에게는 재사용 SMTP 연결로 한 명씩 개별 메시지를 보냅니다.
     
     Args:
-        recipient_email (str): 수신자 이메일 주소
+        recipient_email (str): 수신자 이메일 주소 (쉼표로 구분하여 여러 명 가능)
         newsletter_content (str): 뉴스레터 내용 (HTML 형식)
         subject (str): 이메일 제목
+        text_content (str, optional): 텍스트 대체 본문 (있으면 multipart/alternative로 발송)
         
     Returns:
-        bool: 이메일 발송 성공 여부
+        bool: 이메일 발송 성공 여부 (모든 수신자에게 발송된 경우 True)
     """
     try:
-        # Gmail SMTP 서버 설정
-        smtp_server = "smtp.gmail.com"
-        smtp_port = 587
-        
         # secrets.toml에서 이메일 설정 로드
         sender_email = st.secrets.get("GMAIL_USER")
         sender_password = st.secrets.get("GMAIL_APP_PASSWORD")
@@ -27,23 +27,21 @@ def send_newsletter_email(recipient_email: str, newsletter_content: str, subject
         if not sender_email or not sender_password:
             raise ValueError("이메일 설정이 없습니다.")
         
-        # 이메일 메시지 생성
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = sender_email
-        msg['To'] = recipient_email
-        
-        # HTML 형식의 본문 추가
-        html_part = MIMEText(newsletter_content, 'html')
-        msg.attach(html_part)
+        # Gmail SMTP 서버 설정 (STARTTLS)
+        config = SMTPConfig(
+            host=st.secrets.get("SMTP_HOST", "smtp.gmail.com"),
+            port=int(st.secrets.get("SMTP_PORT", 587)),
+            username=sender_email,
+            password=sender_password,
+            security=st.secrets.get("SMTP_SECURITY", "starttls"),
+            sender=sender_email
+        )
         
-        # SMTP 서버 연결 및 이메일 발송
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(sender_email, sender_password)
-            server.send_message(msg)
-            
-        return True
+        recipients = [email.strip() for email in recipient_email.split(',') if email.strip()]
+        report = BulkMailer(config).send_newsletter(
+            recipients, subject, text=text_content, html=newsletter_content
+        )
+        return report.sent > 0 and report.failed == 0
         
     except Exception as e:
         print(f"이메일 발송 중 오류 발생: {str(e)}")
@@ -0,0 +1,139 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from utils.storage import get_data_path
+
+logger = logging.getLogger(__name__)
+
+# 기본 캐시 설정
+DEFAULT_TTL = float(os.getenv("FEED_CACHE_TTL", "600"))            # 재검증 없이 그대로 쓰는 시간 (초)
+DEFAULT_MAX_ENTRIES = int(os.getenv("FEED_CACHE_MAX_ENTRIES", "256"))
+DEFAULT_MAX_BYTES = int(os.getenv("FEED_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+class FeedCache:
+    """
+    RSS 피드 조건부 요청(ETag / Last-Modified)을 위한 디스크 캐시
+
+    URL마다 검증자(ETag, Last-Modified)와 파싱된 항목을 SQLite에 저장합니다.
+    항목 수와 전체 크기를 넘으면 가장 오래 사용하지 않은 피드부터 삭제합니다.
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 ttl: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path or get_data_path("feed_cache.sqlite3")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS feeds (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                entries TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """캐시된 피드 정보를 반환 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, entries, fetched_at FROM feeds WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE feeds SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        etag, last_modified, entries, fetched_at = row
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "entries": json.loads(entries),
+            "fetched_at": fetched_at,
+        }
+
+    def is_fresh(self, cached: Optional[Dict[str, Any]], ttl: Optional[float] = None) -> bool:
+        """TTL 안에 있어 서버에 재검증하지 않아도 되는지 여부"""
+        ttl = self.ttl if ttl is None else ttl
+        return cached is not None and (time.time() - cached["fetched_at"]) < ttl
+
+    def conditional_headers(self, cached: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """조건부 요청에 사용할 헤더 생성"""
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def put(self, url: str, entries: List[Dict[str, Any]],
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """새로 받은 피드 항목과 검증자를 저장"""
+        payload = json.dumps(entries, ensure_ascii=False, separators=(",", ":"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO feeds (url, etag, last_modified, entries, size, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, payload, len(payload), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, url: str) -> None:
+        """304 응답을 받은 경우 재검증 시각만 갱신"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE feeds SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url)
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM feeds")
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """항목 수/전체 크기 제한을 넘으면 가장 오래 사용하지 않은 피드부터 삭제 (잠금 보유 상태에서 호출)"""
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM feeds").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT url, size FROM feeds ORDER BY accessed_at ASC").fetchall()
+        for url, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM feeds WHERE url = ?", (url,))
+            count -= 1
+            total -= size
+        logger.debug(f"피드 캐시 정리 완료: {count}개, {total} bytes")
+
+
+def get_feed_cache() -> FeedCache:
+    """프로세스 전체에서 공유하는 기본 피드 캐시를 반환하는 함수"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = FeedCache()
+        return _default_cache
@@ -0,0 +1,187 @@
+import calendar
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+import feedparser
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.text_clean import strip_html
+
+logger = logging.getLogger(__name__)
+
+# 피드 요청 기본값
+DEFAULT_CONNECT_TIMEOUT = 5.0   # 연결 제한 시간 (초)
+DEFAULT_READ_TIMEOUT = 15.0     # 소켓 읽기 제한 시간 (초)
+DEFAULT_DEADLINE = 30.0         # 피드 하나를 받는 데 허용하는 전체 시간 (초)
+DEFAULT_MAX_WORKERS = 8
+MAX_FEED_BYTES = 10 * 1024 * 1024
+
+USER_AGENT = "Mozilla/5.0 (compatible; NewsletterBot/1.0; +https://github.com/leenamkee/news_letter_app_manus)"
+
+_session = None
+_session_lock = threading.Lock()
+
+
+@dataclass
+class FeedResult:
+    """피드 하나를 가져온 결과"""
+    name: str
+    url: str
+    entries: List[Dict[str, Any]] = field(default_factory=list)
+    bozo: bool = False
+    error: Optional[str] = None
+    status: Optional[int] = None
+    elapsed: float = 0.0
+    from_cache: bool = False
+
+
+def get_http_session(pool_size: int = 16) -> requests.Session:
+    """
+    프로세스 전체에서 공유하는 HTTP 세션을 반환하는 함수
+    (연결 풀을 재사용하여 매 요청마다 TCP/TLS 연결을 새로 맺지 않음)
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"User-Agent": USER_AGENT})
+            _session = session
+        return _session
+
+
+def _struct_to_epoch(parsed) -> Optional[float]:
+    """feedparser의 time.struct_time(UTC)을 epoch 초로 변환"""
+    if not parsed:
+        return None
+    try:
+        return float(calendar.timegm(tuple(parsed)))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def normalize_entry(entry) -> Dict[str, Any]:
+    """feedparser 항목을 JSON으로 직렬화 가능한 단순 dict로 변환 (제목/요약의 HTML 제거)"""
+    return {
+        "title": strip_html(entry.get("title", "")),
+        "link": entry.get("link", ""),
+        "published": entry.get("published") or entry.get("updated") or "",
+        "published_ts": _struct_to_epoch(entry.get("published_parsed") or entry.get("updated_parsed")),
+        "description": strip_html(entry.get("description") or entry.get("summary") or ""),
+    }
+
+
+def _read_body(response: requests.Response, deadline_at: float) -> bytes:
+    """전체 제한 시간을 지키면서 응답 본문을 읽음"""
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        if time.monotonic() > deadline_at:
+            raise TimeoutError("피드 다운로드 제한 시간 초과")
+        size += len(chunk)
+        if size > MAX_FEED_BYTES:
+            raise ValueError("피드 크기가 너무 큽니다")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def fetch_feed(name: str, url: str,
+               connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+               read_timeout: float = DEFAULT_READ_TIMEOUT,
+               deadline: float = DEFAULT_DEADLINE,
+               verify: bool = True,
+               session: Optional[requests.Session] = None,
+               cache=None,
+               ttl: Optional[float] = None) -> FeedResult:
+    """
+    RSS 피드 하나를 제한 시간 안에 내려받아 파싱하는 함수
+
+    Parameters:
+    - name: 피드 이름
+    - url: 피드 URL
+    - connect_timeout / read_timeout: 연결 및 소켓 읽기 제한 시간 (초)
+    - deadline: 다운로드 전체에 허용하는 시간 (초)
+    - verify: SSL 인증서 검증 여부
+    - session: 사용할 HTTP 세션 (없으면 공유 세션 사용)
+    - cache: FeedCache (지정하면 ETag/Last-Modified 조건부 요청 사용)
+    - ttl: 재검증 없이 캐시를 그대로 쓰는 시간 (초, 없으면 캐시 기본값)
+
+    Returns:
+    - FeedResult (오류가 발생해도 예외 대신 error 필드에 기록)
+    """
+    session = session or get_http_session()
+    started = time.monotonic()
+    result = FeedResult(name=name, url=url)
+    cached = cache.get(url) if cache is not None else None
+    try:
+        # TTL 안의 캐시는 요청 없이 그대로 사용
+        if cached is not None and cache.is_fresh(cached, ttl):
+            result.entries = cached["entries"]
+            result.from_cache = True
+            result.elapsed = time.monotonic() - started
+            return result
+
+        headers = cache.conditional_headers(cached) if cache is not None else {}
+        with session.get(url, headers=headers, timeout=(connect_timeout, read_timeout),
+                         verify=verify, stream=True) as response:
+            result.status = response.status_code
+            if response.status_code == 304 and cached is not None:
+                # 변경 없음: 저장해 둔 파싱 결과 재사용
+                cache.touch(url)
+                result.entries = cached["entries"]
+                result.from_cache = True
+                result.elapsed = time.monotonic() - started
+                return result
+            response.raise_for_status()
+            body = _read_body(response, started + deadline)
+
+        feed = feedparser.parse(body, response_headers={
+            "content-type": response.headers.get("Content-Type", ""),
+            "content-location": url,
+        })
+        result.bozo = bool(feed.bozo)
+        if feed.bozo:
+            result.error = str(feed.get("bozo_exception", ""))
+        result.entries = [normalize_entry(entry) for entry in feed.entries]
+        if cache is not None and not result.bozo:
+            cache.put(url, result.entries,
+                      etag=response.headers.get("ETag"),
+                      last_modified=response.headers.get("Last-Modified"))
+    except Exception as e:
+        result.error = str(e)
+    result.elapsed = time.monotonic() - started
+    return result
+
+
+def fetch_feeds(feed_urls: Dict[str, str],
+                max_workers: int = DEFAULT_MAX_WORKERS,
+                **fetch_kwargs) -> Iterator[FeedResult]:
+    """
+    여러 RSS 피드를 스레드 풀에서 동시에 가져오는 함수
+    완료되는 순서대로 결과를 돌려주므로 전체 소요 시간은 가장 느린 피드 하나에 가깝습니다.
+
+    Parameters:
+    - feed_urls: {피드 이름: URL} 딕셔너리
+    - max_workers: 동시에 요청할 최대 피드 수
+    - fetch_kwargs: fetch_feed에 그대로 전달할 옵션 (timeout, verify 등)
+
+    Returns:
+    - FeedResult 이터레이터 (완료 순서)
+    """
+    if not feed_urls:
+        return
+    workers = max(1, min(max_workers, len(feed_urls)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-fetch") as executor:
+        futures = [
+            executor.submit(fetch_feed, name, url, **fetch_kwargs)
+            for name, url in feed_urls.items()
+        ]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,253 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence
+
+from utils.storage import get_data_path
+
+logger = logging.getLogger(__name__)
+
+# 기본 캐시 설정
+DEFAULT_TTL = float(os.getenv("LLM_CACHE_TTL", str(24 * 60 * 60)))     # 응답 보관 시간 (초)
+DEFAULT_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+# LLM_CACHE_DISABLED=1 이면 캐시를 읽지도 쓰지도 않음
+CACHE_DISABLED = os.getenv("LLM_CACHE_DISABLED", "").lower() in ("1", "true", "yes")
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+# 실제 API 호출의 토큰 사용량 누적 (캐시 적중은 포함하지 않음)
+_usage_lock = threading.Lock()
+_token_usage = {"calls": 0, "input_tokens": 0, "output_tokens": 0}
+
+
+def record_token_usage(message) -> None:
+    """LLM 응답 메시지의 usage_metadata를 누적하는 함수"""
+    usage = getattr(message, "usage_metadata", None) or {}
+    with _usage_lock:
+        _token_usage["calls"] += 1
+        _token_usage["input_tokens"] += usage.get("input_tokens", 0)
+        _token_usage["output_tokens"] += usage.get("output_tokens", 0)
+
+
+def get_token_usage() -> Dict[str, int]:
+    """누적 토큰 사용량을 반환하는 함수"""
+    with _usage_lock:
+        return dict(_token_usage)
+
+
+def reset_token_usage() -> None:
+    """누적 토큰 사용량 초기화"""
+    with _usage_lock:
+        for key in _token_usage:
+            _token_usage[key] = 0
+
+
+def _normalize_text(text: Any) -> str:
+    """키 계산용 메시지 정규화 (들여쓰기/줄바꿈 등 공백 차이 무시)"""
+    if not isinstance(text, str):
+        text = json.dumps(text, ensure_ascii=False, sort_keys=True)
+    return " ".join(text.split())
+
+
+def make_cache_key(model: str, params: Dict[str, Any], messages: Sequence[Any]) -> str:
+    """
+    모델, 파라미터, 정규화된 메시지로 콘텐츠 주소 키(SHA-256)를 만드는 함수
+
+    Parameters:
+    - model: 모델 이름
+    - params: temperature, base_url 등 응답에 영향을 주는 파라미터
+    - messages: LangChain 메시지 목록 (type/content 속성) 또는 (role, content) 튜플 목록
+    """
+    normalized = []
+    for message in messages:
+        if isinstance(message, (tuple, list)):
+            role, content = message
+        else:
+            role, content = getattr(message, "type", "unknown"), getattr(message, "content", "")
+        normalized.append([role, _normalize_text(content)])
+    payload = json.dumps(
+        {"model": model, "params": params, "messages": normalized},
+        ensure_ascii=False, sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    LLM 응답을 SQLite에 저장하는 콘텐츠 주소 캐시
+    같은 모델/파라미터/메시지 요청은 API를 호출하지 않고 저장된 응답을 돌려줍니다.
+    TTL이 지난 응답은 무시하고, 최대 항목 수를 넘으면 가장 오래 사용하지 않은 응답부터 삭제합니다.
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 ttl: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 enabled: bool = not CACHE_DISABLED):
+        self.path = path or get_data_path("llm_cache.sqlite3")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """저장된 응답을 반환 (없거나 만료되었으면 None)"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] >= self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.stats["misses"] += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.stats["hits"] += 1
+            return row[0]
+
+    def put(self, key: str, content: str) -> None:
+        """응답 저장 (최대 항목 수를 넘으면 LRU 삭제)"""
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, content, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, content, now, now)
+            )
+            self.stats["writes"] += 1
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self.stats["evictions"] += overflow
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def hit_rate(self) -> float:
+        """캐시 적중률"""
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """프로세스 전체에서 공유하는 기본 LLM 응답 캐시를 반환하는 함수"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMResponseCache()
+        return _default_cache
+
+
+def llm_cache_key(llm, messages: Sequence[Any]) -> str:
+    """LangChain ChatOpenAI 객체의 설정과 메시지로 캐시 키를 만드는 함수"""
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", "")
+    params = {
+        "temperature": getattr(llm, "temperature", None),
+        "max_tokens": getattr(llm, "max_tokens", None),
+        "base_url": getattr(llm, "openai_api_base", None),
+    }
+    return make_cache_key(model, params, messages)
+
+
+def cached_invoke(llm, messages: Sequence[Any], cache: Optional[LLMResponseCache] = None,
+                  bypass: bool = False, validate: Optional[Callable[[str], bool]] = None) -> str:
+    """
+    캐시를 거쳐 LLM을 호출하고 응답 텍스트를 반환하는 함수
+
+    Parameters:
+    - llm: LangChain 채팅 모델
+    - messages: 전달할 메시지 목록
+    - cache: 사용할 캐시 (없으면 기본 캐시)
+    - bypass: True면 캐시를 읽지도 쓰지도 않고 바로 호출
+    - validate: 응답 검증 함수 (False를 반환한 응답은 캐시에 저장하지 않음)
+
+    Returns:
+    - 응답 텍스트
+    """
+    cache = cache or get_llm_cache()
+    if bypass or not cache.enabled:
+        response = llm.invoke(messages)
+        record_token_usage(response)
+        return response.content
+
+    key = llm_cache_key(llm, messages)
+    content = cache.get(key)
+    if content is not None:
+        logger.debug(f"LLM 캐시 적중 ({key[:12]})")
+        return content
+
+    response = llm.invoke(messages)
+    record_token_usage(response)
+    content = response.content
+    if validate is None or validate(content):
+        cache.put(key, content)
+    return content
+
+
+def cached_stream(llm, messages: Sequence[Any], cache: Optional[LLMResponseCache] = None,
+                  bypass: bool = False, validate: Optional[Callable[[str], bool]] = None) -> Iterator[str]:
+    """
+    캐시를 거쳐 LLM 응답을 스트리밍하는 함수
+    캐시 적중 시 저장된 응답 전체를 한 번에 돌려주고, 미적중 시 토큰 조각을 받는 대로 돌려준 뒤
+    스트림이 끝까지 완료되고 validate를 통과한 경우에만 전체 응답을 저장합니다.
+
+    Yields:
+    - 응답 텍스트 조각
+    """
+    cache = cache or get_llm_cache()
+    use_cache = not bypass and cache.enabled
+    key = llm_cache_key(llm, messages) if use_cache else None
+
+    if use_cache:
+        content = cache.get(key)
+        if content is not None:
+            logger.debug(f"LLM 캐시 적중 ({key[:12]})")
+            yield content
+            return
+
+    parts = []
+    usage_chunk = None
+    for chunk in llm.stream(messages):
+        if getattr(chunk, "usage_metadata", None):
+            usage_chunk = chunk
+        text = chunk.content if isinstance(chunk.content, str) else ""
+        if text:
+            parts.append(text)
+            yield text
+    record_token_usage(usage_chunk)
+
+    content = "".join(parts)
+    if use_cache and (validate is None or validate(content)):
+        cache.put(key, content)
@@ -0,0 +1,208 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from utils.feed_fetcher import get_http_session
+
+logger = logging.getLogger(__name__)
+
+NAVER_NEWS_URL = "https://openapi.naver.com/v1/search/news.json"
+
+# 네이버 검색 API 제한
+MAX_DISPLAY = 100       # 한 번에 가져올 수 있는 최대 결과 수
+MAX_START = 1000        # start 파라미터 최댓값
+
+DEFAULT_TIMEOUT = (5.0, 10.0)   # (연결, 읽기) 제한 시간 (초)
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 0.5           # 재시도 기본 대기 시간 (초, 2배씩 증가)
+
+
+class NaverAPIError(Exception):
+    """네이버 API 요청 실패"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class NaverNewsClient:
+    """
+    공유 HTTP 세션 위에서 동작하는 네이버 뉴스 검색 클라이언트
+    display/start 페이지를 동시에 요청하고 (첫 페이지가 가득 찬 경우에만 나머지 페이지 요청),
+    429/5xx 응답은 지수 백오프로 재시도합니다.
+
+    Parameters:
+    - client_id / client_secret: 네이버 API 인증 정보
+    - session: 사용할 HTTP 세션 (없으면 공유 세션 사용)
+    - timeout: (연결, 읽기) 제한 시간
+    - max_workers: 동시에 요청할 최대 페이지 수
+    - max_retries: 429/5xx 응답 시 최대 재시도 횟수
+    """
+
+    def __init__(self, client_id: str, client_secret: str,
+                 session: Optional[requests.Session] = None,
+                 timeout=DEFAULT_TIMEOUT,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF):
+        self.headers = {
+            "X-Naver-Client-Id": client_id,
+            "X-Naver-Client-Secret": client_secret
+        }
+        self.session = session or get_http_session()
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def fetch_page(self, query: str, start: int = 1, display: int = MAX_DISPLAY,
+                   sort: str = "date") -> List[Dict[str, Any]]:
+        """검색 결과 한 페이지 요청 (429/5xx는 백오프 후 재시도)"""
+        params = {"query": query, "display": display, "start": start, "sort": sort}
+        for attempt in range(self.max_retries + 1):
+            response = self.session.get(NAVER_NEWS_URL, headers=self.headers,
+                                        params=params, timeout=self.timeout)
+            if response.status_code == 200:
+                return response.json().get("items", [])
+            if response.status_code != 429 and response.status_code < 500:
+                raise NaverAPIError(f"네이버 API 오류: {response.status_code}", response.status_code)
+            if attempt == self.max_retries:
+                break
+            retry_after = response.headers.get("Retry-After")
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else self.backoff * (2 ** attempt)
+            logger.warning(f"네이버 API {response.status_code} 응답, {delay:.1f}초 후 재시도 (start={start})")
+            time.sleep(delay)
+        raise NaverAPIError(f"네이버 API 오류: {response.status_code}", response.status_code)
+
+    @staticmethod
+    def plan_pages(max_results: int) -> List[Tuple[int, int]]:
+        """
+        max_results개를 가져오는 데 필요한 (start, display) 페이지 목록
+        (API 제한상 질의당 최대 start 1000 + display 100)
+        """
+        max_results = max(1, min(max_results, MAX_START + MAX_DISPLAY - 1))
+        display = min(MAX_DISPLAY, max_results)
+        return [(start, display) for start in range(1, max_results + 1, display) if start <= MAX_START]
+
+    def search(self, query: str, max_results: int, sort: str = "date",
+               on_page: Optional[Callable[[int, int], None]] = None,
+               unique_key: Optional[Callable[[Dict[str, Any]], str]] = None) -> List[Dict[str, Any]]:
+        """필요한 페이지 수만큼 동시에 요청하여 검색 결과를 최대 max_results개까지 가져오는 함수"""
+        return self.search_many([query], max_results, sort, on_page, unique_key)[0]
+
+    def search_many(self, queries: List[str], max_results: int, sort: str = "date",
+                    on_page: Optional[Callable[[int, int], None]] = None,
+                    unique_key: Optional[Callable[[Dict[str, Any]], str]] = None) -> List[List[Dict[str, Any]]]:
+        """
+        여러 질의의 페이지를 동시에 요청하여 질의별 결과 목록을 반환하는 함수
+
+        질의마다 첫 페이지를 먼저 받아 보고, 첫 페이지가 가득 찼을 때만 나머지 페이지를 동시에 요청합니다
+        (결과가 적은 검색어에 필요 없는 페이지를 요청하지 않음). 덜 찬 페이지가 나오면 그 뒤 페이지는 취소합니다.
+        일부 페이지가 실패해도 받은 페이지의 결과는 유지하며, 모든 페이지가 실패한 경우에만 오류를 전달합니다.
+
+        Parameters:
+        - queries: 검색어 목록
+        - max_results: 질의당 최대 결과 수
+        - sort: 정렬 방식 ("date" 또는 "sim")
+        - on_page: 페이지를 하나 받을 때마다 (완료 페이지 수, 전체 페이지 수)로 호출되는 함수
+                   (호출한 스레드에서 실행되므로 UI 갱신에 사용할 수 있음, 전체 수는 건너뛴 페이지만큼 줄어듦)
+        - unique_key: 결과 항목의 중복 판별 키를 만드는 함수 (주면 질의별로 중복을 제거한 뒤 max_results개로 자르고,
+                      중복 때문에 모자라면 다음 페이지를 한 번 더 요청)
+        """
+        pages = self.plan_pages(max_results)
+        results: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+        errors: List[Exception] = []
+        # 질의별로 결과가 끝난(덜 찬 페이지가 나온) 시작 위치
+        last_start = {qi: pages[-1][0] for qi in range(len(queries))}
+        total = len(queries) * len(pages)
+        done = 0
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, total)) as executor:
+            def submit(qi, start, display):
+                return executor.submit(self.fetch_page, queries[qi], start, display, sort)
+
+            running = {submit(qi, *pages[0]): (qi, pages[0]) for qi in range(len(queries))}
+            try:
+                while running:
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        qi, (start, display) = running.pop(future)
+                        if future.cancelled():
+                            continue
+                        done += 1
+                        try:
+                            page = future.result()
+                        except (NaverAPIError, requests.RequestException, ValueError) as e:
+                            logger.warning(f"네이버 API 페이지 요청 실패 ('{queries[qi]}', start={start}): {e}")
+                            errors.append(e)
+                            page = None
+                        if page is not None:
+                            results[(qi, start)] = page
+                            if len(page) < display and start < last_start[qi]:
+                                # 결과가 끝났으므로 이후 페이지는 요청하지 않음 (아직 시작 안 한 요청은 취소)
+                                last_start[qi] = start
+                                if start == pages[0][0]:
+                                    total -= len(pages) - 1
+                                for other, (other_qi, (other_start, _)) in list(running.items()):
+                                    if other_qi == qi and other_start > start and other.cancel():
+                                        running.pop(other)
+                                        total -= 1
+                        if start == pages[0][0] and (page is None or len(page) >= display):
+                            # 첫 페이지가 가득 찼으면(또는 실패했으면) 나머지 페이지를 동시에 요청
+                            for next_page in pages[1:]:
+                                running[submit(qi, *next_page)] = (qi, next_page)
+                        if on_page:
+                            on_page(done, total)
+            except BaseException:
+                for future in running:
+                    future.cancel()
+                raise
+
+        if not results and errors:
+            raise errors[0]
+
+        # 질의별로 페이지 순서대로 합치고, 마지막(덜 찬) 페이지 이후는 버림 (실패한 페이지는 건너뜀)
+        merged = []
+        for qi in range(len(queries)):
+            items = []
+            for start, display in pages:
+                if start > last_start[qi]:
+                    break
+                items.extend(results.get((qi, start), []))
+            merged.append(items)
+        if unique_key is None:
+            return [items[:max_results] for items in merged]
+
+        # 중복 제거 후 모자라면, 결과가 더 있는(마지막 페이지가 가득 찬) 질의만 다음 페이지를 한 번 더 요청
+        start, display = pages[-1]
+        extra_start = start + display
+        merged = [self._unique(items, unique_key) for items in merged]
+        extra = [qi for qi, items in enumerate(merged)
+                 if len(items) < max_results and extra_start <= MAX_START
+                 and last_start[qi] == start and len(results.get((qi, start), [])) >= display]
+        if extra:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(extra))) as executor:
+                futures = {qi: executor.submit(self.fetch_page, queries[qi], extra_start, display, sort)
+                           for qi in extra}
+            for qi, future in futures.items():
+                try:
+                    merged[qi] = self._unique(merged[qi] + future.result(), unique_key)
+                except (NaverAPIError, requests.RequestException, ValueError) as e:
+                    logger.warning(f"네이버 API 추가 페이지 요청 실패 ('{queries[qi]}', start={extra_start}): {e}")
+        return [items[:max_results] for items in merged]
+
+    @staticmethod
+    def _unique(items: List[Dict[str, Any]], unique_key: Callable[[Dict[str, Any]], str]) -> List[Dict[str, Any]]:
+        """처음 등장한 순서를 유지하며 중복 항목을 제거"""
+        seen = set()
+        unique = []
+        for item in items:
+            key = unique_key(item)
+            if key not in seen:
+                seen.add(key)
+                unique.append(item)
+        return unique
@@ -1,8 +1,24 @@
+import re
+
 import streamlit as st
-import time
-from utils.news_search import search_news_google_rss, search_news_naver_api
+from utils.news_search import (
+    STAGE_DEDUPE, STAGE_FETCH, STAGE_PARSE, search_news_google_rss, search_news_naver_api
+)
+from utils.search_cache import get_search_cache, search_cache_key
+
+# 상세 내용 한 페이지(탭)에 표시할 기사 수
+DETAIL_PAGE_SIZE = 20
+_MARKDOWN_SPECIAL_RE = re.compile(r"([\\`*_\[\]<>#|$~])")
 
-def search_news(keywords, search_method, naver_client_id=None, naver_client_secret=None, max_articles=15):
+# 진행 단계별 진행률 구간 (%)
+PROGRESS_RANGES = {
+    STAGE_FETCH: (0, 80),
+    STAGE_PARSE: (80, 95),
+    STAGE_DEDUPE: (95, 100),
+}
+
+def search_news(keywords, search_method, naver_client_id=None, naver_client_secret=None, max_articles=15,
+                naver_per_keyword=False, refresh=False):
     """
     키워드를 기반으로 뉴스를 검색하는 함수
     
@@ -12,46 +28,66 @@ def search_news(keywords, search_method, naver_client_id=None, naver_client_secr
     - naver_client_id: 네이버 API Client ID (네이버 API 사용 시 필요)
     - naver_client_secret: 네이버 API Client Secret (네이버 API 사용 시 필요)
     - max_articles: 최대 검색할 기사 수
+    - naver_per_keyword: 네이버 API 사용 시 키워드별로 따로 검색하여 합칠지 여부
+    - refresh: True면 캐시된 결과를 쓰지 않고 새로 검색
     
     Returns:
     - 검색된 뉴스 기사 목록
     """
-    # 검색 진행 상태 표시
+    # 같은 검색은 TTL 동안 캐시된 결과를 재사용 (Streamlit 재실행 시 API 재호출 방지)
+    cache = get_search_cache()
+    cache_key = search_cache_key(
+        keywords, search_method, max_articles,
+        per_keyword=naver_per_keyword if search_method != "구글 RSS" else False,
+        # 네이버 API 키가 없으면 샘플 데이터가 반환되므로 키 유무를 구분
+        naver_keys=bool(naver_client_id and naver_client_secret) if search_method != "구글 RSS" else False
+    )
+    if not refresh:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            st.caption(f"캐시된 검색 결과 사용 ({cache.age(cache_key):.0f}초 전 검색)")
+            return cached
+    
+    # 검색 진행 상태 표시 (검색 함수가 보고하는 실제 진행 상황으로 갱신)
     progress_bar = st.progress(0)
     status_text = st.empty()
-    
-    # 키워드 검색 시작
     status_text.text(f"'{keywords}' 키워드로 뉴스 검색 중...")
-    progress_bar.progress(10)
-    time.sleep(0.5)
+    
+    def on_progress(stage, done, total):
+        start, end = PROGRESS_RANGES[stage]
+        fraction = done / total if total else 1.0
+        if stage == STAGE_DEDUPE:
+            fraction = 1.0
+        progress_bar.progress(int(start + (end - start) * min(fraction, 1.0)))
+        if stage == STAGE_FETCH:
+            status_text.text(f"{source_label}에서 검색 중... ({done}/{total})")
+        elif stage == STAGE_PARSE:
+            status_text.text(f"검색 결과 {done}개 처리 중...")
+        else:
+            status_text.text(f"중복 제거 완료: {total}개 중 {done}개")
     
     try:
         # 검색 방법에 따라 다른 함수 호출
         if search_method == "구글 RSS":
-            status_text.text("구글 뉴스 RSS에서 검색 중...")
-            progress_bar.progress(30)
-            news_articles = search_news_google_rss(keywords)
+            source_label = "구글 뉴스 RSS"
+            news_articles = search_news_google_rss(
+                keywords, max_articles=max_articles, progress_callback=on_progress
+            )
         else:  # 네이버 API
-            status_text.text("네이버 뉴스 API에서 검색 중...")
-            progress_bar.progress(30)
+            source_label = "네이버 뉴스 API"
             news_articles = search_news_naver_api(
                 keywords, 
                 client_id=naver_client_id, 
-                client_secret=naver_client_secret
+                client_secret=naver_client_secret,
+                max_articles=max_articles,
+                per_keyword=naver_per_keyword,
+                progress_callback=on_progress
             )
         
         # 최대 기사 수 제한
         news_articles = news_articles[:max_articles]
-        
-        # 검색 결과 처리
-        progress_bar.progress(70)
-        status_text.text("검색 결과 처리 중...")
-        time.sleep(0.5)
-        
-        # 검색 완료
-        progress_bar.progress(100)
-        status_text.text(f"{len(news_articles)}개의 뉴스 기사를 찾았습니다.")
-        time.sleep(0.5)
+        if news_articles:
+            cache.put(cache_key, news_articles)
         
         # 상태 표시 제거
         status_text.empty()
@@ -66,12 +102,32 @@ def search_news(keywords, search_method, naver_client_id=None, naver_client_secr
         st.error(f"뉴스 검색 중 오류가 발생했습니다: {str(e)}")
         return []
 
-def display_news_articles(news_articles):
+def _escape_markdown(text):
+    """기사 제목/내용이 마크다운 링크나 강조로 해석되지 않도록 특수 문자 이스케이프"""
+    return _MARKDOWN_SPECIAL_RE.sub(r"\\\1", str(text or ""))
+
+
+def _format_article_details(articles, start):
+    """기사 상세 내용을 하나의 마크다운 문자열로 만드는 함수"""
+    blocks = []
+    for i, article in enumerate(articles, start=start + 1):
+        blocks.append(
+            f"**{i}. {_escape_markdown(article.title)}**  \n"
+            f"발행일: {article.published_label} · [기사 원문 보기]({article.link})  \n"
+            f"{_escape_markdown(article.description)}"
+        )
+    return "\n\n---\n\n".join(blocks)
+
+
+def display_news_articles(news_articles, page_size=DETAIL_PAGE_SIZE):
     """
     검색된 뉴스 기사를 화면에 표시하는 함수
+    목록은 하나의 표(dataframe)로, 상세 내용은 페이지마다 하나의 마크다운으로 묶어 표시하므로
+    기사 수가 늘어도 화면 요소 수는 페이지 수만큼만 늘어납니다.
     
     Parameters:
     - news_articles: 표시할 뉴스 기사 목록
+    - page_size: 상세 내용 한 페이지에 표시할 기사 수
     """
     if not news_articles:
         st.warning("표시할 뉴스 기사가 없습니다.")
@@ -79,43 +135,32 @@ def display_news_articles(news_articles):
     
     # 뉴스 기사 목록 표시
     with st.expander("📰 검색된 뉴스 목록", expanded=True):
-        # 테이블 형식으로 표시
-        st.markdown("""
-        <style>
-        .news-table {
-            width: 100%;
-            border-collapse: collapse;
-        }
-        .news-table th, .news-table td {
-            padding: 8px;
-            text-align: left;
-            border-bottom: 1px solid #ddd;
-        }
-        .news-table tr:hover {
-            background-color: #f5f5f5;
-        }
-        </style>
-        <table class="news-table">
-            <tr>
-                <th>제목</th>
-                <th>발행일</th>
-            </tr>
-        """, unsafe_allow_html=True)
-        
-        for article in news_articles:
-            st.markdown(f"""
-            <tr>
-                <td><a href="{article['link']}" target="_blank">{article['title']}</a></td>
-                <td>{article['published']}</td>
-            </tr>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("</table>", unsafe_allow_html=True)
+        # 표 형식으로 한 번에 표시
+        st.dataframe(
+            [
+                {
+                    "제목": article.title,
+                    "발행일": article.published_label,
+                    "링크": article.link,
+                }
+                for article in news_articles
+            ],
+            column_config={
+                "제목": st.column_config.TextColumn("제목", width="large"),
+                "발행일": st.column_config.TextColumn("발행일", width="medium"),
+                "링크": st.column_config.LinkColumn("링크", display_text="원문 보기", width="small"),
+            },
+            hide_index=True,
+            use_container_width=True,
+        )
         
-        # 상세 내용 표시
+        # 상세 내용 표시 (페이지 단위 탭, 탭 전환은 스크립트를 다시 실행하지 않음)
         st.markdown("### 기사 상세 내용")
-        for i, article in enumerate(news_articles):
-            with st.expander(f"{i+1}. {article['title']}"):
-                st.markdown(f"**발행일:** {article['published']}")
-                st.markdown(f"**링크:** [기사 원문 보기]({article['link']})")
-                st.markdown(f"**내용:** {article['description']}")
+        starts = list(range(0, len(news_articles), page_size))
+        if len(starts) == 1:
+            st.markdown(_format_article_details(news_articles, 0))
+            return
+        labels = [f"{start + 1}-{min(start + page_size, len(news_articles))}" for start in starts]
+        for tab, start in zip(st.tabs(labels), starts):
+            with tab:
+                st.markdown(_format_article_details(news_articles[start:start + page_size], start))
@@ -1,13 +1,31 @@
-import feedparser
 import requests
-from bs4 import BeautifulSoup
 import json
 from datetime import datetime
 import time
+from itertools import zip_longest
 
-def search_news_google_rss(keywords):
+from utils.article import Article
+from utils.dedupe import ArticleDeduper, canonicalize_url
+from utils.feed_cache import get_feed_cache
+from utils.feed_fetcher import fetch_feed
+from utils.naver_client import NaverAPIError, NaverNewsClient
+from utils.text_clean import strip_html
+
+# 진행 상황 보고 단계 (progress_callback(stage, done, total)으로 전달)
+STAGE_FETCH = "fetch"      # 피드/페이지 요청 완료 수
+STAGE_PARSE = "parse"      # 처리한 항목 수
+STAGE_DEDUPE = "dedupe"    # 중복 제거 후 남은 기사 수 / 처리한 항목 수
+
+
+def _report(progress_callback, stage, done, total):
+    if progress_callback:
+        progress_callback(stage, done, total)
+
+
+def search_news_google_rss(keywords, max_articles=15, progress_callback=None):
     """
     구글 RSS를 사용하여 뉴스 검색
+    progress_callback이 있으면 (단계, 완료 수, 전체 수)로 진행 상황을 보고합니다.
     """
     # 키워드 처리
     keywords_list = [keyword.strip() for keyword in keywords.split(',')]
@@ -16,78 +34,104 @@ def search_news_google_rss(keywords):
     # Google News RSS URL
     rss_url = f"https://news.google.com/rss/search?q={search_query}&hl=ko&gl=KR&ceid=KR:ko"
     
-    # RSS 피드 파싱
-    feed = feedparser.parse(rss_url)
+    # RSS 피드 요청 및 파싱 (ETag/Last-Modified 조건부 요청 캐시 사용)
+    feed = fetch_feed("Google News", rss_url, cache=get_feed_cache())
+    if feed.error and not feed.entries:
+        print(f"구글 RSS 오류: {feed.error}")
+    _report(progress_callback, STAGE_FETCH, 1, 1)
     
-    # 결과 처리
+    # 결과 처리 (정규화된 URL 기준 중복 제거)
     news_articles = []
-    for entry in feed.entries[:15]:  # 최대 15개 기사만 가져옴
-        article = {
-            'title': entry.title,
-            'link': entry.link,
-            'published': entry.published,
-            'description': entry.get('description', '내용 없음')
-        }
-        news_articles.append(article)
+    deduper = ArticleDeduper()
+    parsed = 0
+    for entry in feed.entries:
+        if len(news_articles) >= max_articles:
+            break
+        parsed += 1
+        article = Article(
+            title=entry['title'],
+            link=entry['link'],
+            description=entry['description'] or '내용 없음',
+            published=entry['published'],
+            published_ts=entry['published_ts'],
+            source='Google News',
+        )
+        if deduper.add(article):
+            news_articles.append(article)
+    _report(progress_callback, STAGE_PARSE, parsed, parsed)
+    _report(progress_callback, STAGE_DEDUPE, len(news_articles), parsed)
     
     return news_articles
 
-def search_news_naver_api(keywords, client_id=None, client_secret=None):
+def search_news_naver_api(keywords, client_id=None, client_secret=None, max_articles=15, per_keyword=False,
+                          progress_callback=None, sample_fallback=True):
     """
     네이버 검색 API를 사용하여 뉴스 검색
     실제 사용 시에는 client_id와 client_secret이 필요합니다.
+
+    Parameters:
+    - keywords: 검색할 키워드 (쉼표로 구분된 문자열)
+    - client_id / client_secret: 네이버 API 인증 정보
+    - max_articles: 최대 기사 수 (100개를 넘으면 여러 페이지를 동시에 요청)
+    - per_keyword: True면 키워드마다 따로 검색한 뒤 결과를 번갈아 합침
+    - progress_callback: (단계, 완료 수, 전체 수)를 받는 진행 상황 보고 함수 (페이지마다 호출)
+    - sample_fallback: True면 인증 정보가 없거나 API 오류일 때 데모용 샘플 기사를 반환 (화면용),
+                       False면 NaverAPIError/requests 예외를 그대로 전달 (배치 등 화면 없는 실행용)
     """
     # 네이버 API 키가 없는 경우 샘플 데이터 반환 (데모용)
     if not client_id or not client_secret:
-        return _get_sample_naver_news(keywords)
+        if not sample_fallback:
+            raise NaverAPIError("네이버 API 인증 정보(NAVER_CLIENT_ID/NAVER_CLIENT_SECRET)가 없습니다")
+        return _get_sample_naver_news(keywords, progress_callback)
     
     # 키워드 처리
-    keywords_list = [keyword.strip() for keyword in keywords.split(',')]
-    search_query = ' '.join(keywords_list)
-    
-    # 네이버 검색 API URL
-    url = "https://openapi.naver.com/v1/search/news.json"
-    
-    # 헤더 설정
-    headers = {
-        "X-Naver-Client-Id": client_id,
-        "X-Naver-Client-Secret": client_secret
-    }
+    keywords_list = [keyword.strip() for keyword in keywords.split(',') if keyword.strip()]
+    queries = keywords_list if per_keyword and len(keywords_list) > 1 else [' '.join(keywords_list)]
     
-    # 파라미터 설정
-    params = {
-        "query": search_query,
-        "display": 15,  # 최대 15개 기사
-        "sort": "date"  # 최신순 정렬
-    }
+    # API 요청 (공유 세션, 페이지/키워드별 동시 요청)
+    # 원문 링크 기준으로 중복을 먼저 제거한 뒤 자르므로 중복 때문에 기사 수가 max_articles보다 줄지 않음
+    client = NaverNewsClient(client_id, client_secret)
+    try:
+        results = client.search_many(
+            queries, max_articles,
+            on_page=lambda done, total: _report(progress_callback, STAGE_FETCH, done, total),
+            unique_key=lambda item: canonicalize_url(item.get('originallink') or item['link'])
+        )
+    except (NaverAPIError, requests.RequestException) as e:
+        if not sample_fallback:
+            raise
+        print(f"네이버 API 오류: {e}")
+        return _get_sample_naver_news(keywords, progress_callback)  # 오류 시 샘플 데이터 반환
     
-    # API 요청
-    response = requests.get(url, headers=headers, params=params)
+    # 키워드별 결과를 번갈아 합쳐 한 키워드가 결과를 독점하지 않도록 함
+    merged = [item for group in zip_longest(*results) for item in group if item is not None]
     
     # 결과 처리
-    if response.status_code == 200:
-        result = response.json()
-        news_articles = []
-        
-        for item in result.get('items', []):
-            # HTML 태그 제거
-            title = BeautifulSoup(item['title'], 'html.parser').get_text()
-            description = BeautifulSoup(item['description'], 'html.parser').get_text()
-            
-            article = {
-                'title': title,
-                'link': item['link'],
-                'published': item['pubDate'],
-                'description': description
-            }
+    news_articles = []
+    deduper = ArticleDeduper()
+    parsed = 0
+    for item in merged:
+        if len(news_articles) >= max_articles:
+            break
+        parsed += 1
+        # HTML 태그/엔티티 제거
+        article = Article(
+            title=strip_html(item['title']),
+            link=item['link'],
+            description=strip_html(item['description']),
+            published=item['pubDate'],
+            source='Naver News',
+            original_link=item.get('originallink') or '',
+        )
+        # 원문 링크가 있으면 원문 기준으로 중복 판별
+        if deduper.add(article, link=article.dedupe_link):
             news_articles.append(article)
-        
-        return news_articles
-    else:
-        print(f"네이버 API 오류: {response.status_code}")
-        return _get_sample_naver_news(keywords)  # 오류 시 샘플 데이터 반환
+    _report(progress_callback, STAGE_PARSE, parsed, parsed)
+    _report(progress_callback, STAGE_DEDUPE, len(news_articles), parsed)
+    
+    return news_articles
 
-def _get_sample_naver_news(keywords):
+def _get_sample_naver_news(keywords, progress_callback=None):
     """
     네이버 API 키가 없는 경우 사용할 샘플 데이터 생성 (데모용)
     """
@@ -101,11 +145,15 @@ def _get_sample_naver_news(keywords):
     sample_news = []
     for i in range(10):
         keyword = keywords_list[i % len(keywords_list)]
-        sample_news.append({
-            'title': f"{keyword}에 관한 최신 뉴스 {i+1}",
-            'link': f"https://example.com/news/{i}",
-            'published': now,
-            'description': f"{keyword}에 관한 최신 동향과 분석을 담은 뉴스 기사입니다. 이것은 데모용 샘플 데이터입니다."
-        })
+        sample_news.append(Article(
+            title=f"{keyword}에 관한 최신 뉴스 {i+1}",
+            link=f"https://example.com/news/{i}",
+            description=f"{keyword}에 관한 최신 동향과 분석을 담은 뉴스 기사입니다. 이것은 데모용 샘플 데이터입니다.",
+            published=now,
+            source='Sample',
+        ))
     
+    _report(progress_callback, STAGE_FETCH, 1, 1)
+    _report(progress_callback, STAGE_PARSE, len(sample_news), len(sample_news))
+    _report(progress_callback, STAGE_DEDUPE, len(sample_news), len(sample_news))
     return sample_news
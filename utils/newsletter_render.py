@@ -0,0 +1,407 @@
+import hashlib
+import html
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+# 메모리에 보관할 렌더링 결과 수
+RENDER_CACHE_SIZE = 32
+
+# 이메일 클라이언트는 <style>을 무시하는 경우가 많아 태그마다 style 속성으로 넣음
+INLINE_STYLES = {
+    "h1": "font-size:26px;line-height:1.3;color:#2c3e50;margin:0 0 16px;",
+    "h2": "font-size:21px;line-height:1.3;color:#34495e;margin:28px 0 12px;",
+    "h3": "font-size:17px;line-height:1.3;color:#34495e;margin:20px 0 8px;",
+    "h4": "font-size:15px;color:#34495e;margin:16px 0 8px;",
+    "h5": "font-size:14px;color:#34495e;margin:16px 0 8px;",
+    "h6": "font-size:13px;color:#34495e;margin:16px 0 8px;",
+    "p": "margin:0 0 14px;",
+    "a": "color:#3498db;text-decoration:underline;",
+    "ul": "margin:0 0 14px;padding-left:22px;",
+    "ol": "margin:0 0 14px;padding-left:22px;",
+    "li": "margin:0 0 6px;",
+    "blockquote": "margin:0 0 14px;padding-left:12px;border-left:3px solid #ddd;color:#555;",
+    "hr": "border:0;border-top:1px solid #eee;margin:24px 0;",
+    "code": "font-family:Consolas,monospace;font-size:13px;background:#f5f5f5;padding:1px 4px;",
+    "pre": "font-family:Consolas,monospace;font-size:13px;background:#f5f5f5;padding:12px;white-space:pre-wrap;",
+    "table": "border-collapse:collapse;width:100%;margin:0 0 14px;",
+    "th": "border-bottom:2px solid #ddd;padding:6px;text-align:left;",
+    "td": "border-bottom:1px solid #eee;padding:6px;",
+}
+DOCUMENT_TEMPLATE = (
+    '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8">'
+    '<meta name="viewport" content="width=device-width,initial-scale=1"><title>{title}</title></head>'
+    '<body style="margin:0;padding:0;background:#f4f4f4;">'
+    '<div style="max-width:680px;margin:0 auto;padding:24px;background:#ffffff;'
+    'font-family:\'Apple SD Gothic Neo\',\'Malgun Gothic\',Arial,sans-serif;'
+    'font-size:15px;line-height:1.6;color:#333333;">{body}</div></body></html>'
+)
+
+_ALLOWED_TAGS = set(INLINE_STYLES) | {"br", "strong", "b", "em", "i", "span", "div", "thead", "tbody", "tr"}
+_VOID_TAGS = {"br", "hr"}
+# 내용까지 버릴 태그
+_DROP_TAGS = {"script", "style", "head", "title", "iframe", "object", "embed", "noscript", "svg"}
+_BLOCK_TAGS = {"p", "div", "ul", "ol", "blockquote", "pre", "table", "tr", "h1", "h2", "h3", "h4", "h5", "h6"}
+_SAFE_URL_RE = re.compile(r"^(https?:|mailto:)", re.IGNORECASE)
+_CODE_FENCE_RE = re.compile(r"^\s*```[a-zA-Z]*\s*\n(.*?)\n?```\s*$", re.DOTALL)
+
+
+@dataclass(frozen=True)
+class RenderedIssue:
+    """한 호의 뉴스레터를 한 번 렌더링한 결과 (모든 수신자/다운로드에 재사용)"""
+    issue_id: str
+    subject: str
+    html: str
+    text: str
+    markdown: str
+    source_hash: str
+
+
+# --- 마크다운 -> HTML ---
+
+_INLINE_CODE_RE = re.compile(r"`([^`]+)`")
+_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+_BOLD_RE = re.compile(r"\*\*(.+?)\*\*|__(.+?)__")
+_ITALIC_RE = re.compile(r"(?<!\*)\*(?![\s*])(.+?)(?<![\s*])\*(?!\*)")
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_HR_RE = re.compile(r"^\s*(?:-{3,}|\*{3,}|_{3,})\s*$")
+_UL_RE = re.compile(r"^\s*[-*+]\s+(.*)$")
+_OL_RE = re.compile(r"^\s*\d+[.)]\s+(.*)$")
+_QUOTE_RE = re.compile(r"^\s*>\s?(.*)$")
+
+
+def _render_inline(text: str) -> str:
+    """인라인 마크다운(코드, 링크, 굵게, 기울임)을 HTML로 변환 (HTML 특수 문자는 이스케이프)"""
+    codes = []
+
+    def keep_code(match):
+        codes.append(f"<code>{match.group(1)}</code>")
+        return f"\x00{len(codes) - 1}\x00"
+
+    text = html.escape(text, quote=False)
+    text = _INLINE_CODE_RE.sub(keep_code, text)
+    text = _LINK_RE.sub(lambda m: f'<a href="{m.group(2).replace(chr(34), "%22")}">{m.group(1)}</a>', text)
+    text = _BOLD_RE.sub(lambda m: f"<strong>{m.group(1) or m.group(2)}</strong>", text)
+    text = _ITALIC_RE.sub(r"<em>\1</em>", text)
+    return re.sub("\x00(\\d+)\x00", lambda m: codes[int(m.group(1))], text)
+
+
+def markdown_to_html(markdown: str) -> str:
+    """
+    뉴스레터에 쓰이는 마크다운 문법(제목, 문단, 목록, 인용, 구분선, 코드, 링크, 강조)을 HTML로 변환하는 함수
+    원문에 섞인 HTML 태그는 텍스트로 이스케이프됩니다.
+    """
+    out: List[str] = []
+    paragraph: List[str] = []
+    list_tag: Optional[str] = None
+    quote: List[str] = []
+    lines = (markdown or "").replace("\r\n", "\n").split("\n")
+
+    def flush():
+        nonlocal list_tag
+        if paragraph:
+            out.append("<p>" + " ".join(paragraph) + "</p>")
+            paragraph.clear()
+        if list_tag:
+            out.append(f"</{list_tag}>")
+            list_tag = None
+        if quote:
+            out.append("<blockquote><p>" + "<br>".join(quote) + "</p></blockquote>")
+            quote.clear()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        i += 1
+        if stripped.startswith("```"):
+            flush()
+            code = []
+            while i < len(lines) and not lines[i].strip().startswith("```"):
+                code.append(lines[i])
+                i += 1
+            i += 1
+            out.append("<pre><code>" + html.escape("\n".join(code), quote=False) + "</code></pre>")
+            continue
+        if not stripped:
+            flush()
+            continue
+        heading = _HEADING_RE.match(stripped)
+        if heading:
+            flush()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{_render_inline(heading.group(2))}</h{level}>")
+            continue
+        if _HR_RE.match(stripped):
+            flush()
+            out.append("<hr>")
+            continue
+        item = _UL_RE.match(line) or _OL_RE.match(line)
+        if item:
+            tag = "ul" if _UL_RE.match(line) else "ol"
+            if list_tag != tag:
+                flush()
+                out.append(f"<{tag}>")
+                list_tag = tag
+            out.append(f"<li>{_render_inline(item.group(1).strip())}</li>")
+            continue
+        quoted = _QUOTE_RE.match(line)
+        if quoted:
+            if not quote:
+                flush()
+            quote.append(_render_inline(quoted.group(1).strip()))
+            continue
+        if list_tag or quote:
+            flush()
+        # 줄 끝 공백 두 칸은 줄바꿈
+        rendered = _render_inline(stripped)
+        paragraph.append(rendered + "<br>" if line.endswith("  ") else rendered)
+    flush()
+    return "\n".join(out)
+
+
+# --- HTML 정리 + 인라인 CSS + 텍스트/마크다운 변환 (한 번의 파싱) ---
+
+class _IssueCompiler(HTMLParser):
+    """
+    HTML을 한 번 훑으면서 세 가지 결과를 동시에 만드는 파서
+    - 허용된 태그/속성만 남기고 태그마다 인라인 CSS를 넣은 HTML
+    - 이메일 대체 본문용 텍스트
+    - 마크다운
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.html: List[str] = []
+        self.text: List[str] = []
+        self.markdown: List[str] = []
+        self._open: List[str] = []
+        self._drop_depth = 0
+        self._links: List[Tuple[str, int]] = []   # (안전한 href, 링크 시작 시점의 텍스트 조각 수)
+        self._lists: List[List] = []              # [태그, 항목 번호]
+        self._pre = 0
+
+    # 출력 도우미
+    def _block(self, text_sep: str = "\n\n", md_sep: str = "\n\n"):
+        self.text.append(text_sep)
+        self.markdown.append(md_sep)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _DROP_TAGS:
+            self._drop_depth += 1
+            return
+        if self._drop_depth or tag not in _ALLOWED_TAGS:
+            return
+        attrs = dict(attrs)
+        attr_html = ""
+        style = INLINE_STYLES.get(tag)
+        if tag == "a":
+            href = (attrs.get("href") or "").strip()
+            if not _SAFE_URL_RE.match(href):
+                href = ""
+            if href:
+                attr_html += f' href="{html.escape(href)}" target="_blank"'
+            self._links.append((href, len(self.text)))
+            if href:
+                self.markdown.append("[")
+        if style:
+            attr_html += f' style="{style}"'
+        self.html.append(f"<{tag}{attr_html}>")
+        if tag not in _VOID_TAGS:
+            self._open.append(tag)
+
+        if tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            self._block()
+            self.markdown.append("#" * int(tag[1]) + " ")
+        elif tag in ("ul", "ol"):
+            self._lists.append([tag, 0])
+            self._block("\n", "\n")
+        elif tag == "li":
+            prefix = "- "
+            if self._lists and self._lists[-1][0] == "ol":
+                self._lists[-1][1] += 1
+                prefix = f"{self._lists[-1][1]}. "
+            indent = "  " * max(0, len(self._lists) - 1)
+            self.text.append(f"\n{indent}{prefix}")
+            self.markdown.append(f"\n{indent}{prefix}")
+        elif tag == "br":
+            self.text.append("\n")
+            self.markdown.append("  \n")
+        elif tag == "hr":
+            self._block("\n\n" + "-" * 40 + "\n\n", "\n\n---\n\n")
+        elif tag == "blockquote":
+            self._block()
+            self.markdown.append("> ")
+        elif tag == "pre":
+            self._pre += 1
+            self._block("\n\n", "\n\n```\n")
+        elif tag in ("strong", "b"):
+            self.markdown.append("**")
+        elif tag in ("em", "i"):
+            self.markdown.append("*")
+        elif tag == "code" and not self._pre:
+            self.markdown.append("`")
+        elif tag in _BLOCK_TAGS:
+            self._block()
+        elif tag in ("td", "th"):
+            self.text.append(" ")
+            self.markdown.append(" ")
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in _DROP_TAGS:
+            self._drop_depth = max(0, self._drop_depth - 1)
+            return
+        if self._drop_depth or tag not in self._open:
+            return
+        # 닫히지 않은 안쪽 태그까지 함께 닫음
+        while self._open:
+            inner = self._open.pop()
+            self.html.append(f"</{inner}>")
+            self._close_markup(inner)
+            if inner == tag:
+                break
+
+    def _close_markup(self, tag):
+        if tag == "a" and self._links:
+            href, start = self._links.pop()
+            label = "".join(self.text[start:]).strip()
+            if href:
+                self.markdown.append(f"]({href})")
+            if href and href != label:
+                self.text.append(f" ({href})")
+        elif tag in ("ul", "ol"):
+            if self._lists:
+                self._lists.pop()
+            self._block("\n", "\n")
+        elif tag == "pre":
+            self._pre = max(0, self._pre - 1)
+            self._block("\n\n", "\n```\n\n")
+        elif tag in ("strong", "b"):
+            self.markdown.append("**")
+        elif tag in ("em", "i"):
+            self.markdown.append("*")
+        elif tag == "code" and not self._pre:
+            self.markdown.append("`")
+        elif tag in _BLOCK_TAGS:
+            self._block()
+        elif tag == "tr":
+            self._block("\n", "\n")
+
+    def handle_data(self, data):
+        if self._drop_depth:
+            return
+        self.html.append(html.escape(data, quote=False))
+        if not self._pre:
+            data = re.sub(r"\s+", " ", data)
+            # 줄바꿈 직후의 공백은 버림
+            if self.text and self.text[-1].endswith("\n"):
+                data = data.lstrip()
+        self.text.append(data)
+        self.markdown.append(data)
+
+    def finish(self) -> Tuple[str, str, str]:
+        self.close()
+        while self._open:
+            self.handle_endtag(self._open[-1])
+        return "".join(self.html), _tidy_text("".join(self.text)), _tidy_text("".join(self.markdown))
+
+
+def _tidy_text(text: str) -> str:
+    """줄 끝 공백(마크다운 줄바꿈 제외)과 연속된 빈 줄 정리"""
+    lines = []
+    for line in text.split("\n"):
+        hard_break = line.endswith("  ") and line.strip()
+        line = line.rstrip()
+        lines.append(line + "  " if hard_break else line)
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def compile_html(content_html: str) -> Tuple[str, str, str]:
+    """
+    HTML을 정리하여 (인라인 CSS가 들어간 안전한 HTML 본문, 텍스트, 마크다운)을 반환하는 함수
+    스크립트/스타일/이벤트 속성/위험한 링크는 제거됩니다.
+    """
+    compiler = _IssueCompiler()
+    compiler.feed(content_html or "")
+    return compiler.finish()
+
+
+def _strip_code_fence(text: str) -> str:
+    """LLM이 ```html ... ``` 코드 블록으로 감싼 출력을 벗겨냄"""
+    match = _CODE_FENCE_RE.match(text or "")
+    return match.group(1) if match else (text or "")
+
+
+# --- 렌더링 결과 캐시 ---
+
+_cache_lock = threading.Lock()
+_render_cache: "OrderedDict[str, RenderedIssue]" = OrderedDict()
+
+
+def make_issue_id(*parts: str) -> str:
+    """뉴스레터 내용으로 호 ID를 만드는 함수"""
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def get_rendered_issue(issue_id: str) -> Optional[RenderedIssue]:
+    """캐시된 렌더링 결과를 반환 (없으면 None)"""
+    with _cache_lock:
+        issue = _render_cache.get(issue_id)
+        if issue is not None:
+            _render_cache.move_to_end(issue_id)
+        return issue
+
+
+def render_issue(issue_id: str, subject: str, markdown: Optional[str] = None,
+                 html_content: Optional[str] = None) -> RenderedIssue:
+    """
+    뉴스레터 한 호를 HTML(인라인 CSS)/텍스트/마크다운으로 한 번 렌더링하고 호 ID로 캐시하는 함수
+    같은 호 ID와 같은 원문이면 다시 렌더링하지 않고 캐시된 결과를 돌려줍니다.
+
+    Parameters:
+    - issue_id: 호 ID (예: make_issue_id(원문))
+    - subject: 이메일 제목 / HTML 문서 제목
+    - markdown: 마크다운 원문 (Streamlit 앱)
+    - html_content: HTML 원문 (HTML로 작성하는 LLM 출력, markdown이 없을 때 사용)
+    """
+    source = markdown if markdown is not None else _strip_code_fence(html_content)
+    source_hash = make_issue_id(subject, "md" if markdown is not None else "html", source)
+    cached = get_rendered_issue(issue_id)
+    if cached is not None and cached.source_hash == source_hash:
+        return cached
+
+    if markdown is not None:
+        body, text, _ = compile_html(markdown_to_html(markdown))
+        markdown_out = markdown.strip()
+    else:
+        body, text, markdown_out = compile_html(source)
+    document = DOCUMENT_TEMPLATE.format(title=html.escape(subject), body=body)
+    issue = RenderedIssue(issue_id=issue_id, subject=subject, html=document, text=text,
+                          markdown=markdown_out, source_hash=source_hash)
+
+    with _cache_lock:
+        _render_cache[issue_id] = issue
+        _render_cache.move_to_end(issue_id)
+        while len(_render_cache) > RENDER_CACHE_SIZE:
+            _render_cache.popitem(last=False)
+    return issue
+
+
+def clear_render_cache() -> None:
+    """렌더링 결과 캐시 삭제"""
+    with _cache_lock:
+        _render_cache.clear()
+
+
+def render_cache_info() -> Dict[str, int]:
+    """렌더링 결과 캐시 상태"""
+    with _cache_lock:
+        return {"size": len(_render_cache), "max_size": RENDER_CACHE_SIZE}
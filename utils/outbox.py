@@ -0,0 +1,403 @@
+import hashlib
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from utils.email_delivery import (
+    DEFAULT_MAX_MESSAGES_PER_CONNECTION, SMTPConfig, SMTPConnection, build_message, is_auth_error,
+    is_transient_error
+)
+from utils.storage import get_data_path
+
+logger = logging.getLogger(__name__)
+
+# 기본 재시도 설정
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "6"))
+DEFAULT_BASE_DELAY = float(os.getenv("OUTBOX_BASE_DELAY", "30"))       # 첫 재시도 대기 시간 (초, 2배씩 증가)
+DEFAULT_MAX_DELAY = float(os.getenv("OUTBOX_MAX_DELAY", "3600"))       # 재시도 대기 시간 상한 (초)
+DEFAULT_LEASE = 300.0           # 꺼내 간 메시지를 다른 작업자가 다시 가져갈 수 있게 되는 시간 (초)
+DEFAULT_POLL_INTERVAL = 5.0     # 보낼 메시지가 없을 때 다시 확인하는 간격 (초)
+DEFAULT_AUTH_PAUSE = float(os.getenv("OUTBOX_AUTH_PAUSE", "900"))      # 로그인 실패 후 발송을 멈추는 시간 (초)
+
+STATUS_PENDING = "pending"
+STATUS_SENDING = "sending"
+STATUS_SENT = "sent"
+STATUS_DEAD = "dead"
+
+_default_outbox = None
+_default_outbox_lock = threading.Lock()
+
+
+def make_idempotency_key(issue_id: str, recipient: str) -> str:
+    """같은 호(issue)를 같은 수신자에게 두 번 보내지 않도록 하는 키"""
+    raw = f"{issue_id}\n{recipient.strip().lower()}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class OutboxMessage:
+    """발송 대기열의 메시지 하나"""
+    id: int
+    idempotency_key: str
+    recipient: str
+    subject: str
+    text_body: Optional[str]
+    html_body: Optional[str]
+    attempts: int
+
+
+def _check_header_value(name: str, value: str) -> None:
+    """메일 헤더로 쓸 값 검사 (줄바꿈이 있으면 헤더 주입이 되고 build_message도 실패하므로 거부)"""
+    if not value or not value.strip():
+        raise ValueError(f"{name} 값이 비어 있습니다")
+    if "\r" in value or "\n" in value:
+        raise ValueError(f"{name} 값에 줄바꿈을 넣을 수 없습니다: {value!r}")
+
+
+class Outbox:
+    """
+    SQLite에 저장되는 이메일 발송 대기열(outbox)
+
+    생성 단계는 메시지를 대기열에 넣기만 하고, 작업자(OutboxWorker)가 따로 꺼내 발송합니다.
+    - 멱등 키: 같은 키의 메시지는 한 번만 들어가므로 다시 실행해도 이미 보낸 수신자에게 재발송하지 않음
+    - 재시도: 일시적 오류는 지수 백오프(지터 포함)로 다시 시도
+    - 데드 레터: 영구 오류이거나 최대 시도 횟수를 넘으면 'dead' 상태로 보관
+    - 임대(lease): 발송 중 프로세스가 죽어도 임대 시간이 지나면 다른 작업자가 다시 가져감
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY,
+                 lease: float = DEFAULT_LEASE):
+        self.path = path or get_data_path("outbox.sqlite3")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease = lease
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                idempotency_key TEXT NOT NULL UNIQUE,
+                recipient TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                text_body TEXT,
+                html_body TEXT,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at)")
+        self._conn.commit()
+
+    def enqueue(self, recipient: str, subject: str, text: Optional[str] = None,
+                html: Optional[str] = None, idempotency_key: Optional[str] = None) -> bool:
+        """
+        메시지를 대기열에 추가하는 함수
+
+        Returns:
+        - 새로 추가되었으면 True (같은 멱등 키가 이미 있으면 False)
+
+        Raises:
+        - ValueError: 수신자나 제목이 비어 있거나 줄바꿈을 포함한 경우
+        """
+        _check_header_value("recipient", recipient)
+        _check_header_value("subject", subject)
+        key = idempotency_key or make_idempotency_key(f"{subject}\n{text or ''}\n{html or ''}", recipient)
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO outbox (idempotency_key, recipient, subject, text_body, html_body, "
+                "status, attempts, next_attempt_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?, ?)",
+                (key, recipient.strip(), subject, text, html, STATUS_PENDING, now, now, now)
+            )
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+    def enqueue_newsletter(self, issue_id: str, recipients: Iterable[str], subject: str,
+                           text: Optional[str] = None, html: Optional[str] = None) -> int:
+        """
+        한 호의 뉴스레터를 수신자별 메시지로 대기열에 넣고 새로 추가된 수를 반환하는 함수
+        제목이 잘못되었으면 ValueError, 헤더로 쓸 수 없는 수신자 주소는 경고만 남기고 건너뜁니다.
+        """
+        _check_header_value("subject", subject)
+        added = 0
+        for recipient in recipients:
+            if not recipient or not recipient.strip():
+                continue
+            try:
+                added += self.enqueue(recipient, subject, text, html,
+                                      idempotency_key=make_idempotency_key(issue_id, recipient))
+            except ValueError as e:
+                logger.warning(f"수신자를 대기열에 넣지 않았습니다: {e}")
+        return added
+
+    def claim(self, limit: int = 50) -> List[OutboxMessage]:
+        """발송할 때가 된 메시지를 최대 limit개 꺼내 임대 상태로 바꾸는 함수"""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, idempotency_key, recipient, subject, text_body, html_body, attempts FROM outbox "
+                "WHERE status IN (?, ?) AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                (STATUS_PENDING, STATUS_SENDING, now, limit)
+            ).fetchall()
+            if rows:
+                self._conn.executemany(
+                    "UPDATE outbox SET status = ?, next_attempt_at = ?, updated_at = ? WHERE id = ?",
+                    [(STATUS_SENDING, now + self.lease, now, row[0]) for row in rows]
+                )
+                self._conn.commit()
+        return [OutboxMessage(*row) for row in rows]
+
+    def mark_sent(self, message_id: int) -> None:
+        """발송 성공 기록"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = NULL, updated_at = ? "
+                "WHERE id = ?",
+                (STATUS_SENT, now, message_id)
+            )
+            self._conn.commit()
+
+    def mark_failed(self, message: OutboxMessage, error: str, transient: bool = True) -> str:
+        """
+        발송 실패 기록 (일시적 오류는 백오프 후 재시도, 그 외에는 데드 레터)
+
+        Returns:
+        - 바뀐 상태 ('pending' 또는 'dead')
+        """
+        attempts = message.attempts + 1
+        now = time.time()
+        if transient and attempts < self.max_attempts:
+            delay = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+            status, next_attempt_at = STATUS_PENDING, now + delay * random.uniform(0.8, 1.2)
+        else:
+            status, next_attempt_at = STATUS_DEAD, now
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, updated_at = ? "
+                "WHERE id = ?",
+                (status, attempts, next_attempt_at, error[:1000], now, message.id)
+            )
+            self._conn.commit()
+        return status
+
+    def release(self, messages: Iterable[OutboxMessage], delay: float = 0.0) -> None:
+        """꺼내 간 메시지를 시도 횟수를 늘리지 않고 발송 대기 상태로 되돌리는 함수"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE outbox SET status = ?, next_attempt_at = ?, updated_at = ? WHERE id = ? AND status = ?",
+                [(STATUS_PENDING, now + delay, now, message.id, STATUS_SENDING) for message in messages]
+            )
+            self._conn.commit()
+
+    def has_due(self) -> bool:
+        """지금 발송할 메시지가 있는지"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM outbox WHERE status IN (?, ?) AND next_attempt_at <= ? LIMIT 1",
+                (STATUS_PENDING, STATUS_SENDING, time.time())
+            ).fetchone()
+        return row is not None
+
+    def requeue_dead(self) -> int:
+        """데드 레터 메시지를 다시 발송 대기 상태로 되돌리는 함수"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = 0, next_attempt_at = ?, updated_at = ? WHERE status = ?",
+                (STATUS_PENDING, now, now, STATUS_DEAD)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def purge_sent(self, older_than: float = 30 * 24 * 60 * 60) -> int:
+        """오래된 발송 완료 기록 삭제 (멱등 키도 함께 사라지므로 보관 기간은 넉넉히)"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM outbox WHERE status = ? AND updated_at < ?",
+                (STATUS_SENT, time.time() - older_than)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """상태별 메시지 수"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        counts = {STATUS_PENDING: 0, STATUS_SENDING: 0, STATUS_SENT: 0, STATUS_DEAD: 0}
+        counts.update(dict(rows))
+        return counts
+
+
+def get_outbox() -> Outbox:
+    """프로세스 전체에서 공유하는 기본 발송 대기열을 반환하는 함수 (처음 호출할 때 DB를 엶)"""
+    global _default_outbox
+    with _default_outbox_lock:
+        if _default_outbox is None:
+            _default_outbox = Outbox()
+        return _default_outbox
+
+
+class OutboxWorker:
+    """
+    대기열을 비우는 백그라운드 발송 작업자
+
+    스레드마다 SMTP 연결 하나를 재사용하며 발송할 때가 된 메시지를 묶음으로 꺼내 보냅니다.
+    로그인에 실패하면 메시지마다 백오프하지 않고 꺼낸 메시지를 되돌린 뒤 작업자 전체를 auth_pause초 동안 멈춥니다
+    (설정 문제이므로 재시도해도 실패하고, 로그인을 반복하면 계정이 잠길 수 있음). resume()으로 바로 재개할 수 있습니다.
+
+    Parameters:
+    - outbox: 발송 대기열
+    - config: SMTP 서버 설정
+    - threads: 동시 발송 스레드(연결) 수
+    - batch_size: 한 번에 꺼낼 메시지 수
+    - poll_interval: 보낼 메시지가 없을 때 다시 확인하는 간격 (초)
+    - auth_pause: 로그인 실패 후 발송을 멈추는 시간 (초)
+    """
+
+    def __init__(self, outbox: Outbox, config: SMTPConfig, threads: int = 2, batch_size: int = 20,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 max_messages_per_connection: int = DEFAULT_MAX_MESSAGES_PER_CONNECTION,
+                 auth_pause: float = DEFAULT_AUTH_PAUSE):
+        self.outbox = outbox
+        self.config = config
+        self.threads = max(1, threads)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_messages_per_connection = max_messages_per_connection
+        self.auth_pause = auth_pause
+        self._paused_until = 0.0
+        self._pause_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def paused(self) -> bool:
+        """로그인 실패로 발송을 멈춘 상태인지"""
+        return time.time() < self._paused_until
+
+    def _pause(self, error: Exception) -> None:
+        with self._pause_lock:
+            if self.paused:
+                return
+            self._paused_until = time.time() + self.auth_pause
+        logger.error(f"SMTP 로그인 실패, {self.auth_pause:.0f}초 동안 발송을 멈춥니다 "
+                     f"(설정 확인 후 resume()으로 재개): {error}")
+
+    def resume(self) -> None:
+        """멈춘 발송을 바로 재개하는 함수 (SMTP 설정을 고친 뒤 호출)"""
+        with self._pause_lock:
+            self._paused_until = 0.0
+        self._wake.set()
+
+    def _process(self, connection: SMTPConnection, messages: List[OutboxMessage]) -> int:
+        sender = self.config.sender or self.config.username
+        sent = 0
+        for i, message in enumerate(messages):
+            try:
+                msg = build_message(sender, message.recipient, message.subject,
+                                    text=message.text_body, html=message.html_body)
+            except Exception as e:
+                # 메시지를 만들 수 없으면 재시도해도 같으므로 바로 데드 레터 (나머지 메시지는 계속 발송)
+                self.outbox.mark_failed(message, str(e) or type(e).__name__, transient=False)
+                logger.error(f"'{message.recipient}' 메시지 생성 실패 ({STATUS_DEAD}): {e}")
+                continue
+            try:
+                connection.send(msg)
+            except Exception as e:
+                if is_auth_error(e):
+                    # 로그인 실패는 메시지 문제가 아니므로 시도 횟수를 늘리지 않고 되돌린 뒤 작업자 전체를 멈춤
+                    self._pause(e)
+                    self.outbox.release(messages[i:], delay=self.auth_pause)
+                    connection.close(quit=False)
+                    break
+                status = self.outbox.mark_failed(message, str(e), transient=is_transient_error(e))
+                log = logger.error if status == STATUS_DEAD else logger.warning
+                log(f"'{message.recipient}' 발송 실패 ({message.attempts + 1}회차, {status}): {e}")
+                continue
+            self.outbox.mark_sent(message.id)
+            sent += 1
+        return sent
+
+    def run_once(self, connection: Optional[SMTPConnection] = None) -> int:
+        """발송할 때가 된 메시지를 한 묶음 보내고 성공 수를 반환하는 함수 (멈춘 상태면 0)"""
+        if self.paused:
+            return 0
+        messages = self.outbox.claim(self.batch_size)
+        if not messages:
+            return 0
+        own_connection = connection is None
+        connection = connection or SMTPConnection(self.config, self.max_messages_per_connection)
+        try:
+            return self._process(connection, messages)
+        finally:
+            if own_connection:
+                connection.close()
+
+    def drain(self) -> int:
+        """지금 발송할 수 있는 메시지를 모두 보낼 때까지 처리하는 함수 (백오프 대기 중인 메시지는 제외)"""
+        connection = SMTPConnection(self.config, self.max_messages_per_connection)
+        sent = 0
+        try:
+            while not self.paused and self.outbox.has_due():
+                sent += self.run_once(connection)
+        finally:
+            connection.close()
+        return sent
+
+    def _loop(self) -> None:
+        connection = SMTPConnection(self.config, self.max_messages_per_connection)
+        try:
+            while not self._stop.is_set():
+                try:
+                    processed = self.run_once(connection)
+                except Exception as e:
+                    logger.error(f"발송 작업자 오류: {e}")
+                    processed = 0
+                if not processed:
+                    # 유휴 상태에서는 연결을 닫고 새 메시지나 재시도 시각을 기다림
+                    connection.close()
+                    self._wake.wait(self.poll_interval)
+                    self._wake.clear()
+        finally:
+            connection.close()
+
+    def notify(self) -> None:
+        """새 메시지가 들어왔음을 알려 대기 중인 작업자를 깨우는 함수"""
+        self._wake.set()
+
+    def start(self) -> None:
+        """백그라운드 발송 스레드 시작"""
+        if self._threads:
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._loop, name=f"outbox-worker-{i}", daemon=True)
+            for i in range(self.threads)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """백그라운드 발송 스레드 종료"""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
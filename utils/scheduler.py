@@ -0,0 +1,325 @@
+import heapq
+import itertools
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set
+
+from utils.storage import get_data_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 2
+# 시스템 시계가 바뀌어도 너무 오래 잠들지 않도록 한 번에 기다리는 최대 시간 (초)
+MAX_SLEEP = 300.0
+
+_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]  # 분, 시, 일, 월, 요일(0, 7=일요일)
+
+
+def _parse_field(field: str, low: int, high: int) -> Set[int]:
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step <= 0:
+                raise ValueError(f"잘못된 간격: {field}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"범위를 벗어난 값: {field} ({low}-{high})")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronExpression:
+    """
+    5필드 cron 표현식 ("분 시 일 월 요일")
+    *, 목록(1,15), 범위(1-5), 간격(*/10) 지원. 요일은 0(또는 7)=일요일.
+    일과 요일이 모두 지정되면 표준 cron처럼 둘 중 하나만 맞아도 실행합니다.
+    """
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 표현식은 5개 필드여야 합니다: '{expression}'")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(field, low, high) for field, (low, high) in zip(fields, _FIELD_RANGES)
+        )
+        self.weekdays = {day % 7 for day in weekdays}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.isoweekday() % 7) in self.weekdays
+        if self._any_day:
+            return weekday_ok
+        if self._any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        """moment 이후(같은 분 제외) 처음으로 일치하는 시각"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # 최대 몇 년 안에 반드시 일치 (2월 30일처럼 불가능한 조합 방지)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                year = candidate.year + (candidate.month == 12)
+                candidate = candidate.replace(year=year, month=candidate.month % 12 + 1, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+        raise ValueError(f"일치하는 시각이 없는 cron 표현식: '{self.expression}'")
+
+    def __repr__(self) -> str:
+        return f"CronExpression('{self.expression}')"
+
+
+@dataclass
+class Job:
+    """
+    예약 작업
+
+    - group: 같은 그룹의 작업은 동시에 실행하지 않음 (기본값은 작업 이름)
+    - catch_up: 프로세스가 꺼져 있던 동안 놓친 실행을 시작할 때 한 번 실행할지 여부
+    """
+    name: str
+    cron: CronExpression
+    func: Callable[[], None]
+    group: Optional[str] = None
+    catch_up: bool = True
+
+    @property
+    def lock_key(self) -> str:
+        return self.group or self.name
+
+
+@dataclass
+class RunRecord:
+    """작업 실행 기록"""
+    job: str
+    scheduled_for: float
+    started_at: float
+    duration: float
+    status: str          # "ok", "error", "skipped"
+    error: Optional[str] = None
+
+
+class ScheduleStore:
+    """작업별 마지막 실행 예정 시각과 실행 기록을 저장하는 SQLite 저장소"""
+
+    def __init__(self, path: Optional[str] = None, history_limit: int = 1000):
+        self.path = path or get_data_path("scheduler.sqlite3")
+        self.history_limit = history_limit
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_state (
+                name TEXT PRIMARY KEY,
+                last_scheduled REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job TEXT NOT NULL,
+                scheduled_for REAL NOT NULL,
+                started_at REAL NOT NULL,
+                duration REAL NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_job ON runs (job, id)")
+        self._conn.commit()
+
+    def last_scheduled(self, name: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute("SELECT last_scheduled FROM job_state WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def record(self, run: RunRecord) -> None:
+        """실행 기록 저장 (건너뛴 실행이 아니면 마지막 실행 예정 시각도 갱신)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO runs (job, scheduled_for, started_at, duration, status, error) VALUES (?, ?, ?, ?, ?, ?)",
+                (run.job, run.scheduled_for, run.started_at, run.duration, run.status, run.error)
+            )
+            if run.status != "skipped":
+                self._conn.execute(
+                    "INSERT INTO job_state (name, last_scheduled) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET last_scheduled = MAX(last_scheduled, excluded.last_scheduled)",
+                    (run.job, run.scheduled_for)
+                )
+            self._conn.execute(
+                "DELETE FROM runs WHERE job = ? AND id NOT IN "
+                "(SELECT id FROM runs WHERE job = ? ORDER BY id DESC LIMIT ?)",
+                (run.job, run.job, self.history_limit)
+            )
+            self._conn.commit()
+
+    def history(self, name: Optional[str] = None, limit: int = 20) -> List[RunRecord]:
+        """최근 실행 기록 (최신순)"""
+        query = "SELECT job, scheduled_for, started_at, duration, status, error FROM runs"
+        params: tuple = ()
+        if name:
+            query += " WHERE job = ?"
+            params = (name,)
+        query += " ORDER BY id DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(query, params + (limit,)).fetchall()
+        return [RunRecord(*row) for row in rows]
+
+
+class Scheduler:
+    """
+    cron 기반 다중 작업 스케줄러
+
+    다음 실행 시각이 가장 이른 작업을 힙에서 꺼내 그 시각까지 잠들었다가 작업 스레드 풀에 넘깁니다.
+    - 같은 그룹의 작업이 아직 실행 중이면 이번 실행은 건너뛰고 기록만 남김 (중복 실행 방지)
+    - 시작할 때 저장된 마지막 실행 시각 이후 놓친 실행이 있으면 한 번 실행 (catch-up)
+    - 실행마다 시작 시각, 소요 시간, 결과를 저장
+
+    Parameters:
+    - store: 실행 상태/기록 저장소 (없으면 기본 경로의 SQLite)
+    - max_workers: 동시에 실행할 최대 작업 수
+    """
+
+    def __init__(self, store: Optional[ScheduleStore] = None, max_workers: int = DEFAULT_MAX_WORKERS,
+                 clock: Callable[[], datetime] = datetime.now):
+        self.store = store or ScheduleStore()
+        self.jobs: Dict[str, Job] = {}
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scheduler")
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._running: Set[str] = set()
+        self._cond = threading.Condition()
+        self._stopped = False
+
+    def add_job(self, name: str, cron: str, func: Callable[[], None],
+                group: Optional[str] = None, catch_up: bool = True) -> Job:
+        """작업 등록 (cron 표현식 예: "0 8 * * *" = 매일 08:00, "30 7 * * 1-5" = 평일 07:30)"""
+        job = Job(name=name, cron=CronExpression(cron), func=func, group=group, catch_up=catch_up)
+        with self._cond:
+            self.jobs[name] = job
+            now = self._clock()
+            last = self.store.last_scheduled(name)
+            if catch_up and last is not None:
+                missed = job.cron.next_after(datetime.fromtimestamp(last))
+                if missed <= now:
+                    logger.info(f"'{name}' 작업의 놓친 실행({missed:%Y-%m-%d %H:%M})을 지금 실행합니다.")
+                    self._push(now, name, missed, regular=False)
+            self._push(job.cron.next_after(now), name)
+            self._cond.notify()
+        return job
+
+    def _push(self, when: datetime, name: str, scheduled_for: Optional[datetime] = None,
+              regular: bool = True) -> None:
+        """
+        힙에 실행 예정 추가
+        regular=True인 정규 일정은 실행 후 다음 일정을 다시 넣고, 즉시/catch-up 실행은 한 번만 실행됨
+        """
+        heapq.heappush(self._heap, (when, next(self._seq), name, scheduled_for or when, regular))
+
+    def run_now(self, name: str) -> None:
+        """
+        등록된 작업을 즉시 한 번 실행하도록 예약
+        등록되지 않은 이름이면 KeyError (실행 루프에서 뒤늦게 실패하지 않도록 바로 알림)
+        """
+        with self._cond:
+            if name not in self.jobs:
+                raise KeyError(f"등록되지 않은 작업: {name!r}")
+            now = self._clock()
+            self._push(now, name, now, regular=False)
+            self._cond.notify()
+
+    def _execute(self, job: Job, scheduled_for: datetime) -> None:
+        started = time.time()
+        started_perf = time.perf_counter()
+        status, error = "ok", None
+        logger.info(f"'{job.name}' 작업 시작 (예정 {scheduled_for:%Y-%m-%d %H:%M})")
+        try:
+            job.func()
+        except Exception as e:
+            status, error = "error", str(e)
+            logger.exception(f"'{job.name}' 작업 실패: {e}")
+        finally:
+            duration = time.perf_counter() - started_perf
+            with self._cond:
+                self._running.discard(job.lock_key)
+            self.store.record(RunRecord(job.name, scheduled_for.timestamp(), started, duration, status, error))
+            logger.info(f"'{job.name}' 작업 종료 ({status}, {duration:.1f}초)")
+
+    def _dispatch(self, name: str, scheduled_for: datetime) -> None:
+        """실행할 때가 된 작업을 풀에 넘김 (_cond를 잡은 상태에서 호출)"""
+        job = self.jobs.get(name)
+        if job is None:
+            logger.error(f"등록되지 않은 작업 '{name}'은 실행하지 않습니다.")
+            return
+        if job.lock_key in self._running:
+            logger.warning(f"'{name}' 작업이 이전 실행과 겹쳐 이번 실행({scheduled_for:%H:%M})을 건너뜁니다.")
+            self.store.record(RunRecord(name, scheduled_for.timestamp(), time.time(), 0.0, "skipped",
+                                        "이전 실행이 아직 진행 중"))
+            return
+        self._running.add(job.lock_key)
+        self._executor.submit(self._execute, job, scheduled_for)
+
+    def run_forever(self) -> None:
+        """stop()이 호출될 때까지 예약된 작업을 실행 (호출한 스레드에서 대기)"""
+        with self._cond:
+            while not self._stopped:
+                now = self._clock()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, name, scheduled_for, regular = heapq.heappop(self._heap)
+                    self._dispatch(name, scheduled_for)
+                    if regular:
+                        self._push(self.jobs[name].cron.next_after(max(scheduled_for, now)), name)
+                timeout = MAX_SLEEP
+                if self._heap:
+                    timeout = min(MAX_SLEEP, max(0.0, (self._heap[0][0] - self._clock()).total_seconds()))
+                self._cond.wait(timeout)
+
+    def start(self) -> threading.Thread:
+        """별도 스레드에서 스케줄러 실행"""
+        thread = threading.Thread(target=self.run_forever, name="scheduler-loop", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self, wait: bool = True) -> None:
+        """스케줄러 종료 (wait=True면 실행 중인 작업이 끝날 때까지 대기)"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._executor.shutdown(wait=wait)
+
+    def next_runs(self) -> Dict[str, datetime]:
+        """작업별 다음 실행 예정 시각"""
+        with self._cond:
+            upcoming: Dict[str, datetime] = {}
+            for when, _, name, _, _ in sorted(self._heap):
+                upcoming.setdefault(name, when)
+            return upcoming
@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from utils.article import Article
+
+# 기본 캐시 설정
+DEFAULT_TTL = float(os.getenv("SEARCH_CACHE_TTL", "600"))        # 검색 결과 보관 시간 (초)
+DEFAULT_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "64"))
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def normalize_keywords(keywords: str) -> str:
+    """쉼표로 구분된 키워드를 소문자/공백 정리/중복 제거/정렬하여 캐시 키로 쓸 문자열을 만드는 함수"""
+    words = {" ".join(keyword.split()).lower() for keyword in (keywords or "").split(",")}
+    return ",".join(sorted(word for word in words if word))
+
+
+def search_cache_key(keywords: str, search_method: str, max_articles: int, **options) -> Tuple:
+    """정규화된 키워드, 검색 방법, 최대 기사 수, 기타 검색 옵션으로 캐시 키를 만드는 함수"""
+    return (normalize_keywords(keywords), search_method, max_articles, tuple(sorted(options.items())))
+
+
+class SearchResultCache:
+    """
+    뉴스 검색 결과를 프로세스 메모리에 보관하는 TTL/LRU 캐시
+    Streamlit은 위젯을 조작할 때마다 스크립트를 다시 실행하므로,
+    TTL 안의 같은 검색은 API를 다시 호출하지 않고 저장된 결과를 돌려줍니다.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[float, Tuple[Article, ...]]]" = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[List[Article]]:
+        """저장된 검색 결과 목록을 반환 (없거나 만료되었으면 None, Article은 변경 불가라 얕은 복사로 충분)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return list(entry[1])
+
+    def put(self, key: Tuple, articles: List[Article]) -> None:
+        """검색 결과 저장 (최대 항목 수를 넘으면 가장 오래 사용하지 않은 결과부터 삭제)"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), tuple(articles))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def age(self, key: Tuple) -> Optional[float]:
+        """저장된 결과가 만들어진 뒤 지난 시간 (초)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return time.monotonic() - entry[0] if entry else None
+
+    def clear(self) -> None:
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._entries.clear()
+
+
+def get_search_cache() -> SearchResultCache:
+    """프로세스 전체(모든 세션)에서 공유하는 기본 검색 결과 캐시를 반환하는 함수"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = SearchResultCache()
+        return _default_cache
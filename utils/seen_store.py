@@ -0,0 +1,211 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.dedupe import canonicalize_url, normalize_title
+from utils.storage import get_data_path
+
+logger = logging.getLogger(__name__)
+
+# 처리한 기사 기록 보관 기간 (일) - 이 기간 동안 피드에서 다시 보이지 않은 기사는 정리
+DEFAULT_RETENTION_DAYS = float(os.getenv("SEEN_RETENTION_DAYS", "30"))
+# 실행 기록은 파이프라인별로 최근 N개만 보관
+DEFAULT_RUN_HISTORY = 100
+# SQLite IN 절 하나에 넣을 최대 키 수
+_LOOKUP_CHUNK = 500
+
+RUN_RUNNING = "running"
+RUN_SUCCESS = "success"
+RUN_FAILED = "failed"
+
+
+def content_hash(article: Dict[str, Any]) -> str:
+    """기사 내용(제목/요약) 해시 - 같은 URL의 기사가 수정되었는지 판단하는 데 사용"""
+    title = normalize_title(article.get("title", ""))
+    description = " ".join((article.get("description") or "").split())
+    return hashlib.sha256(f"{title}\n{description}".encode("utf-8")).hexdigest()
+
+
+def article_key(article: Dict[str, Any], link_key: str = "link") -> str:
+    """기사 식별 키 (정규화된 URL, URL이 없으면 제목)"""
+    return canonicalize_url(article.get(link_key, "")) or "title:" + normalize_title(article.get("title", ""))
+
+
+@dataclass
+class ChangeSet:
+    """지난 성공 실행 이후 기사 변경 분류 결과 (각 목록은 입력 순서 유지)"""
+    new: List[Dict[str, Any]] = field(default_factory=list)
+    changed: List[Dict[str, Any]] = field(default_factory=list)
+    unchanged: List[Dict[str, Any]] = field(default_factory=list)
+    fresh: List[Dict[str, Any]] = field(default_factory=list)     # 처리할 기사 (새 기사 + 변경된 기사)
+
+
+class SeenArticleStore:
+    """
+    SQLite에 저장되는 처리한 기사 기록
+
+    정규화된 URL을 키로 마지막으로 처리한 내용 해시와 시각을 저장하여,
+    매일 실행하는 파이프라인이 지난 성공 실행 이후 새로 나왔거나 내용이 바뀐 기사만 처리하게 합니다.
+    - classify(): 수집한 기사를 새 기사/변경된 기사/이미 처리한 기사로 분류 (피드에서 본 시각도 갱신)
+    - begin_run() / finish_run(): 실행이 성공했을 때만 처리한 기사를 기록 (실패하면 다음 실행에서 다시 처리)
+    - compact(): 보관 기간 동안 다시 보이지 않은 기사와 오래된 실행 기록 정리
+    """
+
+    def __init__(self, path: Optional[str] = None, retention_days: float = DEFAULT_RETENTION_DAYS,
+                 run_history: int = DEFAULT_RUN_HISTORY, link_key: str = "link"):
+        self.path = path or get_data_path("seen_articles.sqlite3")
+        self.retention_days = retention_days
+        self.run_history = run_history
+        self.link_key = link_key
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_articles (
+                url_key TEXT PRIMARY KEY,
+                content_hash TEXT,
+                title TEXT,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                processed_at REAL,
+                run_id INTEGER
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_last_seen ON seen_articles (last_seen)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                pipeline TEXT NOT NULL,
+                status TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                finished_at REAL,
+                new_count INTEGER NOT NULL DEFAULT 0,
+                changed_count INTEGER NOT NULL DEFAULT 0,
+                processed_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_runs_pipeline ON seen_runs (pipeline, id)")
+        self._conn.commit()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, Optional[str]]:
+        """url_key -> 마지막으로 처리한 내용 해시 (처리한 적 없으면 None)"""
+        found = {}
+        for start in range(0, len(keys), _LOOKUP_CHUNK):
+            chunk = keys[start:start + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(self._conn.execute(
+                f"SELECT url_key, content_hash FROM seen_articles WHERE url_key IN ({placeholders})", chunk
+            ).fetchall())
+        return found
+
+    def classify(self, articles: Iterable[Dict[str, Any]]) -> ChangeSet:
+        """
+        기사를 지난 성공 실행 기준으로 새 기사/변경된 기사/이미 처리한 기사로 분류하는 함수
+        피드에서 본 시각(last_seen)도 함께 갱신하여 아직 피드에 있는 기사는 정리 대상에서 제외합니다.
+        """
+        keyed: List[Tuple[str, str, Dict[str, Any]]] = [
+            (article_key(article, self.link_key), content_hash(article), article) for article in articles
+        ]
+        now = time.time()
+        changes = ChangeSet()
+        with self._lock:
+            processed = self._lookup(list({key for key, _, _ in keyed}))
+            self._conn.executemany(
+                "INSERT INTO seen_articles (url_key, title, first_seen, last_seen) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(url_key) DO UPDATE SET last_seen = excluded.last_seen",
+                [(key, article.get("title", "")[:500], now, now) for key, _, article in keyed]
+            )
+            self._conn.commit()
+
+        for key, digest, article in keyed:
+            previous = processed.get(key)
+            if previous is None:
+                changes.new.append(article)
+            elif previous != digest:
+                changes.changed.append(article)
+            else:
+                changes.unchanged.append(article)
+                continue
+            changes.fresh.append(article)
+        return changes
+
+    def begin_run(self, pipeline: str) -> int:
+        """실행 시작 기록 후 실행 ID 반환"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO seen_runs (pipeline, status, started_at) VALUES (?, ?, ?)",
+                (pipeline, RUN_RUNNING, time.time())
+            )
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def finish_run(self, run_id: int, processed: Iterable[Dict[str, Any]] = (), success: bool = True,
+                   changes: Optional[ChangeSet] = None) -> None:
+        """
+        실행 종료 기록
+        성공한 경우에만 processed 기사들의 현재 내용 해시를 처리 완료로 저장합니다.
+        """
+        now = time.time()
+        rows = [(content_hash(article), now, run_id, article_key(article, self.link_key))
+                for article in processed] if success else []
+        with self._lock:
+            # classify()를 거치지 않은 기사도 기록되도록 먼저 행을 만들어 둠
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen_articles (url_key, first_seen, last_seen) VALUES (?, ?, ?)",
+                [(key, now, now) for _, _, _, key in rows]
+            )
+            self._conn.executemany(
+                "UPDATE seen_articles SET content_hash = ?, processed_at = ?, run_id = ? WHERE url_key = ?", rows
+            )
+            self._conn.execute(
+                "UPDATE seen_runs SET status = ?, finished_at = ?, new_count = ?, changed_count = ?, "
+                "processed_count = ? WHERE id = ?",
+                (RUN_SUCCESS if success else RUN_FAILED, now,
+                 len(changes.new) if changes else 0, len(changes.changed) if changes else 0, len(rows), run_id)
+            )
+            self._conn.commit()
+
+    def last_successful_run(self, pipeline: str) -> Optional[float]:
+        """파이프라인의 마지막 성공 실행 종료 시각 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(finished_at) FROM seen_runs WHERE pipeline = ? AND status = ?",
+                (pipeline, RUN_SUCCESS)
+            ).fetchone()
+        return row[0] if row else None
+
+    def compact(self, retention_days: Optional[float] = None) -> int:
+        """
+        보관 기간 동안 피드에서 다시 보이지 않은 기사와 파이프라인별 오래된 실행 기록을 삭제하는 함수
+
+        Returns:
+        - 삭제한 기사 기록 수
+        """
+        days = self.retention_days if retention_days is None else retention_days
+        cutoff = time.time() - days * 24 * 60 * 60
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM seen_articles WHERE last_seen < ?", (cutoff,))
+            removed = cursor.rowcount
+            self._conn.execute(
+                "DELETE FROM seen_runs WHERE id IN (SELECT id FROM ("
+                "SELECT id, ROW_NUMBER() OVER (PARTITION BY pipeline ORDER BY id DESC) AS rank FROM seen_runs"
+                ") WHERE rank > ?)",
+                (self.run_history,)
+            )
+            self._conn.commit()
+        if removed:
+            logger.info(f"처리 기록 {removed}건 정리 (보관 기간 {days:g}일)")
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """저장된 기사 수와 그중 처리한 기사 수"""
+        with self._lock:
+            total, processed = self._conn.execute(
+                "SELECT COUNT(*), COUNT(processed_at) FROM seen_articles"
+            ).fetchone()
+        return {"articles": total, "processed": processed}
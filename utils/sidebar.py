@@ -3,6 +3,15 @@ import base64
 from PIL import Image
 import io
 
+from agents.newsletter_pipeline import TOPICS_CLUSTER, TOPICS_FAST, TOPICS_LLM
+
+# 주제 선정 방식 (화면 표시 이름 -> 방식)
+TOPIC_METHOD_OPTIONS = {
+    "LLM 선정": TOPICS_LLM,
+    "클러스터링 + LLM 이름 짓기": TOPICS_CLUSTER,
+    "빠른 모드 (클러스터링만)": TOPICS_FAST,
+}
+
 def setup_sidebar():
     """
     사이드바 컴포넌트 설정 및 스타일링
@@ -46,6 +55,11 @@ def setup_sidebar():
                     type="password",
                     help=""
                 )
+                naver_per_keyword = st.checkbox(
+                    "키워드별 개별 검색",
+                    value=False,
+                    help="키워드마다 따로 검색한 뒤 결과를 합칩니다. 여러 키워드를 입력했을 때 검색 범위가 넓어집니다."
+                )
                 st.caption("네이버 개발자 센터에서 애플리케이션을 등록하여 API 키를 발급받을 수 있습니다.")
         
         # OpenAI API 키 입력
@@ -56,6 +70,22 @@ def setup_sidebar():
             help="OpenAI API 키가 없다면 https://platform.openai.com에서 발급받을 수 있습니다."
         )
         
+        # 생성 방식 선택
+        generation_mode_label = st.radio(
+            "뉴스레터 생성 방식",
+            options=["주제별 생성", "단일 패스"],
+            help="주제별 생성은 주제 선정 후 주제마다 내용을 따로 작성합니다. 단일 패스는 한 번의 호출로 전체를 작성하여 더 빠르고 저렴합니다."
+        )
+        
+        # 주제 선정 방식 (주제별 생성에서만 사용)
+        topic_method_label = st.selectbox(
+            "주제 선정 방식",
+            options=list(TOPIC_METHOD_OPTIONS),
+            index=0,
+            disabled=generation_mode_label == "단일 패스",
+            help="클러스터링은 기사를 로컬에서 먼저 주제별로 묶어 주제 선정이 빠르고, 주제마다 관련 기사가 정해집니다. 빠른 모드는 주제 선정에 LLM을 쓰지 않습니다."
+        )
+        
         # 고급 설정
         with st.expander("고급 설정", expanded=False):
             model = st.selectbox(
@@ -76,9 +106,58 @@ def setup_sidebar():
             max_articles = st.slider(
                 "최대 뉴스 기사 수",
                 min_value=5,
-                max_value=20,
+                max_value=100,
                 value=15,
-                step=1
+                step=5,
+                help="네이버 API는 100개 단위로 여러 페이지를 동시에 가져옵니다."
+            )
+            
+            articles_per_topic = st.slider(
+                "주제별 참고 기사 수",
+                min_value=3,
+                max_value=20,
+                value=8,
+                step=1,
+                help="각 하위 주제의 내용을 생성할 때 관련도가 높은 기사만 골라 프롬프트에 넣습니다."
+            )
+            
+            content_concurrency = st.slider(
+                "동시 생성 주제 수",
+                min_value=1,
+                max_value=8,
+                value=4,
+                step=1,
+                help="하위 주제별 내용을 동시에 생성할 최대 개수입니다. API 사용량 제한에 걸리면 값을 낮추세요."
+            )
+            
+            # 한 번만 적용되는 새로 검색 요청 (다음 검색이 캐시를 건너뛰면 app에서 해제)
+            if st.button(
+                "다음 검색은 새로 가져오기",
+                help="같은 검색은 일정 시간 동안 캐시된 결과를 사용합니다. 누르면 다음 한 번의 검색만 뉴스를 다시 검색합니다."
+            ):
+                st.session_state["refresh_search_pending"] = True
+            refresh_search = st.session_state.get("refresh_search_pending", False)
+            if refresh_search:
+                st.caption("다음 검색은 캐시를 사용하지 않고 새로 가져옵니다.")
+            
+            # 구글 RSS 링크는 구글 리다이렉트 페이지를 가리키므로 원문 본문 수집은 네이버 API에서만 제공
+            if search_method == "네이버 API":
+                fetch_article_bodies = st.checkbox(
+                    "기사 원문 본문 수집",
+                    value=False,
+                    help="검색된 기사의 원문 페이지에서 본문을 가져와 더 자세한 뉴스레터를 작성합니다. 수집한 본문은 저장해 두고 재사용합니다."
+                )
+            
+            stream_content = st.checkbox(
+                "생성 중인 내용 실시간 표시",
+                value=True,
+                help="각 주제의 본문을 생성되는 대로 바로 보여줍니다."
+            )
+            
+            use_llm_cache = st.checkbox(
+                "LLM 응답 캐시 사용",
+                value=True,
+                help="같은 기사와 설정으로 다시 생성하면 저장된 응답을 재사용합니다. 새로 생성하려면 해제하세요."
             )
         
         # 뉴스레터 생성 버튼
@@ -114,11 +193,20 @@ def setup_sidebar():
     return {
         "keywords": keywords,
         "search_method": search_method,
+        "generation_mode": "single_pass" if generation_mode_label == "단일 패스" else "per_topic",
+        "topic_method": TOPIC_METHOD_OPTIONS[topic_method_label],
         "openai_api_key": final_openai_api_key,
         "generate_button": generate_button,
         "model": model if 'model' in locals() else "gpt-4o-mini",
         "temperature": temperature if 'temperature' in locals() else 0.7,
         "max_articles": max_articles if 'max_articles' in locals() else 15,
+        "articles_per_topic": articles_per_topic if 'articles_per_topic' in locals() else 8,
+        "content_concurrency": content_concurrency if 'content_concurrency' in locals() else 4,
+        "refresh_search": refresh_search if 'refresh_search' in locals() else False,
+        "fetch_article_bodies": fetch_article_bodies if 'fetch_article_bodies' in locals() else False,
+        "stream_content": stream_content if 'stream_content' in locals() else True,
+        "use_llm_cache": use_llm_cache if 'use_llm_cache' in locals() else True,
         "naver_client_id": final_naver_client_id,
-        "naver_client_secret": final_naver_client_secret
+        "naver_client_secret": final_naver_client_secret,
+        "naver_per_keyword": naver_per_keyword if 'naver_per_keyword' in locals() else False
     }
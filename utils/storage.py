@@ -0,0 +1,17 @@
+import os
+
+# 캐시/큐 등 로컬 데이터 파일을 저장할 기본 디렉터리
+# NEWSLETTER_DATA_DIR 환경 변수로 위치를 바꿀 수 있습니다.
+DEFAULT_DATA_DIR = os.path.join(os.path.expanduser("~"), ".cache", "newsletter_app")
+
+
+def get_data_dir() -> str:
+    """로컬 데이터 디렉터리 경로를 반환하고, 없으면 생성하는 함수"""
+    data_dir = os.getenv("NEWSLETTER_DATA_DIR", DEFAULT_DATA_DIR)
+    os.makedirs(data_dir, exist_ok=True)
+    return data_dir
+
+
+def get_data_path(filename: str) -> str:
+    """로컬 데이터 디렉터리 안의 파일 경로를 반환하는 함수"""
+    return os.path.join(get_data_dir(), filename)
@@ -0,0 +1,56 @@
+import html
+import re
+
+# 내용까지 통째로 버릴 태그
+_DROP_BLOCK_RE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+# 줄바꿈으로 바꿀 블록 태그
+_BREAK_RE = re.compile(r"<(?:br|/p|/div|/li|/h[1-6]|/tr)\b[^>]*>", re.IGNORECASE)
+_TAG_RE = re.compile(r"</?[A-Za-z][^<>]*>")
+# 태그를 제거한 뒤에도 남아 있는 태그 시작 부분 (닫히지 않은 태그 등 잘못된 마크업)
+_LEFTOVER_TAG_RE = re.compile(r"</?[A-Za-z!]")
+_SPACE_RE = re.compile(r"[ \t\r\f\v\xa0]+")
+
+
+def _strip_with_parser(text: str) -> str:
+    """잘못된 마크업을 위한 대체 경로 (BeautifulSoup 사용)"""
+    try:
+        from bs4 import BeautifulSoup
+    except ImportError:
+        return html.unescape(_LEFTOVER_TAG_RE.sub("", text))
+    soup = BeautifulSoup(text, "html.parser")
+    for tag in soup(["script", "style"]):
+        tag.decompose()
+    return soup.get_text("\n")
+
+
+def strip_html(text: str, keep_newlines: bool = False) -> str:
+    """
+    HTML 태그를 제거하고 엔티티를 복원한 순수 텍스트를 반환하는 함수
+    정규식으로 처리하고, 닫히지 않은 태그처럼 정규식으로 처리할 수 없는 마크업만 HTML 파서로 처리합니다.
+
+    Parameters:
+    - text: HTML이 섞인 문자열 (예: 네이버 API의 <b> 강조, 구글 RSS의 링크 목록)
+    - keep_newlines: True면 블록 태그 위치의 줄바꿈을 유지
+
+    Returns:
+    - 공백이 정리된 텍스트
+    """
+    if not text:
+        return ""
+    if "<" not in text and "&" not in text:
+        plain = text
+    elif "<" not in text:
+        plain = html.unescape(text)
+    else:
+        plain = _COMMENT_RE.sub("", _DROP_BLOCK_RE.sub("", text))
+        plain = _TAG_RE.sub("", _BREAK_RE.sub("\n", plain))
+        if _LEFTOVER_TAG_RE.search(plain):
+            plain = _strip_with_parser(text)
+        else:
+            plain = html.unescape(plain)
+
+    if keep_newlines:
+        lines = (_SPACE_RE.sub(" ", line).strip() for line in plain.split("\n"))
+        return "\n".join(line for line in lines if line)
+    return " ".join(plain.split())